@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse, PlainTextResponse
+from pydantic import BaseModel
+from typing import Optional
+from core.profiling import ADMIN_TOKEN, PROFILE_MODES, check_admin_token, profile_store, profiling_settings
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled; set ADMIN_TOKEN")
+    if not check_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+class ProfilingToggle(BaseModel):
+    enabled: bool
+    sample_rate: float = 0.1  # share of matching requests to profile
+    mode: str = "sample"  # sample (every thread, so also sync endpoints) or cprofile (event-loop thread only)
+    path_prefix: str = "/"
+
+@router.get("/profiling")
+def get_profiling_settings():
+    """Current profiling toggle"""
+    return profiling_settings.as_dict()
+
+@router.post("/profiling")
+def update_profiling_settings(toggle: ProfilingToggle):
+    """Turn sampled request profiling on or off.
+
+    The default sample mode records every thread's stack; cprofile traces only the
+    event-loop thread, so profiles of sync endpoints (run in the threadpool) come out almost empty.
+    """
+    if toggle.mode not in PROFILE_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid mode. Must be one of: {list(PROFILE_MODES)}")
+    if not 0 <= toggle.sample_rate <= 1:
+        raise HTTPException(status_code=400, detail="sample_rate must be between 0 and 1")
+    profiling_settings.update(toggle.enabled, toggle.sample_rate, toggle.mode, toggle.path_prefix)
+    return profiling_settings.as_dict()
+
+@router.get("/profiles")
+def list_profiles():
+    """Stored profiles, newest first"""
+    profiles = profile_store.list()
+    return {"profiles": profiles, "total": len(profiles), "max_files": profile_store.max_files}
+
+@router.get("/profiles/{name}")
+def download_profile(name: str, format: str = "raw"):
+    """Download a profile; format=text gives a cumulative-time summary of a cProfile dump"""
+    path = profile_store.get(name)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "text":
+        if path.suffix != ".prof":
+            return PlainTextResponse(path.read_text())
+        return PlainTextResponse(profile_store.summary(path))
+    return FileResponse(str(path), filename=path.name, media_type="application/octet-stream")
@@ -1,12 +1,33 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, AsyncIterator, Callable, Dict, Iterator
+import asyncio
+import json
+import os
+import threading
+from core.cache import cache_key, response_cache
 from core.db import get_db
+from core.versions import get_data_version, get_stats_version
 from services.ai_assistant import ai_assistant
+from services.ai_cache import ai_response_cache
 
 router = APIRouter(prefix="/ai", tags=["AI Assistant"])
 
+AI_MAX_CONCURRENT_REQUESTS = int(os.getenv("AI_MAX_CONCURRENT_REQUESTS", "4"))
+AI_RESPONSE_TIMEOUT_SECONDS = float(os.getenv("AI_RESPONSE_TIMEOUT_SECONDS", "60"))
+
+MODEL_SLOT_POLL_SECONDS = 0.05
+
+# Bounds concurrent model calls so a burst of chats cannot exhaust the threadpool.
+# A slot is released by the worker thread when the model call really returns, so
+# a request that timed out keeps its slot until the abandoned call finishes.
+model_slots = threading.BoundedSemaphore(AI_MAX_CONCURRENT_REQUESTS)
+
+_STREAM_END = object()
+
 class ChatRequest(BaseModel):
     message: str
     jd_id: Optional[int] = None
@@ -22,22 +43,158 @@ async def chat_with_ai(
 ):
     """Chat with AI assistant about dashboard data"""
     try:
-        # Get dashboard context
-        context = ai_assistant.get_dashboard_context(db, request.jd_id)
+        # Database and model calls block, so they run in the threadpool
+        context, version, suggestions = await run_in_threadpool(_load_chat_context, db, request.jd_id)
         
-        # Generate AI response
-        response = ai_assistant.generate_response(request.message, context)
-        
-        # Get suggested questions
-        suggestions = ai_assistant.get_suggested_questions(context)
+        # Known questions and cached answers never wait for a model slot
+        response = await run_in_threadpool(_answer_without_model, db, request, context, version)
+        if response is None:
+            response = await _call_model(
+                ai_assistant.generate_response, request.message, context, request.jd_id, version
+            )
         
         return ChatResponse(
             response=response,
             suggestions=suggestions
         )
     
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="AI Assistant timed out")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"AI Assistant error: {str(e)}")
+
+@router.post("/chat/stream")
+async def stream_chat_with_ai(
+    request: ChatRequest,
+    db: Session = Depends(get_db)
+):
+    """Chat with AI assistant, streaming the answer as server-sent events"""
+    try:
+        context, version, suggestions = await run_in_threadpool(_load_chat_context, db, request.jd_id)
+        ready_answer = await run_in_threadpool(_answer_without_model, db, request, context, version)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI Assistant error: {str(e)}")
+    
+    async def event_stream():
+        if ready_answer is not None:
+            yield _sse("token", {"text": ready_answer})
+            yield _sse("done", {"suggestions": suggestions})
+            return
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + AI_RESPONSE_TIMEOUT_SECONDS
+        cancelled = threading.Event()
+        if not await _acquire_model_slot(deadline):
+            yield _sse("error", {"detail": "AI Assistant is busy, please try again"})
+            return
+        
+        # The worker thread gives the slot back once the model stops producing
+        chunks = _iterate_in_thread(
+            lambda: ai_assistant.stream_response(request.message, context, request.jd_id, version, cancelled),
+            on_exit=model_slots.release
+        )
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=max(deadline - loop.time(), 0))
+                except StopAsyncIteration:
+                    break
+                yield _sse("token", {"text": chunk})
+            yield _sse("done", {"suggestions": suggestions})
+        except asyncio.TimeoutError:
+            yield _sse("error", {"detail": "AI Assistant timed out"})
+        except Exception as e:
+            yield _sse("error", {"detail": f"AI Assistant error: {str(e)}"})
+        finally:
+            # Stops the model thread at its next chunk if the client left or timed out
+            cancelled.set()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _load_chat_context(db: Session, jd_id: Optional[int]):
+    context = ai_assistant.get_dashboard_context(db, jd_id)
+    return context, get_data_version(db, jd_id), ai_assistant.get_suggested_questions(context)
+
+def _answer_without_model(db: Session, request: ChatRequest, context: Dict, version: int) -> Optional[str]:
+    """Answer from the database or the answer cache (per JD data version); None means a model call is needed"""
+    answer = ai_assistant.answer_locally(db, request.message, request.jd_id)
+    if answer is None:
+        answer = ai_assistant.cached_response(request.message, context, request.jd_id, version)
+    return answer
+
+async def _acquire_model_slot(deadline: float) -> bool:
+    """Wait on the event loop (not in a thread) for a model slot until the loop time deadline"""
+    loop = asyncio.get_running_loop()
+    while not model_slots.acquire(blocking=False):
+        if loop.time() >= deadline:
+            return False
+        await asyncio.sleep(MODEL_SLOT_POLL_SECONDS)
+    return True
+
+async def _call_model(func: Callable, *args):
+    """Run a blocking model call in a worker thread that holds a model slot until the call returns"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + AI_RESPONSE_TIMEOUT_SECONDS
+    if not await _acquire_model_slot(deadline):
+        raise asyncio.TimeoutError()
+    
+    def call():
+        try:
+            return func(*args)
+        finally:
+            model_slots.release()
+    
+    # Shielded so a timeout stops waiting without cancelling a call that has not started yet,
+    # which would leave its slot taken
+    future = loop.run_in_executor(None, call)
+    return await asyncio.wait_for(asyncio.shield(future), timeout=max(deadline - loop.time(), 0))
+
+def _iterate_in_thread(factory: Callable[[], Iterator[str]], on_exit: Optional[Callable[[], None]] = None) -> AsyncIterator[str]:
+    """Drive a blocking iterator in a worker thread and receive its items on the event loop.
+
+    The thread is started right away; on_exit runs in it once the iterator is done,
+    even if the consumer has stopped listening.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    
+    def forward(item) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # The event loop has shut down
+            pass
+    
+    def produce() -> None:
+        try:
+            for item in factory():
+                forward(item)
+        except Exception as e:
+            forward(e)
+        finally:
+            if on_exit is not None:
+                on_exit()
+            forward(_STREAM_END)
+    
+    loop.run_in_executor(None, produce)
+    
+    async def consume() -> AsyncIterator[str]:
+        while True:
+            item = await queue.get()
+            if item is _STREAM_END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    
+    return consume()
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
 @router.get("/suggestions")
 async def get_suggestions(
@@ -46,8 +203,15 @@ async def get_suggestions(
 ):
     """Get suggested questions for the AI assistant"""
     try:
-        context = ai_assistant.get_dashboard_context(db, jd_id)
-        suggestions = ai_assistant.get_suggested_questions(context)
+        # Only a few counters are needed, cached until the JD's data changes or its
+        # alerts and metrics are refreshed (which happens after the data change)
+        version = (get_data_version(db, jd_id), get_stats_version(db, jd_id))
+        stats = response_cache.get_or_set(
+            cache_key("ai:suggestion-stats", jd_id),
+            version,
+            lambda: ai_assistant.get_suggestion_stats(db, jd_id)
+        )
+        suggestions = ai_assistant.get_suggested_questions(stats)
         return {"suggestions": suggestions}
     
     except Exception as e:
@@ -58,5 +222,6 @@ async def get_ai_status():
     """Check if AI assistant is properly configured"""
     return {
         "configured": ai_assistant.model is not None,
-        "message": "AI Assistant is ready" if ai_assistant.model else "Please configure GEMINI_API_KEY"
+        "message": "AI Assistant is ready" if ai_assistant.model else "Please configure GEMINI_API_KEY",
+        "cache": ai_response_cache.stats()
     }
@@ -3,7 +3,12 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from core.db import get_db
 from core.models import Candidate, JD, MatchResult
-from services.mailer import send_rejection_email, send_shortlist_email
+from core.queries import get_primary_match
+from core.versions import bump_candidate_versions
+from core.cache import cached_response
+from core.events import event_broker
+from api.dashboard import refresh_stale_stats
+from services.outbox import drain_after_enqueue, enqueue_email, get_candidate_emails
 from datetime import datetime, timedelta
 import random
 
@@ -28,65 +33,79 @@ async def update_candidate_status(
     if status_update.status not in valid_statuses:
         raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
     
-    # Get job details for email context
-    match_result = db.query(MatchResult).filter(MatchResult.candidate_id == candidate.id).first()
-    jd = None
-    if match_result:
-        jd = db.query(JD).filter(JD.id == match_result.jd_id).first()
+    # Get job details for email context (match and JD in a single query)
+    match_result, jd = get_primary_match(db, candidate.id)
+    job_title = jd.title if jd else "the position"
     
     old_status = candidate.status
+    candidate_email = candidate.email
+    candidate_name = candidate.name
+    
+    # Generate rejection reason based on candidate's match data before the
+    # commit expires the loaded objects
+    rejection_reasons = []
+    if match_result:
+        if match_result.skills_match_score < 0.5:
+            rejection_reasons.append("Skills alignment did not meet the minimum requirements")
+        if match_result.experience_match_score < 0.4:
+            rejection_reasons.append("Experience level does not match the position requirements")
+        if match_result.overall_score < 0.6:
+            rejection_reasons.append("Overall profile compatibility was below our threshold")
+    
+    if not rejection_reasons:
+        rejection_reasons = ["Profile did not align with current position requirements"]
+    
     candidate.status = status_update.status
     # Update is_shortlisted for backward compatibility
     candidate.is_shortlisted = status_update.status == "shortlisted"
     
-    db.commit()
-    db.refresh(candidate)
-    
-    # Send emails based on status change
+    # Queue emails based on status change in the same transaction as the update
+    email_queued = None
     if status_update.status == "rejected" and old_status != "rejected":
-        # Generate rejection reason based on candidate's match data
-        rejection_reasons = []
-        if match_result:
-            if match_result.skills_match_score < 0.5:
-                rejection_reasons.append("Skills alignment did not meet the minimum requirements")
-            if match_result.experience_match_score < 0.4:
-                rejection_reasons.append("Experience level does not match the position requirements")
-            if match_result.overall_score < 0.6:
-                rejection_reasons.append("Overall profile compatibility was below our threshold")
-        
-        if not rejection_reasons:
-            rejection_reasons = ["Profile did not align with current position requirements"]
-        
-        background_tasks.add_task(
-            send_rejection_email,
-            candidate.email,
-            candidate.name,
-            jd.title if jd else "the position",
-            rejection_reasons
-        )
+        email_queued = enqueue_email(db, candidate.id, "rejection", candidate_email, {
+            "candidate_name": candidate_name,
+            "position": job_title,
+            "rejection_reasons": rejection_reasons
+        }, jd_id=jd.id if jd else None)
     
     elif status_update.status == "shortlisted" and old_status != "shortlisted":
         # Generate random interview date (3-10 days from now)
         interview_date = datetime.now() + timedelta(days=random.randint(3, 10))
         
-        background_tasks.add_task(
-            send_shortlist_email,
-            candidate.email,
-            candidate.name,
-            jd.title if jd else "the position",
-            interview_date.strftime("%B %d, %Y at %I:%M %p")
-        )
+        email_queued = enqueue_email(db, candidate.id, "shortlist", candidate_email, {
+            "candidate_name": candidate_name,
+            "position": job_title,
+            "interview_date": interview_date.strftime("%B %d, %Y at %I:%M %p")
+        }, jd_id=jd.id if jd else None)
+    
+    if status_update.status != old_status:
+        jd_ids = bump_candidate_versions(db, [status_update.candidate_id])
+    db.commit()
+    if status_update.status != old_status:
+        event_broker.publish("status_changed", None, {
+            "candidate_id": status_update.candidate_id,
+            "status": status_update.status,
+            "is_shortlisted": status_update.status == "shortlisted",
+            "jd_ids": jd_ids
+        })
+        background_tasks.add_task(refresh_stale_stats)
+    if email_queued:
+        background_tasks.add_task(drain_after_enqueue)
     
     return {
         "message": "Status updated successfully",
-        "candidate_id": candidate.id,
-        "new_status": candidate.status,
-        "email_sent": status_update.status in ["rejected", "shortlisted"]
+        "candidate_id": status_update.candidate_id,
+        "new_status": status_update.status,
+        "email_sent": status_update.status in ["rejected", "shortlisted"],
+        "email_queued": email_queued is not None
     }
 
 @router.get("/statuses")
 async def get_status_counts(db: Session = Depends(get_db)):
     """Get candidate status distribution"""
+    return cached_response(db, "candidate:statuses", None, lambda: _load_status_counts(db))
+
+def _load_status_counts(db: Session) -> dict:
     from sqlalchemy import func
     
     status_counts = db.query(
@@ -97,3 +116,10 @@ async def get_status_counts(db: Session = Depends(get_db)):
     return {
         status: count for status, count in status_counts
     }
+
+@router.get("/{candidate_id}/emails")
+def get_candidate_email_status(candidate_id: int, db: Session = Depends(get_db)):
+    """Get delivery status of the emails queued for a candidate"""
+    if not db.query(Candidate.id).filter(Candidate.id == candidate_id).first():
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    return {"candidate_id": candidate_id, "emails": get_candidate_emails(db, candidate_id)}
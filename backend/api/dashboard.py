@@ -1,359 +1,512 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from core.db import get_db
-from core.models import Candidate, MatchResult, JD, BiasAlert, DiversityMetrics
-from services.mailer import send_shortlist_email
-from typing import Optional, List
+from sqlalchemy import desc, select
+from core.db import get_db, SessionLocal
+from core.models import Candidate, MatchResult, JD, BiasAlert, DiversityMetrics, JDState
+from core.queries import get_candidate_match_rows
+from core.cache import cached_response, cache_key, response_cache
+from core.events import event_broker, format_sse
+from core.responses import FastJSONResponse
+from core.versions import bump_candidate_versions, get_data_version, get_jd_state, get_stale_jd_ids
+from services.outbox import drain_after_enqueue, enqueue_email
+from services.skill_stats import get_skill_heatmap
+from services.reports import build_org_report, calculate_actual_diversity_score
+from services.export import stream_csv, stream_parquet, parquet_available
+from typing import Optional, List, Iterable, Iterator
 import random
 from collections import Counter
-import math
-
-def calculate_actual_diversity_score(diversity_metrics: dict) -> float:
-    """Calculate diversity score based on actual distribution data"""
-    if not diversity_metrics:
-        return 75.0
-    
-    # Calculate gender diversity (Shannon entropy)
-    gender_dist = diversity_metrics.get("gender_distribution", {})
-    gender_entropy = 0
-    if gender_dist:
-        for percentage in gender_dist.values():
-            if percentage > 0:
-                p = percentage / 100.0  # Convert percentage to probability
-                gender_entropy += -p * math.log2(p)
-    
-    # Calculate experience diversity
-    exp_dist = diversity_metrics.get("experience_distribution", {})
-    exp_entropy = 0
-    if exp_dist:
-        for percentage in exp_dist.values():
-            if percentage > 0:
-                p = percentage / 100.0
-                exp_entropy += -p * math.log2(p)
-    
-    # Calculate education diversity
-    edu_dist = diversity_metrics.get("education_distribution", {})
-    edu_entropy = 0
-    if edu_dist:
-        for percentage in edu_dist.values():
-            if percentage > 0:
-                p = percentage / 100.0
-                edu_entropy += -p * math.log2(p)
-    
-    # Normalize entropies to 0-100 scale
-    max_gender_entropy = math.log2(len(gender_dist)) if gender_dist else 1
-    max_exp_entropy = math.log2(len(exp_dist)) if exp_dist else 1
-    max_edu_entropy = math.log2(len(edu_dist)) if edu_dist else 1
-    
-    gender_score = (gender_entropy / max_gender_entropy * 100) if max_gender_entropy > 0 else 0
-    exp_score = (exp_entropy / max_exp_entropy * 100) if max_exp_entropy > 0 else 0
-    edu_score = (edu_entropy / max_edu_entropy * 100) if max_edu_entropy > 0 else 0
-    
-    # Weighted average (gender 40%, experience 35%, education 25%)
-    diversity_score = (gender_score * 0.4 + exp_score * 0.35 + edu_score * 0.25)
-    
-    return round(diversity_score, 1)
-
-def detect_bias_in_candidates(candidates: List[dict]) -> List[dict]:
-    """Detect potential bias in candidate data"""
-    alerts = []
-    
-    if not candidates:
-        return alerts
-    
-    # Check gender distribution
-    gender_counts = {}
-    for candidate in candidates:
-        gender = candidate.get("gender", "unknown")
-        gender_counts[gender] = gender_counts.get(gender, 0) + 1
-    
-    total_candidates = len(candidates)
-    for gender, count in gender_counts.items():
-        percentage = (count / total_candidates) * 100
-        if percentage < 20 and total_candidates > 5:  # Less than 20% representation
-            alerts.append({
-                "type": "gender",
-                "description": f"Low representation of {gender} candidates ({percentage:.1f}%)",
-                "severity": "medium" if percentage < 10 else "low"
-            })
-    
-    # Check experience distribution
-    experience_counts = {}
-    for candidate in candidates:
-        exp = candidate.get("experience_years")
-        if exp is None:
-            exp_range = "unknown"
-        elif exp < 2:
-            exp_range = "0-2 years"
-        elif exp < 5:
-            exp_range = "2-5 years"
-        elif exp < 10:
-            exp_range = "5-10 years"
-        else:
-            exp_range = "10+ years"
-        experience_counts[exp_range] = experience_counts.get(exp_range, 0) + 1
-    
-    # Check for age bias (if experience is very high)
-    high_exp_count = sum(1 for c in candidates if c.get("experience_years") is not None and c.get("experience_years") > 15)
-    if high_exp_count > total_candidates * 0.8:
-        alerts.append({
-            "type": "experience",
-            "description": f"High concentration of senior candidates ({high_exp_count}/{total_candidates})",
-            "severity": "medium"
-        })
-    
-    return alerts
+import asyncio
 
-def calculate_diversity_metrics(candidates: List[dict]) -> dict:
-    """Calculate diversity metrics for candidates"""
-    if not candidates:
-        return {}
-    
-    total_candidates = len(candidates)
-    
-    # Gender distribution
-    gender_counts = {}
-    for candidate in candidates:
+SSE_HEARTBEAT_SECONDS = 15
+
+class CandidateAggregates:
+    """Single-pass counters behind bias alerts, diversity metrics and insights"""
+    
+    def __init__(self):
+        self.total = 0
+        self.shortlisted = 0
+        self.score_sum = 0
+        self.high_exp_count = 0
+        self.gender_counts = {}
+        self.experience_ranges = {"0-2": 0, "2-5": 0, "5-10": 0, "10+": 0, "unknown": 0}
+        self.education_counts = {}
+        self.skill_counts = {}
+        self.gap_counts = {}
+    
+    @classmethod
+    def from_rows(cls, candidates: Iterable[dict]) -> "CandidateAggregates":
+        aggregates = cls()
+        for candidate in candidates:
+            aggregates.add(candidate)
+        return aggregates
+    
+    def add(self, candidate: dict) -> None:
+        self.total += 1
+        if candidate.get("is_shortlisted", False):
+            self.shortlisted += 1
+        self.score_sum += candidate.get("overall_score", 0)
+        
         gender = candidate.get("gender", "unknown")
-        gender_counts[gender] = gender_counts.get(gender, 0) + 1
-    
-    gender_distribution = {gender: round((count/total_candidates) * 100, 1) for gender, count in gender_counts.items()}
-    
-    # Experience distribution
-    experience_ranges = {"0-2": 0, "2-5": 0, "5-10": 0, "10+": 0, "unknown": 0}
-    for candidate in candidates:
+        self.gender_counts[gender] = self.gender_counts.get(gender, 0) + 1
+        
         exp = candidate.get("experience_years")
         if exp is None:
-            experience_ranges["unknown"] += 1
+            self.experience_ranges["unknown"] += 1
         elif exp < 2:
-            experience_ranges["0-2"] += 1
+            self.experience_ranges["0-2"] += 1
         elif exp < 5:
-            experience_ranges["2-5"] += 1
+            self.experience_ranges["2-5"] += 1
         elif exp < 10:
-            experience_ranges["5-10"] += 1
+            self.experience_ranges["5-10"] += 1
         else:
-            experience_ranges["10+"] += 1
+            self.experience_ranges["10+"] += 1
+        # Very high experience can indicate age bias
+        if exp is not None and exp > 15:
+            self.high_exp_count += 1
+        
+        education = candidate.get("education", "unknown")
+        self.education_counts[education] = self.education_counts.get(education, 0) + 1
+        
+        for skill in candidate.get("matched_skills") or []:
+            self.skill_counts[skill] = self.skill_counts.get(skill, 0) + 1
+        for skill in candidate.get("missing_skills") or []:
+            self.gap_counts[skill] = self.gap_counts.get(skill, 0) + 1
+    
+    def bias_alerts(self) -> List[dict]:
+        alerts = []
+        total_candidates = self.total
+        if not total_candidates:
+            return alerts
+        
+        # Check gender distribution
+        for gender, count in self.gender_counts.items():
+            percentage = (count / total_candidates) * 100
+            if percentage < 20 and total_candidates > 5:  # Less than 20% representation
+                alerts.append({
+                    "type": "gender",
+                    "description": f"Low representation of {gender} candidates ({percentage:.1f}%)",
+                    "severity": "medium" if percentage < 10 else "low"
+                })
+        
+        # Check for age bias (if experience is very high)
+        if self.high_exp_count > total_candidates * 0.8:
+            alerts.append({
+                "type": "experience",
+                "description": f"High concentration of senior candidates ({self.high_exp_count}/{total_candidates})",
+                "severity": "medium"
+            })
+        
+        return alerts
     
-    experience_distribution = {range_name: round((count/total_candidates) * 100, 1) for range_name, count in experience_ranges.items()}
+    def diversity_metrics(self) -> dict:
+        total_candidates = self.total
+        if not total_candidates:
+            return {}
+        
+        return {
+            "gender_distribution": {gender: round((count/total_candidates) * 100, 1) for gender, count in self.gender_counts.items()},
+            "experience_distribution": {range_name: round((count/total_candidates) * 100, 1) for range_name, count in self.experience_ranges.items()},
+            "education_distribution": {edu: round((count/total_candidates) * 100, 1) for edu, count in self.education_counts.items()},
+            "total_candidates": total_candidates
+        }
     
-    # Education distribution
-    education_counts = {}
-    for candidate in candidates:
-        education = candidate.get("education", "unknown")
-        education_counts[education] = education_counts.get(education, 0) + 1
+    def average_score(self) -> float:
+        return round(self.score_sum / self.total, 2) if self.total else 0
     
-    education_distribution = {edu: round((count/total_candidates) * 100, 1) for edu, count in education_counts.items()}
+    def top_skills(self) -> List[dict]:
+        return _top_counts(self.skill_counts)
     
-    return {
-        "gender_distribution": gender_distribution,
-        "experience_distribution": experience_distribution,
-        "education_distribution": education_distribution,
-        "total_candidates": total_candidates
-    }
+    def common_skill_gaps(self) -> List[dict]:
+        return _top_counts(self.gap_counts)
 
-def _get_candidates_data(jd_id: Optional[int] = None, db: Session = None):
-    """Helper function to get candidates data"""
+def _top_counts(counts: dict) -> List[dict]:
+    # Sort by frequency and return top 10
+    sorted_counts = sorted(counts.items(), key=lambda x: x[1], reverse=True)[:10]
+    return [{"skill": skill, "count": count} for skill, count in sorted_counts]
+
+def detect_bias_in_candidates(candidates: Iterable[dict]) -> List[dict]:
+    """Detect potential bias in candidate data"""
+    return CandidateAggregates.from_rows(candidates).bias_alerts()
+
+def calculate_diversity_metrics(candidates: Iterable[dict]) -> dict:
+    """Calculate diversity metrics for candidates"""
+    return CandidateAggregates.from_rows(candidates).diversity_metrics()
+
+# Projection of a ranked candidate row; labels are the keys of the row dicts
+CANDIDATE_ROW_COLUMNS = (
+    Candidate.id.label("id"),
+    Candidate.name.label("name"),
+    Candidate.email.label("email"),
+    Candidate.phone.label("phone"),
+    MatchResult.overall_score.label("overall_score"),
+    MatchResult.skills_match_score.label("skills_match_score"),
+    MatchResult.experience_match_score.label("experience_match_score"),
+    MatchResult.matched_skills.label("matched_skills"),
+    MatchResult.missing_skills.label("missing_skills"),
+    MatchResult.skill_gaps.label("skill_gaps"),
+    Candidate.experience_years.label("experience_years"),
+    Candidate.education.label("education"),
+    Candidate.gender.label("gender"),
+    Candidate.status.label("status"),
+    Candidate.is_shortlisted.label("is_shortlisted"),
+    JD.id.label("jd_id"),
+    JD.title.label("jd_title"),
+    Candidate.created_at.label("created_at"),
+)
+
+CANDIDATE_CHUNK_SIZE = 1000
+
+def _iter_candidates_data(jd_id: Optional[int] = None, db: Session = None) -> Iterator[dict]:
+    """Stream ranked candidate rows without hydrating ORM objects"""
     if db is None:
         from core.db import get_db
         db = next(get_db())
     
-    query = db.query(MatchResult, Candidate, JD).join(
+    query = select(*CANDIDATE_ROW_COLUMNS).join(
         Candidate, MatchResult.candidate_id == Candidate.id
     ).join(
         JD, MatchResult.jd_id == JD.id
     )
     
     if jd_id:
-        query = query.filter(MatchResult.jd_id == jd_id)
+        query = query.where(MatchResult.jd_id == jd_id)
     
-    results = query.filter(MatchResult.overall_score.isnot(None)).order_by(desc(MatchResult.overall_score)).all()
+    query = query.where(MatchResult.overall_score.isnot(None)).order_by(desc(MatchResult.overall_score))
     
-    candidates_data = []
-    for match, candidate, jd in results:
-        candidates_data.append({
-            "id": candidate.id,
-            "name": candidate.name,
-            "email": candidate.email,
-            "phone": candidate.phone,
-            "overall_score": match.overall_score,
-            "skills_match_score": match.skills_match_score,
-            "experience_match_score": match.experience_match_score,
-            "matched_skills": match.matched_skills,
-            "missing_skills": match.missing_skills,
-            "skill_gaps": match.skill_gaps,
-            "experience_years": candidate.experience_years,
-            "education": candidate.education,
-            "gender": candidate.gender,
-            "status": candidate.status,
-            "is_shortlisted": candidate.is_shortlisted,
-            "jd_id": jd.id,
-            "jd_title": jd.title,
-            "created_at": candidate.created_at
-        })
-    
-    return candidates_data
+    for row in db.execute(query.execution_options(yield_per=CANDIDATE_CHUNK_SIZE)):
+        yield dict(row._mapping)
+
+def _get_candidates_data(jd_id: Optional[int] = None, db: Session = None) -> List[dict]:
+    """Helper function to get candidates data"""
+    return list(_iter_candidates_data(jd_id, db))
+
+def candidate_row(match: MatchResult, candidate: Candidate, jd: JD) -> dict:
+    """Shape of a ranked candidate row on the dashboard"""
+    return {
+        "id": candidate.id,
+        "name": candidate.name,
+        "email": candidate.email,
+        "phone": candidate.phone,
+        "overall_score": match.overall_score,
+        "skills_match_score": match.skills_match_score,
+        "experience_match_score": match.experience_match_score,
+        "matched_skills": match.matched_skills,
+        "missing_skills": match.missing_skills,
+        "skill_gaps": match.skill_gaps,
+        "experience_years": candidate.experience_years,
+        "education": candidate.education,
+        "gender": candidate.gender,
+        "status": candidate.status,
+        "is_shortlisted": candidate.is_shortlisted,
+        "jd_id": jd.id,
+        "jd_title": jd.title,
+        "created_at": candidate.created_at
+    }
 
 router = APIRouter()
 
 @router.get("/candidates")
 def get_candidates(jd_id: Optional[int] = None, db: Session = Depends(get_db)):
     """Get ranked candidates for a specific JD or all JDs"""
-    return _get_candidates_data(jd_id, db)
+    return FastJSONResponse(
+        cached_response(db, "dashboard:candidates", jd_id, lambda: _get_candidates_data(jd_id, db))
+    )
 
-@router.get("/bias-alerts")
-def get_bias_alerts(jd_id: Optional[int] = None, db: Session = Depends(get_db)):
-    """Get bias alerts for candidates"""
-    # Get candidates data
-    candidates = _get_candidates_data(jd_id, db)
+def _store_jd_stats(db: Session, jd_id: int, aggregates: CandidateAggregates) -> None:
+    """Replace the stored bias alerts and diversity metrics for a JD"""
+    alerts = aggregates.bias_alerts()
+    metrics = aggregates.diversity_metrics()
     
-    # Detect bias
-    alerts = detect_bias_in_candidates(candidates)
+    db.query(BiasAlert).filter(BiasAlert.jd_id == jd_id).delete()
+    db.query(DiversityMetrics).filter(DiversityMetrics.jd_id == jd_id).delete()
     
-    # Save alerts to database
-    if jd_id and alerts:
-        # Clear existing alerts for this JD
-        db.query(BiasAlert).filter(BiasAlert.jd_id == jd_id).delete()
-        
-        for alert in alerts:
-            bias_alert = BiasAlert(
-                jd_id=jd_id,
-                alert_type=alert["type"],
-                description=alert["description"],
-                severity=alert["severity"]
-            )
-            db.add(bias_alert)
-        db.commit()
-    
-    return alerts
-
-@router.get("/diversity-metrics")
-def get_diversity_metrics(jd_id: Optional[int] = None, db: Session = Depends(get_db)):
-    """Get diversity metrics for candidates"""
-    candidates = _get_candidates_data(jd_id, db)
-    metrics = calculate_diversity_metrics(candidates)
+    for alert in alerts:
+        db.add(BiasAlert(
+            jd_id=jd_id,
+            alert_type=alert["type"],
+            description=alert["description"],
+            severity=alert["severity"]
+        ))
     
-    # Save metrics to database
-    if jd_id and metrics:
-        # Clear existing metrics for this JD
-        db.query(DiversityMetrics).filter(DiversityMetrics.jd_id == jd_id).delete()
-        
-        diversity_record = DiversityMetrics(
+    if metrics:
+        db.add(DiversityMetrics(
             jd_id=jd_id,
             gender_distribution=metrics.get("gender_distribution", {}),
             experience_distribution=metrics.get("experience_distribution", {}),
             education_distribution=metrics.get("education_distribution", {})
-        )
-        db.add(diversity_record)
-        db.commit()
-    
-    return metrics
+        ))
+
+def refresh_stale_stats():
+    """Recompute stored alerts and metrics for JDs whose matches or candidates changed"""
+    db = SessionLocal()
+    try:
+        for jd_id in get_stale_jd_ids(db):
+            version = get_data_version(db, jd_id)
+            aggregates = CandidateAggregates.from_rows(_iter_candidates_data(jd_id, db))
+            _store_jd_stats(db, jd_id, aggregates)
+            
+            # Only mark fresh if no newer change landed while recomputing
+            db.query(JDState).filter(
+                JDState.jd_id == jd_id,
+                JDState.data_version == version
+            ).update({
+                JDState.stats_version: version,
+                JDState.total_candidates: aggregates.total
+            }, synchronize_session=False)
+            db.commit()
+            
+            event_broker.publish("aggregates", jd_id, _aggregate_summary(aggregates))
+    except Exception as e:
+        db.rollback()
+        print(f"Error refreshing dashboard stats: {e}")
+    finally:
+        db.close()
+
+def _aggregate_summary(aggregates: CandidateAggregates) -> dict:
+    """Small aggregate payload pushed to dashboards after a JD's stats change"""
+    diversity_metrics = aggregates.diversity_metrics()
+    return {
+        "total_candidates": aggregates.total,
+        "shortlisted_candidates": aggregates.shortlisted,
+        "average_score": aggregates.average_score(),
+        "bias_alerts": aggregates.bias_alerts(),
+        "diversity_metrics": diversity_metrics,
+        "diversity_score": calculate_actual_diversity_score(diversity_metrics)
+    }
+
+def _has_fresh_stats(state: Optional[JDState]) -> bool:
+    return bool(state and state.stats_version and state.stats_version == state.data_version)
+
+@router.get("/bias-alerts")
+def get_bias_alerts(jd_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """Get bias alerts for candidates"""
+    return cached_response(db, "dashboard:bias-alerts", jd_id, lambda: _load_bias_alerts(jd_id, db))
+
+def _load_bias_alerts(jd_id: Optional[int], db: Session) -> List[dict]:
+    # Serve stored alerts when they are up to date with the JD's data
+    if jd_id and _has_fresh_stats(get_jd_state(db, jd_id)):
+        stored_alerts = db.query(
+            BiasAlert.alert_type, BiasAlert.description, BiasAlert.severity
+        ).filter(BiasAlert.jd_id == jd_id).order_by(BiasAlert.id).all()
+        return [
+            {
+                "type": alert.alert_type,
+                "description": alert.description,
+                "severity": alert.severity
+            }
+            for alert in stored_alerts
+        ]
+    
+    # Otherwise compute on the fly without writing; the refresher stores them
+    return detect_bias_in_candidates(_iter_candidates_data(jd_id, db))
+
+@router.get("/diversity-metrics")
+def get_diversity_metrics(jd_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """Get diversity metrics for candidates"""
+    return cached_response(db, "dashboard:diversity-metrics", jd_id, lambda: _load_diversity_metrics(jd_id, db))
+
+def _load_diversity_metrics(jd_id: Optional[int], db: Session) -> dict:
+    if jd_id:
+        state = get_jd_state(db, jd_id)
+        if _has_fresh_stats(state):
+            stored = db.query(DiversityMetrics).filter(DiversityMetrics.jd_id == jd_id).first()
+            if not stored:
+                return {}
+            return {
+                "gender_distribution": stored.gender_distribution,
+                "experience_distribution": stored.experience_distribution,
+                "education_distribution": stored.education_distribution,
+                "total_candidates": state.total_candidates
+            }
+    
+    return calculate_diversity_metrics(_iter_candidates_data(jd_id, db))
 
 @router.get("/skills-heatmap")
-def get_skills_heatmap(jd_id: Optional[int] = None, db: Session = Depends(get_db)):
+def get_skills_heatmap(jd_id: Optional[int] = None, limit: int = 20, db: Session = Depends(get_db)):
     """Get skills heatmap data showing skill gaps"""
-    # Mock data for now - in a real implementation, this would analyze actual skill gaps
-    skills_data = [
-        {"skill": "Python", "gap": 0.3, "demand": 0.8, "supply": 0.5},
-        {"skill": "JavaScript", "gap": 0.2, "demand": 0.7, "supply": 0.5},
-        {"skill": "Machine Learning", "gap": 0.8, "demand": 0.9, "supply": 0.1},
-        {"skill": "React", "gap": 0.4, "demand": 0.6, "supply": 0.2},
-        {"skill": "SQL", "gap": 0.1, "demand": 0.5, "supply": 0.4},
-        {"skill": "AWS", "gap": 0.6, "demand": 0.8, "supply": 0.2},
-        {"skill": "Docker", "gap": 0.5, "demand": 0.7, "supply": 0.2},
-        {"skill": "Git", "gap": 0.1, "demand": 0.4, "supply": 0.3},
-    ]
-    
+    # Built from counters maintained when match results are written
+    return cached_response(
+        db, "dashboard:skills-heatmap", jd_id,
+        lambda: _build_skills_heatmap(jd_id, limit, db),
+        limit=limit
+    )
+
+def _build_skills_heatmap(jd_id: Optional[int], limit: int, db: Session) -> dict:
+    skills_data = get_skill_heatmap(db, jd_id, limit)
     return {
         "skills": skills_data,
         "total_skills": len(skills_data),
         "critical_gaps": len([s for s in skills_data if s["gap"] > 0.7])
     }
 
+@router.get("/export")
+def export_ranked_candidates(jd_id: int, format: str = "csv", db: Session = Depends(get_db)):
+    """Stream a JD's ranked candidates as CSV or Parquet"""
+    jd = db.query(JD.id).filter(JD.id == jd_id).first()
+    if not jd:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    
+    if format == "csv":
+        return StreamingResponse(
+            stream_csv(jd_id),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="jd-{jd_id}-candidates.csv"'}
+        )
+    
+    if format == "parquet":
+        if not parquet_available():
+            raise HTTPException(status_code=501, detail="Parquet export requires the pyarrow package (listed in requirements.txt)")
+        return StreamingResponse(
+            stream_parquet(jd_id),
+            media_type="application/vnd.apache.parquet",
+            headers={"Content-Disposition": f'attachment; filename="jd-{jd_id}-candidates.parquet"'}
+        )
+    
+    raise HTTPException(status_code=400, detail="Invalid format. Must be one of: ['csv', 'parquet']")
+
+@router.get("/org-report")
+def get_org_report(db: Session = Depends(get_db)):
+    """Get diversity metrics and bias alerts for every active JD plus the whole organization"""
+    return cached_response(db, "dashboard:org-report", None, lambda: build_org_report(db))
+
 @router.get("/insights")
 def get_dashboard_insights(jd_id: Optional[int] = None, db: Session = Depends(get_db)):
     """Get comprehensive dashboard insights"""
     try:
-        candidates = _get_candidates_data(jd_id, db)
-        bias_alerts = detect_bias_in_candidates(candidates)
-        diversity_metrics = calculate_diversity_metrics(candidates)
-        
-        # Generate risk heatmap data (mock data for now)
-        heatmap_response = get_skills_heatmap(jd_id, db)
-        critical_skills = [skill for skill in heatmap_response["skills"] if skill["gap"] > 0.7]
-        
-        # Generate risk heatmap data for departments (mock data)
-        risk_heatmap = {
-            "Engineering": random.randint(10, 30),
-            "Marketing": random.randint(5, 25),
-            "Sales": random.randint(15, 35),
-            "HR": random.randint(8, 20),
-            "Finance": random.randint(12, 28)
-        }
-        
-        # Calculate diversity score based on actual data
-        diversity_score = calculate_actual_diversity_score(diversity_metrics)
-        
-        # Generate sentiment data (mock)
-        sentiment_data = {
-            "positive": random.randint(60, 80),
-            "neutral": random.randint(15, 25),
-            "negative": random.randint(5, 15)
-        }
-        
-        # Handle empty candidates list gracefully
-        shortlisted_count = len([c for c in candidates if c.get("is_shortlisted", False)]) if candidates else 0
-        average_score = round(sum(c.get("overall_score", 0) for c in candidates) / len(candidates), 2) if candidates else 0
-        
-        return {
-            "total_candidates": len(candidates),
-            "shortlisted_candidates": shortlisted_count,
-            "average_score": average_score,
-            "bias_alerts": bias_alerts,
-            "diversity_metrics": diversity_metrics,
-            "risk_heatmap": risk_heatmap,
-            "diversity_score": diversity_score,
-            "sentiment_data": sentiment_data,
-            "top_skills": _get_top_skills(candidates),
-            "skill_gaps": _get_common_skill_gaps(candidates)
-        }
+        return cached_response(
+            db, "dashboard:insights", jd_id,
+            lambda: _build_insights(_iter_candidates_data(jd_id, db), jd_id, db)
+        )
     except Exception as e:
-        # Return a basic response if there's an error
-        return {
-            "total_candidates": 0,
-            "shortlisted_candidates": 0,
-            "average_score": 0,
-            "bias_alerts": [],
-            "diversity_metrics": {},
-            "risk_heatmap": {"skills": [], "total_skills": 0, "critical_gaps": 0},
-            "diversity_score": 0.75,
-            "sentiment_data": {"positive": 70, "neutral": 20, "negative": 10},
-            "top_skills": [],
-            "skill_gaps": [],
-            "error": str(e)
-        }
+        return _empty_insights(str(e))
 
-def _get_top_skills(candidates: List[dict]) -> List[dict]:
-    """Get most common skills across candidates"""
-    skill_counts = {}
-    for candidate in candidates:
-        for skill in candidate.get("matched_skills", []):
-            skill_counts[skill] = skill_counts.get(skill, 0) + 1
+def _snapshot_etag(jd_id: Optional[int], version: int) -> str:
+    scope = jd_id or "all"
+    return f'W/"dashboard-{scope}-v{version}"'
+
+@router.get("/snapshot")
+def get_dashboard_snapshot(
+    request: Request,
+    jd_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Get ranked candidates and insights computed from a single candidate scan"""
+    # The ETag only depends on the JD's data version, so unchanged dashboards
+    # are answered without touching the candidate tables
+    version = get_data_version(db, jd_id)
+    etag = _snapshot_etag(jd_id, version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    
+    snapshot = response_cache.get_or_set(
+        cache_key("dashboard:snapshot", jd_id),
+        version,
+        lambda: _build_snapshot(jd_id, version, db)
+    )
+    return FastJSONResponse(snapshot, headers=headers)
+
+@router.get("/events")
+async def stream_dashboard_events(request: Request, jd_id: Optional[int] = None):
+    """Stream dashboard change events (server-sent events) for a JD or all JDs"""
+    subscription = event_broker.subscribe(jd_id)
+    
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            event_broker.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _build_snapshot(jd_id: Optional[int], version: int, db: Session) -> dict:
+    candidates = _get_candidates_data(jd_id, db)
+    try:
+        insights = _build_insights(candidates, jd_id, db)
+    except Exception as e:
+        insights = _empty_insights(str(e))
     
-    # Sort by frequency and return top 10
-    sorted_skills = sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-    return [{"skill": skill, "count": count} for skill, count in sorted_skills]
+    return {
+        "jd_id": jd_id,
+        "version": version,
+        "candidates": candidates,
+        "insights": insights
+    }
 
-def _get_common_skill_gaps(candidates: List[dict]) -> List[dict]:
-    """Get most common skill gaps"""
-    gap_counts = {}
-    for candidate in candidates:
-        for skill in candidate.get("missing_skills", []):
-            gap_counts[skill] = gap_counts.get(skill, 0) + 1
+def _build_insights(candidates: Iterable[dict], jd_id: Optional[int], db: Session) -> dict:
+    """Derive dashboard insights from candidate rows in a single pass"""
+    # Consume the rows before issuing other queries on the session
+    aggregates = CandidateAggregates.from_rows(candidates)
+    bias_alerts = aggregates.bias_alerts()
+    diversity_metrics = aggregates.diversity_metrics()
+    
+    # Skill gaps from the counter-backed heatmap
+    heatmap_response = get_skills_heatmap(jd_id, db=db)
+    critical_skills = [skill for skill in heatmap_response["skills"] if skill["gap"] > 0.7]
+    
+    # Generate risk heatmap data for departments (mock data)
+    risk_heatmap = {
+        "Engineering": random.randint(10, 30),
+        "Marketing": random.randint(5, 25),
+        "Sales": random.randint(15, 35),
+        "HR": random.randint(8, 20),
+        "Finance": random.randint(12, 28)
+    }
     
-    # Sort by frequency and return top 10
-    sorted_gaps = sorted(gap_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-    return [{"skill": skill, "count": count} for skill, count in sorted_gaps]
+    # Calculate diversity score based on actual data
+    diversity_score = calculate_actual_diversity_score(diversity_metrics)
+    
+    # Generate sentiment data (mock)
+    sentiment_data = {
+        "positive": random.randint(60, 80),
+        "neutral": random.randint(15, 25),
+        "negative": random.randint(5, 15)
+    }
+    
+    return {
+        "total_candidates": aggregates.total,
+        "shortlisted_candidates": aggregates.shortlisted,
+        "average_score": aggregates.average_score(),
+        "bias_alerts": bias_alerts,
+        "diversity_metrics": diversity_metrics,
+        "risk_heatmap": risk_heatmap,
+        "diversity_score": diversity_score,
+        "sentiment_data": sentiment_data,
+        "top_skills": aggregates.top_skills(),
+        "skill_gaps": aggregates.common_skill_gaps(),
+        "critical_gaps": critical_skills
+    }
+
+def _empty_insights(error: str) -> dict:
+    """Basic insights response returned when they cannot be computed"""
+    return {
+        "total_candidates": 0,
+        "shortlisted_candidates": 0,
+        "average_score": 0,
+        "bias_alerts": [],
+        "diversity_metrics": {},
+        "risk_heatmap": {"skills": [], "total_skills": 0, "critical_gaps": 0},
+        "diversity_score": 0.75,
+        "sentiment_data": {"positive": 70, "neutral": 20, "negative": 10},
+        "top_skills": [],
+        "skill_gaps": [],
+        "critical_gaps": [],
+        "error": error
+    }
 
 @router.post("/shortlist")
 async def shortlist_candidates(
@@ -374,30 +527,43 @@ async def shortlist_candidates(
         raise HTTPException(status_code=404, detail="No candidates found")
     
     shortlisted_count = 0
-    email_tasks = []
+    shortlisted_ids = []
+    emails_queued = 0
     
     for candidate in candidates:
         if not candidate.is_shortlisted:
             candidate.is_shortlisted = True
             candidate.status = "shortlisted"  # Update status field as well
             shortlisted_count += 1
+            shortlisted_ids.append(candidate.id)
             
-            # Add email task to background
+            # Queue the notification in the same transaction as the status change
             if candidate.email:
                 from datetime import datetime, timedelta
-                import random
                 # Generate random interview date (3-10 days from now)
                 interview_date = datetime.now() + timedelta(days=random.randint(3, 10))
                 
-                background_tasks.add_task(
-                    send_shortlist_email,
-                    candidate.email,
-                    candidate.name,
-                    jd.title,
-                    interview_date.strftime("%B %d, %Y at %I:%M %p")
-                )
-    
+                enqueue_email(db, candidate.id, "shortlist", candidate.email, {
+                    "candidate_name": candidate.name,
+                    "position": jd.title,
+                    "interview_date": interview_date.strftime("%B %d, %Y at %I:%M %p")
+                }, jd_id=jd.id)
+                emails_queued += 1
+    
+    if shortlisted_count:
+        jd_ids = bump_candidate_versions(db, [candidate.id for candidate in candidates])
     db.commit()
+    if shortlisted_count:
+        for candidate_id in shortlisted_ids:
+            event_broker.publish("status_changed", None, {
+                "candidate_id": candidate_id,
+                "status": "shortlisted",
+                "is_shortlisted": True,
+                "jd_ids": jd_ids
+            })
+        background_tasks.add_task(refresh_stale_stats)
+    if emails_queued:
+        background_tasks.add_task(drain_after_enqueue)
     
     return {
         "message": f"Successfully shortlisted {shortlisted_count} candidates",
@@ -412,16 +578,14 @@ def get_candidate_details(candidate_id: int, db: Session = Depends(get_db)):
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
-    # Get all matches for this candidate
-    matches = db.query(MatchResult, JD).join(
-        JD, MatchResult.jd_id == JD.id
-    ).filter(MatchResult.candidate_id == candidate_id).all()
+    # Get all matches for this candidate (projection only)
+    matches = get_candidate_match_rows(db, candidate_id)
     
     match_details = []
-    for match, jd in matches:
+    for match in matches:
         match_details.append({
-            "jd_id": jd.id,
-            "jd_title": jd.title,
+            "jd_id": match.jd_id,
+            "jd_title": match.jd_title,
             "overall_score": match.overall_score,
             "skills_match_score": match.skills_match_score,
             "experience_match_score": match.experience_match_score,
@@ -1,22 +1,29 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
 from core.db import get_db
 from core.models import JD, Candidate, MatchResult
+from core.versions import bump_data_version
+from core.cache import cached_response
+from core.events import event_broker
+from core.tracing import span
+from api.dashboard import refresh_stale_stats
 from services.parser import extract_text_from_file, extract_jd_requirements
+from services.blob_store import blob_store
 import os
 import json
-import shutil
 
 router = APIRouter()
 from services.matcher import calculate_comprehensive_match
+from services.skill_stats import SkillCounterBatch
 from typing import Optional
 
-UPLOAD_DIR = "uploads/jd"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
+def _parse_jd_file(path: str) -> dict:
+    text = extract_text_from_file(path)
+    return {"text": text, "requirements": extract_jd_requirements(text) if text else None}
 
 @router.post("/upload")
 async def upload_jd(
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     file: UploadFile | None = None,
     text: str | None = Form(None),
@@ -27,27 +34,34 @@ async def upload_jd(
         raise HTTPException(status_code=400, detail="Either file or text must be provided")
     
     file_path = None
+    blob_id = None
     jd_text = text or ""
+    requirements = None
     
-    # Handle file upload
+    # Handle file upload (identical files are stored and parsed once)
     if file:
-        file_path = os.path.join(UPLOAD_DIR, file.filename)
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        with span("jd.save_file", filename=file.filename):
+            blob, _ = blob_store.put(db, file.file, file.filename)
+        file_path, blob_id = blob.storage_path, blob.id
         
-        # Extract text from file
-        extracted_text = extract_text_from_file(file_path)
-        if extracted_text:
-            jd_text = extracted_text
+        # Extract text and requirements from file
+        with span("jd.parse"):
+            parsed = blob_store.parsed(db, blob, "jd", _parse_jd_file)
+        if parsed["text"]:
+            jd_text = parsed["text"]
+            requirements = parsed["requirements"]
     
     # Extract requirements from JD text
-    requirements = extract_jd_requirements(jd_text)
+    if requirements is None:
+        with span("jd.parse"):
+            requirements = extract_jd_requirements(jd_text)
     
     # Create JD record
     jd = JD(
         title=title,
         description=jd_text,
         file_path=file_path,
+        blob_id=blob_id,
         required_skills=requirements.get("required_skills", [])
     )
     db.add(jd)
@@ -56,6 +70,9 @@ async def upload_jd(
     
     # Trigger matching for existing candidates
     candidates = db.query(Candidate).all()
+    skill_counters = SkillCounterBatch(jd.id)
+    # Stored resume parses for all candidates, loaded up front in one query
+    resume_parses = blob_store.cached_results(db, (candidate.blob_id for candidate in candidates), "resume")
     for candidate in candidates:
         # Get candidate data
         candidate_data = {
@@ -64,8 +81,11 @@ async def upload_jd(
             "experience_years": candidate.experience_years
         }
         
-        # Extract text from resume if needed
-        if candidate.resume_path and os.path.exists(candidate.resume_path):
+        # Reuse the stored parse of the resume; older candidates have only the file
+        cached = resume_parses.get(candidate.blob_id)
+        if cached:
+            candidate_data["raw_text"] = cached.get("raw_text", "")
+        elif candidate.resume_path and os.path.exists(candidate.resume_path):
             candidate_data["raw_text"] = extract_text_from_file(candidate.resume_path)
         
         # Calculate match
@@ -75,36 +95,31 @@ async def upload_jd(
             "required_experience": requirements.get("required_experience")
         }
         
-        match_result = calculate_comprehensive_match(jd_data, candidate_data)
-        
-        # Save or update match result
-        existing_match = db.query(MatchResult).filter(
-            MatchResult.jd_id == jd.id,
-            MatchResult.candidate_id == candidate.id
-        ).first()
+        with span("jd.match", candidate_id=candidate.id):
+            match_result = calculate_comprehensive_match(jd_data, candidate_data)
         
-        if existing_match:
-            existing_match.overall_score = match_result["overall_score"]
-            existing_match.skills_match_score = match_result["skills_match_score"]
-            existing_match.experience_match_score = match_result["experience_match_score"]
-            existing_match.matched_skills = match_result["matched_skills"]
-            existing_match.missing_skills = match_result["missing_skills"]
-            existing_match.skill_gaps = match_result["skill_gaps"]
-        else:
-            match = MatchResult(
-                jd_id=jd.id,
-                candidate_id=candidate.id,
-                overall_score=match_result["overall_score"],
-                skills_match_score=match_result["skills_match_score"],
-                experience_match_score=match_result["experience_match_score"],
-                matched_skills=match_result["matched_skills"],
-                missing_skills=match_result["missing_skills"],
-                skill_gaps=match_result["skill_gaps"]
-            )
-            db.add(match)
+        # The JD was just created, so every candidate gets a new match row
+        match = MatchResult(
+            jd_id=jd.id,
+            candidate_id=candidate.id,
+            overall_score=match_result["overall_score"],
+            skills_match_score=match_result["skills_match_score"],
+            experience_match_score=match_result["experience_match_score"],
+            matched_skills=match_result["matched_skills"],
+            missing_skills=match_result["missing_skills"],
+            skill_gaps=match_result["skill_gaps"]
+        )
+        db.add(match)
+        skill_counters.add(match_result["matched_skills"], match_result["missing_skills"])
     
+    skill_counters.apply(db)
+    bump_data_version(db, [jd.id])
     db.commit()
     
+    # A new JD brings a whole set of new rows; let dashboards reload them
+    event_broker.publish("resync", jd.id, {"reason": "jd_uploaded"})
+    background_tasks.add_task(refresh_stale_stats)
+    
     return {
         "message": "JD uploaded successfully",
         "jd_id": jd.id,
@@ -115,6 +130,9 @@ async def upload_jd(
 @router.get("/")
 def get_jds(db: Session = Depends(get_db)):
     """Get all job descriptions"""
+    return cached_response(db, "jd:list", None, lambda: _load_jds(db))
+
+def _load_jds(db: Session):
     jds = db.query(JD).filter(JD.is_active == True).all()
     return [
         {
@@ -1,50 +1,64 @@
-from fastapi import APIRouter, UploadFile, Form, Depends, HTTPException
+from fastapi import APIRouter, UploadFile, Form, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
-import shutil, os
 from core.db import get_db
 from core.models import Candidate, MatchResult, JD
+from core.queries import get_candidate_with_matches
+from core.versions import bump_data_version
+from core.events import event_broker
+from core.responses import FastJSONResponse
+from core.tracing import span
+from api.dashboard import refresh_stale_stats, candidate_row
 from services.parser import parse_resume
+from services.blob_store import blob_store
 from services.matcher import calculate_comprehensive_match
+from services.skill_stats import record_match
 from typing import Optional
-
-UPLOAD_DIR = "uploads/resumes"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+import os
+import shutil
+import tempfile
 
 router = APIRouter()
 
 @router.post("/extract")
-async def extract_resume_details(file: UploadFile):
+async def extract_resume_details(file: UploadFile, db: Session = Depends(get_db)):
     """Extract details from resume file for auto-filling form"""
     if not file:
         raise HTTPException(status_code=400, detail="Resume file is required")
     
-    # Save temporary file
-    temp_path = os.path.join(UPLOAD_DIR, f"temp_{file.filename}")
-    with open(temp_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # A preview stores nothing; it only reuses the parse of a file that was already uploaded
+    blob_id, _ = blob_store.hash_stream(file.file)
+    parsed_data = blob_store.cached_result(db, blob_id, "resume")
+    if parsed_data is None:
+        file.file.seek(0)
+        parsed_data = _parse_preview(file)
+    
+    if "error" in parsed_data:
+        raise HTTPException(status_code=400, detail=parsed_data["error"])
     
+    return {
+        "name": parsed_data.get("name", ""),
+        "email": parsed_data.get("email", ""),
+        "phone": parsed_data.get("phone", ""),
+        "skills": parsed_data.get("extracted_skills", []),
+        "experience_years": parsed_data.get("experience_years"),
+        "education": parsed_data.get("education", "")
+    }
+
+def _parse_preview(file: UploadFile) -> dict:
+    """Parse an upload from a temporary file that is removed afterwards"""
+    # The extension is kept because text extraction dispatches on it
+    extension = os.path.splitext(file.filename or "")[1].lower()
+    fd, temp_path = tempfile.mkstemp(suffix=extension)
     try:
-        # Parse resume
-        parsed_data = parse_resume(temp_path)
-        
-        if "error" in parsed_data:
-            raise HTTPException(status_code=400, detail=parsed_data["error"])
-        
-        return {
-            "name": parsed_data.get("name", ""),
-            "email": parsed_data.get("email", ""),
-            "phone": parsed_data.get("phone", ""),
-            "skills": parsed_data.get("extracted_skills", []),
-            "experience_years": parsed_data.get("experience_years"),
-            "education": parsed_data.get("education", "")
-        }
+        with os.fdopen(fd, "wb") as buffer:
+            shutil.copyfileobj(file.file, buffer)
+        return parse_resume(temp_path)
     finally:
-        # Clean up temp file
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+        os.remove(temp_path)
 
 @router.post("/upload")
 async def upload_resume(
+    background_tasks: BackgroundTasks,
     name: str = Form(...),
     jd_id: int = Form(...),
     email: str = Form(None),
@@ -57,13 +71,14 @@ async def upload_resume(
     if not file:
         raise HTTPException(status_code=400, detail="Resume file is required")
     
-    # Save file
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Save file (identical content is stored once and parsed once)
+    with span("resume.save_file", filename=file.filename) as save_span:
+        blob, stored = blob_store.put(db, file.file, file.filename)
+        save_span.set_attribute("blob.new", stored)
     
     # Parse resume
-    parsed_data = parse_resume(file_path)
+    with span("resume.parse"):
+        parsed_data = blob_store.parsed(db, blob, "resume", parse_resume)
     
     if "error" in parsed_data:
         raise HTTPException(status_code=400, detail=parsed_data["error"])
@@ -74,7 +89,8 @@ async def upload_resume(
         email=email or parsed_data.get("email"),
         phone=phone or parsed_data.get("phone"),
         gender=gender,
-        resume_path=file_path,
+        resume_path=blob.storage_path,
+        blob_id=blob.id,
         extracted_skills=parsed_data.get("extracted_skills", []),
         experience_years=parsed_data.get("experience_years"),
         education=parsed_data.get("education")
@@ -103,7 +119,8 @@ async def upload_resume(
         }
         
         # Calculate comprehensive match
-        match_result = calculate_comprehensive_match(jd_data, candidate_data)
+        with span("resume.match", jd_id=jd.id):
+            match_result = calculate_comprehensive_match(jd_data, candidate_data)
         
         # Create match record
         match = MatchResult(
@@ -118,9 +135,15 @@ async def upload_resume(
         )
         
         db.add(match)
+        record_match(db, jd.id, match_result["matched_skills"], match_result["missing_skills"])
         matches_created = 1
     
+    # A new candidate changes the overall pool even when no JD matched
+    bump_data_version(db, [jd.id] if jd else [])
     db.commit()
+    if matches_created:
+        event_broker.publish("match_created", jd.id, candidate_row(match, candidate, jd))
+        background_tasks.add_task(refresh_stale_stats)
     
     return {
         "message": "Resume uploaded successfully",
@@ -139,7 +162,7 @@ async def upload_resume(
 def get_candidates(db: Session = Depends(get_db)):
     """Get all candidates"""
     candidates = db.query(Candidate).all()
-    return [
+    return FastJSONResponse([
         {
             "id": candidate.id,
             "name": candidate.name,
@@ -153,24 +176,21 @@ def get_candidates(db: Session = Depends(get_db)):
             "is_shortlisted": candidate.is_shortlisted
         }
         for candidate in candidates
-    ]
+    ])
 
 @router.get("/{candidate_id}")
 def get_candidate(candidate_id: int, db: Session = Depends(get_db)):
     """Get specific candidate details"""
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    # Candidate, matches and their JDs are loaded eagerly in a fixed number of queries
+    candidate = get_candidate_with_matches(db, candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
-    # Get match results for this candidate
-    matches = db.query(MatchResult).filter(MatchResult.candidate_id == candidate_id).all()
     match_data = []
-    
-    for match in matches:
-        jd = db.query(JD).filter(JD.id == match.jd_id).first()
+    for match in candidate.matches:
         match_data.append({
             "jd_id": match.jd_id,
-            "jd_title": jd.title if jd else "Unknown",
+            "jd_title": match.jd.title if match.jd else "Unknown",
             "overall_score": match.overall_score,
             "skills_match_score": match.skills_match_score,
             "experience_match_score": match.experience_match_score,
@@ -0,0 +1,167 @@
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from sqlalchemy.orm import Session
+from core.versions import get_data_version
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "local")  # local, redis, fake
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+_MISSING = object()
+
+class LocalCacheBackend:
+    """In-process LRU store"""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return _MISSING
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class FakeSharedCacheBackend(LocalCacheBackend):
+    """Local stand-in for a shared backend; values are pickled like they would be over the wire"""
+
+    def get(self, key: str) -> Any:
+        value = super().get(key)
+        return value if value is _MISSING else pickle.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        super().set(key, pickle.dumps(value))
+
+class RedisCacheBackend:
+    """Shared store so several workers reuse each other's responses"""
+
+    def __init__(self, url: str = REDIS_URL, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        import redis  # Optional dependency, only needed for the shared backend
+
+        self.client = redis.Redis.from_url(url)
+        self.max_entries = max_entries
+        self._index_key = "response_cache:lru"
+
+    def get(self, key: str) -> Any:
+        value = self.client.get(key)
+        if value is None:
+            return _MISSING
+        self.client.zadd(self._index_key, {key: self.client.time()[0]})
+        return pickle.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        pipe = self.client.pipeline()
+        pipe.set(key, pickle.dumps(value))
+        pipe.zadd(self._index_key, {key: self.client.time()[0]})
+        pipe.execute()
+
+        # Evict least recently used keys beyond the bound
+        overflow = self.client.zcard(self._index_key) - self.max_entries
+        if overflow > 0:
+            stale = self.client.zrange(self._index_key, 0, overflow - 1)
+            if stale:
+                self.client.delete(*stale)
+                self.client.zrem(self._index_key, *stale)
+
+    def clear(self) -> None:
+        keys = self.client.zrange(self._index_key, 0, -1)
+        if keys:
+            self.client.delete(*keys)
+        self.client.delete(self._index_key)
+
+    def __len__(self) -> int:
+        return self.client.zcard(self._index_key)
+
+class ResponseCache:
+    """Response cache keyed by JD data version, so writes invalidate exactly.
+
+    Each response has one slot holding the version it was computed for; a
+    newer version replaces the slot instead of leaving the old one to age out.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_set(self, key: str, version: Union[int, Tuple[int, ...]], compute: Callable[[], Any]) -> Any:
+        entry = self.backend.get(key)
+        if entry is not _MISSING and entry[0] == version:
+            with self._lock:
+                self.hits += 1
+            return entry[1]
+
+        with self._lock:
+            self.misses += 1
+        value = compute()
+        # A slower request for an older version must not replace a newer entry
+        if entry is _MISSING or entry[0] < version:
+            self.backend.set(key, (version, value))
+        return value
+
+    def clear(self) -> None:
+        self.backend.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0
+        }
+
+def _create_backend():
+    if RESPONSE_CACHE_BACKEND == "redis":
+        try:
+            return RedisCacheBackend()
+        except ImportError:
+            print("redis is not installed, falling back to the local response cache")
+    elif RESPONSE_CACHE_BACKEND == "fake":
+        return FakeSharedCacheBackend()
+    return LocalCacheBackend()
+
+def cached_response(
+    db: Session,
+    name: str,
+    jd_id: Optional[int],
+    compute: Callable[[], Any],
+    **params
+) -> Any:
+    """Return a cached response for the JD's current data version, computing it on a miss"""
+    version = get_data_version(db, jd_id)
+    return response_cache.get_or_set(cache_key(name, jd_id, **params), version, compute)
+
+def cache_key(name: str, jd_id: Optional[int], **params) -> str:
+    """Slot for a response; the data version is stored with the value, not in the key"""
+    extra = ":".join(f"{key}={params[key]}" for key in sorted(params))
+    return f"{name}:{jd_id or 'all'}:{extra}"
+
+# Global instance
+response_cache = ResponseCache(_create_backend())
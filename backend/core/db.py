@@ -1,8 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
+from core import metrics, tracing
 
 load_dotenv()
 
@@ -16,6 +17,9 @@ else:
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+metrics.instrument_commits(SessionLocal)
+tracing.instrument_engine(engine)
+tracing.instrument_commits(SessionLocal)
 
 def get_db():
     db = SessionLocal()
@@ -24,5 +28,41 @@ def get_db():
     finally:
         db.close()
 
+def _add_missing_columns():
+    """Add nullable columns declared since an existing table was created"""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
 def create_tables():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    # create_all skips tables that already exist, so add indexes declared since
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    _backfill_skill_counters()
+
+def _backfill_skill_counters():
+    """Fill the skill heatmap counters on a database upgraded from before they existed"""
+    from services.skill_stats import backfill_skill_counters_if_empty
+
+    db = SessionLocal()
+    try:
+        counted = backfill_skill_counters_if_empty(db)
+        if counted is not None:
+            print(f"Backfilled skill counters from {counted} existing match results")
+    except Exception as e:
+        db.rollback()
+        print(f"Error backfilling skill counters, run python -m scripts.rebuild_skill_counters: {e}")
+    finally:
+        db.close()
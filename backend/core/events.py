@@ -0,0 +1,72 @@
+import asyncio
+import itertools
+import threading
+from typing import Dict, Optional
+from core.responses import dumps_json
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+class Subscription:
+    def __init__(self, jd_id: Optional[int]):
+        self.jd_id = jd_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def wants(self, jd_id: Optional[int]) -> bool:
+        # Subscribers without a JD filter see every JD's events
+        return self.jd_id is None or jd_id is None or self.jd_id == jd_id
+
+    def put(self, event: Dict) -> None:
+        # Runs on the subscriber's event loop; a slow client that fell behind
+        # gets its backlog replaced by a single resync event
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = {"id": event["id"], "type": "resync", "jd_id": self.jd_id, "data": {}}
+        self.queue.put_nowait(event)
+
+class EventBroker:
+    """In-process pub/sub of per-JD dashboard change events"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, jd_id: Optional[int] = None) -> Subscription:
+        subscription = Subscription(jd_id)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event_type: str, jd_id: Optional[int], data: Dict) -> None:
+        """Publish an event; safe to call from request threads and background tasks"""
+        with self._lock:
+            subscribers = [s for s in self._subscribers if s.wants(jd_id)]
+        if not subscribers:
+            return
+
+        event = {"id": next(self._ids), "type": event_type, "jd_id": jd_id, "data": data}
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                # The subscriber's loop has shut down
+                self.unsubscribe(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+def format_sse(event: Dict) -> str:
+    """Encode an event in text/event-stream format"""
+    # Encoded like the snapshot endpoint, so timestamps match it
+    payload = dumps_json({"jd_id": event["jd_id"], **event["data"]}).decode()
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
+
+# Global instance
+event_broker = EventBroker()
@@ -1,14 +1,24 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, DateTime, Boolean, JSON
+from sqlalchemy import Index, Column, Integer, String, Float, ForeignKey, Text, DateTime, Boolean, JSON
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from core.db import Base
 
+class Blob(Base):
+    __tablename__ = "blobs"
+    id = Column(String, primary_key=True)  # SHA-256 of the content, hex
+    size = Column(Integer, nullable=False)
+    storage_path = Column(String, nullable=False)
+    original_filename = Column(String, nullable=True)  # Name of the first upload
+    parsed_data = Column(JSON, nullable=True)  # Parse results per parser ('resume', 'jd')
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 class JD(Base):
     __tablename__ = "jds"
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     file_path = Column(String, nullable=True)
+    blob_id = Column(String, ForeignKey("blobs.id"), nullable=True, index=True)  # Uploaded file, if any
     required_skills = Column(JSON, nullable=True)  # List of required skills
     created_at = Column(DateTime, default=datetime.utcnow)
     is_active = Column(Boolean, default=True)
@@ -22,6 +32,7 @@ class Candidate(Base):
     email = Column(String, nullable=True)
     phone = Column(String, nullable=True)
     resume_path = Column(String, nullable=False)
+    blob_id = Column(String, ForeignKey("blobs.id"), nullable=True, index=True)  # Stored resume file
     extracted_skills = Column(JSON, nullable=True)  # List of extracted skills
     experience_years = Column(Integer, nullable=True)
     education = Column(String, nullable=True)
@@ -48,10 +59,15 @@ class MatchResult(Base):
     jd = relationship("JD", back_populates="matches")
     candidate = relationship("Candidate", back_populates="matches")
 
+    __table_args__ = (
+        # Serves per-JD ranking (ORDER BY overall_score DESC LIMIT k) from the index
+        Index("ix_match_results_jd_score", "jd_id", "overall_score"),
+    )
+
 class BiasAlert(Base):
     __tablename__ = "bias_alerts"
     id = Column(Integer, primary_key=True, index=True)
-    jd_id = Column(Integer, ForeignKey("jds.id"))
+    jd_id = Column(Integer, ForeignKey("jds.id"), index=True)
     alert_type = Column(String)  # 'gender', 'experience', 'education'
     description = Column(Text)
     severity = Column(String)  # 'low', 'medium', 'high'
@@ -60,8 +76,46 @@ class BiasAlert(Base):
 class DiversityMetrics(Base):
     __tablename__ = "diversity_metrics"
     id = Column(Integer, primary_key=True, index=True)
-    jd_id = Column(Integer, ForeignKey("jds.id"))
+    jd_id = Column(Integer, ForeignKey("jds.id"), index=True)
     gender_distribution = Column(JSON)
     experience_distribution = Column(JSON)
     education_distribution = Column(JSON)
     calculated_at = Column(DateTime, default=datetime.utcnow)
+
+class JDState(Base):
+    __tablename__ = "jd_states"
+    jd_id = Column(Integer, primary_key=True)  # 0 tracks changes across all JDs
+    data_version = Column(Integer, default=0)  # Bumped whenever matches or candidates change
+    stats_version = Column(Integer, default=0)  # data_version the stored alerts/metrics reflect
+    total_candidates = Column(Integer, default=0)  # Candidate count behind the stored metrics
+    match_count = Column(Integer, default=0)  # Match rows counted into the skill counters
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class SkillCounter(Base):
+    __tablename__ = "skill_counters"
+    jd_id = Column(Integer, ForeignKey("jds.id"), primary_key=True)
+    skill = Column(String, primary_key=True)  # Normalized (lowercase) skill name
+    matched_count = Column(Integer, default=0)  # Matches where the candidate has the skill
+    missing_count = Column(Integer, default=0)  # Matches where the skill is a gap
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    id = Column(Integer, primary_key=True, index=True)
+    candidate_id = Column(Integer, ForeignKey("candidates.id"), index=True)
+    jd_id = Column(Integer, ForeignKey("jds.id"), nullable=True)
+    kind = Column(String, nullable=False)  # 'shortlist', 'rejection'
+    to_email = Column(String, nullable=False)
+    recipient_domain = Column(String, nullable=False)  # For per-domain rate limits
+    payload = Column(JSON, nullable=False)  # Template arguments
+    status = Column(String, default="pending")  # pending, sending, sent, failed
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    locked_at = Column(DateTime, nullable=True)  # Set while a worker is sending
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Workers poll for due rows by status and time
+        Index("ix_email_outbox_due", "status", "next_attempt_at"),
+    )
@@ -0,0 +1,215 @@
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Guards the header trigger and the /admin endpoints; both are off while unset
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", "./profiles"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+
+# sample is the default: cProfile only sees the event-loop thread, not the sync
+# endpoints (most of this API) that FastAPI runs in its threadpool
+PROFILE_MODES = ("sample", "cprofile")
+PROFILE_EXTENSIONS = {"cprofile": ".prof", "sample": ".folded"}
+
+# Leaf frames that mean a thread is parked, not doing the request's work
+_IDLE_FILES = ("threading.py", "selectors.py", "queue.py")
+
+def check_admin_token(token: Optional[str]) -> bool:
+    return bool(ADMIN_TOKEN) and bool(token) and hmac.compare_digest(token, ADMIN_TOKEN)
+
+class ProfilingSettings:
+    """Admin toggle for profiling a random share of matching requests"""
+
+    def __init__(self):
+        self.enabled = False
+        self.sample_rate = 0.0
+        self.mode = PROFILE_MODES[0]
+        self.path_prefix = "/"
+
+    def update(self, enabled: bool, sample_rate: float, mode: str, path_prefix: str) -> None:
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.path_prefix = path_prefix
+
+    def wants(self, path: str) -> bool:
+        return self.enabled and path.startswith(self.path_prefix) and random.random() < self.sample_rate
+
+    def as_dict(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "mode": self.mode,
+            "path_prefix": self.path_prefix
+        }
+
+class StackSampler:
+    """Statistical profiler: periodically records the stacks of all busy threads.
+
+    Unlike cProfile it also sees sync endpoints, which FastAPI runs in a worker
+    thread; stacks from concurrent requests are included too.
+    """
+
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL_MS / 1000):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or frame.f_code.co_filename.endswith(_IDLE_FILES):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def dump(self, path: Path) -> None:
+        # Folded stacks, readable by flamegraph.pl and speedscope
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+class ProfileStore:
+    """Profiles on disk, oldest removed once more than max_files are kept"""
+
+    def __init__(self, directory: Path = PROFILE_DIR, max_files: int = PROFILE_MAX_FILES):
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def new_path(self, method: str, path: str, mode: str) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", path).strip("-") or "root"
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        return self.directory / f"{stamp}-{method.lower()}-{slug}{PROFILE_EXTENSIONS[mode]}"
+
+    def prune(self) -> None:
+        with self._lock:
+            files = sorted(self._files(), key=lambda p: p.name)
+            for stale in files[:max(len(files) - self.max_files, 0)]:
+                stale.unlink(missing_ok=True)
+
+    def _files(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        return [p for p in self.directory.iterdir() if p.suffix in PROFILE_EXTENSIONS.values()]
+
+    def list(self) -> List[Dict]:
+        return [
+            {"name": p.name, "size": p.stat().st_size, "created_at": datetime.utcfromtimestamp(p.stat().st_mtime)}
+            for p in sorted(self._files(), key=lambda p: p.name, reverse=True)
+        ]
+
+    def get(self, name: str) -> Optional[Path]:
+        # Only plain names from list(); no path traversal
+        path = self.directory / os.path.basename(name)
+        if path.name != name or not path.is_file() or path.suffix not in PROFILE_EXTENSIONS.values():
+            return None
+        return path
+
+    def summary(self, path: Path, limit: int = 40) -> str:
+        """Human-readable top functions by cumulative time for a cProfile dump"""
+        out = io.StringIO()
+        pstats.Stats(str(path), stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+class ProfilingMiddleware:
+    """Profiles a request when asked via X-Profile (with X-Admin-Token) or sampled by the admin toggle"""
+
+    def __init__(self, app):
+        self.app = app
+        # One profile at a time: cProfile is per-thread and samplers would overlap
+        self._busy = threading.Lock()
+
+    def _requested_mode(self, scope) -> Optional[str]:
+        requested = _header(scope, b"x-profile")
+        if requested and check_admin_token(_header(scope, b"x-admin-token")):
+            return requested if requested in PROFILE_MODES else profiling_settings.mode
+        if profiling_settings.wants(scope.get("path", "")):
+            return profiling_settings.mode
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path", "").startswith("/admin"):
+            await self.app(scope, receive, send)
+            return
+        mode = self._requested_mode(scope)
+        if mode is None or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            path = scope.get("path", "")
+            target = profile_store.new_path(scope.get("method", ""), path, mode)
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", target.name.encode())]
+                await send(message)
+
+            profiler = cProfile.Profile() if mode == "cprofile" else StackSampler()
+            start = time.perf_counter()
+            if mode == "cprofile":
+                profiler.enable()
+            else:
+                profiler.start()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if mode == "cprofile":
+                    profiler.disable()
+                else:
+                    profiler.stop()
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                try:
+                    if mode == "cprofile":
+                        profiler.dump_stats(str(target))
+                    else:
+                        profiler.dump(target)
+                    print(f"Profiled {scope.get('method')} {path} in {elapsed_ms:.0f} ms -> {target}")
+                    profile_store.prune()
+                except Exception as e:
+                    print(f"Error saving profile: {e}")
+        finally:
+            self._busy.release()
+
+# Global instances
+profiling_settings = ProfilingSettings()
+profile_store = ProfileStore()
@@ -0,0 +1,105 @@
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import case, desc, func, select
+from sqlalchemy.orm import Session, selectinload, joinedload
+from core.models import Candidate, JD, MatchResult
+
+# Columns needed to render a candidate's match against a JD
+MATCH_COLUMNS = (
+    MatchResult.jd_id,
+    JD.title.label("jd_title"),
+    MatchResult.overall_score,
+    MatchResult.skills_match_score,
+    MatchResult.experience_match_score,
+    MatchResult.matched_skills,
+    MatchResult.missing_skills,
+    MatchResult.skill_gaps,
+)
+
+# Columns the AI assistant uses to describe a candidate
+CONTEXT_COLUMNS = (
+    Candidate.name,
+    Candidate.email,
+    MatchResult.overall_score,
+    MatchResult.skills_match_score,
+    MatchResult.experience_match_score,
+    Candidate.extracted_skills,
+    Candidate.experience_years,
+    Candidate.education,
+)
+
+def get_candidate_with_matches(db: Session, candidate_id: int) -> Optional[Candidate]:
+    """Load a candidate with its matches and their JDs in a fixed number of queries"""
+    return db.execute(
+        select(Candidate)
+        .options(selectinload(Candidate.matches).joinedload(MatchResult.jd))
+        .where(Candidate.id == candidate_id)
+    ).scalar_one_or_none()
+
+def get_candidate_match_rows(db: Session, candidate_id: int) -> List:
+    """Get projected match rows (with JD title) for a candidate in one query"""
+    return db.execute(
+        select(*MATCH_COLUMNS)
+        .join(JD, MatchResult.jd_id == JD.id)
+        .where(MatchResult.candidate_id == candidate_id)
+    ).all()
+
+def get_primary_match(db: Session, candidate_id: int) -> Tuple[Optional[MatchResult], Optional[JD]]:
+    """Get the first match for a candidate together with its JD in one query"""
+    row = db.execute(
+        select(MatchResult, JD)
+        .outerjoin(JD, MatchResult.jd_id == JD.id)
+        .where(MatchResult.candidate_id == candidate_id)
+        .order_by(MatchResult.id)
+        .limit(1)
+    ).first()
+    if not row:
+        return None, None
+    return row[0], row[1]
+
+def get_context_candidate_rows(db: Session, jd_id: Optional[int] = None, limit: Optional[int] = None) -> List:
+    """Get projected candidate/match rows for the AI assistant, best scores first"""
+    query = select(*CONTEXT_COLUMNS).join(Candidate, MatchResult.candidate_id == Candidate.id)
+    if jd_id:
+        query = query.where(MatchResult.jd_id == jd_id)
+    query = query.order_by(desc(MatchResult.overall_score), MatchResult.id)
+    if limit:
+        query = query.limit(limit)
+    return db.execute(query).all()
+
+def get_match_aggregates(db: Session, jd_id: Optional[int] = None):
+    """Count, shortlisted count and average score over a JD's matches (or all matches) in one query"""
+    query = select(
+        func.count(MatchResult.id).label("total"),
+        func.coalesce(func.sum(case((Candidate.is_shortlisted == True, 1), else_=0)), 0).label("shortlisted"),
+        func.avg(MatchResult.overall_score).label("average_score")
+    ).join(Candidate, MatchResult.candidate_id == Candidate.id)
+    if jd_id:
+        query = query.where(MatchResult.jd_id == jd_id)
+    return db.execute(query).one()
+
+def get_top_match_rows(db: Session, jd_id: Optional[int], order_column, limit: int) -> List:
+    """Get the best matches by the given score column with candidate name and JD title"""
+    query = (
+        select(
+            Candidate.name,
+            JD.title.label("jd_title"),
+            MatchResult.overall_score,
+            MatchResult.skills_match_score,
+            MatchResult.experience_match_score,
+            MatchResult.matched_skills
+        )
+        .join(Candidate, MatchResult.candidate_id == Candidate.id)
+        .join(JD, MatchResult.jd_id == JD.id)
+        .where(order_column.isnot(None))
+    )
+    if jd_id:
+        query = query.where(MatchResult.jd_id == jd_id)
+    return db.execute(query.order_by(desc(order_column), MatchResult.id).limit(limit)).all()
+
+def iter_matched_skills(db: Session, jd_id: Optional[int], min_score: float, chunk_size: int = 1000) -> Iterator[list]:
+    """Stream matched skill lists of matches scoring at least min_score"""
+    query = select(MatchResult.matched_skills).where(MatchResult.overall_score >= min_score)
+    if jd_id:
+        query = query.where(MatchResult.jd_id == jd_id)
+    for (skills,) in db.execute(query.execution_options(yield_per=chunk_size)):
+        yield skills or []
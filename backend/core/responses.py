@@ -0,0 +1,59 @@
+import json
+from typing import Any
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+
+try:
+    import orjson
+except ImportError:  # Optional dependency, fall back to the stdlib encoder
+    orjson = None
+
+GZIP_MINIMUM_SIZE = 1024
+
+def _default(value: Any) -> Any:
+    # Anything orjson cannot encode natively goes through FastAPI's encoder
+    return jsonable_encoder(value)
+
+def dumps_json(content: Any) -> bytes:
+    """Compact JSON as FastJSONResponse renders it (datetimes as ISO 8601)"""
+    if orjson is None:
+        return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    return orjson.dumps(
+        content,
+        default=_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when it is installed
+
+    Endpoints opt in by returning this response directly, which also skips
+    FastAPI's jsonable_encoder pass over the content.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+class WholeBodyGZipResponder(GZipResponder):
+    """Compresses responses sent in one piece; streamed bodies pass through as they are"""
+
+    async def send_with_gzip(self, message) -> None:
+        if message["type"] == "http.response.body" and not self.started and message.get("more_body", False):
+            # Gzip buffers small writes, which would hold back SSE events and export chunks
+            self.content_encoding_set = True
+        await super().send_with_gzip(message)
+
+class CompressionMiddleware(GZipMiddleware):
+    """Gzip large responses, leaving streamed responses (SSE, exports, files) uncompressed"""
+
+    def __init__(self, app, minimum_size: int = GZIP_MINIMUM_SIZE):
+        super().__init__(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = WholeBodyGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
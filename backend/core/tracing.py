@@ -0,0 +1,297 @@
+import contextvars
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "file")  # file, console or none (slow-request log only)
+TRACE_FILE = os.getenv("TRACE_FILE", "./traces.jsonl")
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+TRACE_STATEMENT_MAX_CHARS = 300
+
+def _load_opentelemetry():
+    """Use the OpenTelemetry SDK when installed; spans are then exported through it"""
+    try:
+        from opentelemetry import trace as otel_trace
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        return None
+
+    if TRACE_EXPORTER != "none":
+        if TRACE_EXPORTER == "console":
+            exporter = ConsoleSpanExporter()
+        else:
+            exporter = ConsoleSpanExporter(
+                out=open(TRACE_FILE, "a"),
+                formatter=lambda span: span.to_json(indent=None) + "\n"
+            )
+        provider = TracerProvider()
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+        otel_trace.set_tracer_provider(provider)
+    return otel_trace.get_tracer("talent-matcher")
+
+otel_tracer = _load_opentelemetry() if TRACING_ENABLED else None
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+class JSONLinesExporter:
+    """Fallback exporter writing one JSON span per line, shaped like OTLP/JSON spans"""
+
+    def __init__(self, exporter: str = TRACE_EXPORTER, path: str = TRACE_FILE):
+        self.exporter = exporter
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: "Span") -> None:
+        if self.exporter == "none":
+            return
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            if self.exporter == "console":
+                print(line, file=sys.stderr)
+            else:
+                with open(self.path, "a") as f:
+                    f.write(line + "\n")
+
+class Span:
+    """A timed operation; children started while it is current are nested under it"""
+
+    def __init__(self, name: str, attributes: Optional[Dict] = None):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.parent = _current_span.get()
+        self.trace_id = self.parent.trace_id if self.parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        # Finished spans of the whole trace, shared with the root for the slow-request log
+        self.finished = self.parent.finished if self.parent else []
+        self.status = "OK"
+        self.error = None
+        self.start_ns = 0
+        self.end_ns = 0
+        self._token = None
+        self._otel_span = None
+        self._otel_token = None
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+        if self._otel_span is not None:
+            self._otel_span.set_attribute(key, value)
+
+    def __enter__(self):
+        self.start_ns = time.time_ns()
+        if otel_tracer is not None:
+            from opentelemetry import context as otel_context, trace as otel_trace
+            self._otel_span = otel_tracer.start_span(self.name, attributes=self.attributes, start_time=self.start_ns)
+            self._otel_token = otel_context.attach(otel_trace.set_span_in_context(self._otel_span))
+            context = self._otel_span.get_span_context()
+            self.trace_id = format(context.trace_id, "032x")
+            self.span_id = format(context.span_id, "016x")
+        self._token = _current_span.set(self)
+        return self
+
+    def end(self, exc_type=None, exc=None) -> None:
+        """Stop the clock and export; unlike __exit__ this may run in another task, and only the first call counts"""
+        if self.end_ns:
+            return
+        self.end_ns = time.time_ns()
+        if exc is not None:
+            self.status = "ERROR"
+            self.error = f"{exc_type.__name__}: {exc}"
+        if self._otel_span is not None:
+            if exc is not None:
+                self._otel_span.record_exception(exc)
+            if self.status == "ERROR":
+                from opentelemetry.trace import Status, StatusCode
+                self._otel_span.set_status(Status(StatusCode.ERROR, self.error))
+            self._otel_span.end(end_time=self.end_ns)
+        else:
+            span_exporter.export(self)
+        self.finished.append(self)
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end(exc_type, exc)
+        _current_span.reset(self._token)
+        if self._otel_token is not None:
+            from opentelemetry import context as otel_context
+            otel_context.detach(self._otel_token)
+        return False
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent.span_id if self.parent else None,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error
+        }
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+def span(name: str, **attributes):
+    """Context manager for a span; a shared no-op when tracing is off"""
+    if not TRACING_ENABLED:
+        return _NOOP_SPAN
+    return Span(name, attributes)
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+def format_breakdown(root: Span) -> str:
+    """Indented span tree; repeated siblings (e.g. many DB statements) are collapsed into one line"""
+    children = {}
+    for finished in root.finished:
+        if finished.parent is not None:
+            children.setdefault(finished.parent.span_id, []).append(finished)
+
+    lines = []
+
+    def walk(node: Span, depth: int) -> None:
+        groups = {}
+        for child in sorted(children.get(node.span_id, []), key=lambda s: s.start_ns):
+            groups.setdefault(child.name, []).append(child)
+        for name, group in groups.items():
+            total = sum(child.duration_ms for child in group)
+            if len(group) == 1:
+                failed = " ERROR" if group[0].status == "ERROR" else ""
+                lines.append(f"{'  ' * depth}{total:9.1f} ms  {name}{failed}")
+                walk(group[0], depth + 1)
+            else:
+                lines.append(f"{'  ' * depth}{total:9.1f} ms  {name} x{len(group)}")
+
+    lines.append(f"{root.duration_ms:9.1f} ms  {root.name}")
+    walk(root, 1)
+    return "\n".join(lines)
+
+def instrument_engine(engine) -> None:
+    """Trace every SQL statement run inside a traced request"""
+    if not TRACING_ENABLED:
+        return
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_span.get() is None:
+            return
+        statement_span = Span("db.statement", {
+            "db.system": engine.dialect.name,
+            "db.statement": statement[:TRACE_STATEMENT_MAX_CHARS],
+            "db.executemany": executemany
+        })
+        conn.info.setdefault("trace_spans", []).append(statement_span.__enter__())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        if spans:
+            spans.pop().__exit__(None, None, None)
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(exception_context):
+        spans = exception_context.connection.info.get("trace_spans") if exception_context.connection else None
+        if spans:
+            error = exception_context.original_exception
+            spans.pop().__exit__(type(error), error, None)
+
+def instrument_commits(session_class) -> None:
+    """Trace session commits as db.commit spans"""
+    if not TRACING_ENABLED:
+        return
+    from sqlalchemy import event
+
+    @event.listens_for(session_class, "before_commit")
+    def _before_commit(session):
+        if _current_span.get() is not None:
+            session.info["trace_commit_span"] = Span("db.commit").__enter__()
+
+    @event.listens_for(session_class, "after_commit")
+    def _after_commit(session):
+        commit_span = session.info.pop("trace_commit_span", None)
+        if commit_span is not None:
+            commit_span.__exit__(None, None, None)
+
+    @event.listens_for(session_class, "after_rollback")
+    def _after_rollback(session):
+        commit_span = session.info.pop("trace_commit_span", None)
+        if commit_span is not None:
+            error = RuntimeError("rolled back")
+            commit_span.__exit__(type(error), error, None)
+
+class TracingMiddleware:
+    """Opens a root span per request and logs the span breakdown of slow requests.
+
+    The root span ends when the last body chunk is sent, so background tasks
+    that run after the response do not count as request latency.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "")
+        root = Span(f"{method} {scope.get('path', '')}", {"http.method": method, "http.target": scope.get("path", "")})
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                root.set_attribute("http.status_code", message["status"])
+                message["headers"] = list(message.get("headers", [])) + [(b"x-trace-id", root.trace_id.encode())]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                self._finish(root, scope)
+
+        with root:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            except Exception as e:
+                self._finish(root, scope, type(e), e)
+                raise
+            # Only still open if no complete response was sent
+            self._finish(root, scope)
+
+    def _finish(self, root: Span, scope, exc_type=None, exc=None) -> None:
+        if root.end_ns:
+            return
+        route = scope.get("route")
+        if route is not None:
+            root.set_attribute("http.route", route.path)
+        status_code = root.attributes.get("http.status_code", 0)
+        if exc is None and status_code >= 500:
+            # An inner handler already turned the exception into an error response
+            root.status = "ERROR"
+            root.error = f"HTTP {status_code}"
+        root.end(exc_type, exc)
+        if root.duration_ms >= SLOW_REQUEST_MS:
+            print(f"Slow request {root.attributes['http.method']} {scope.get('path')} took {root.duration_ms:.0f} ms (trace {root.trace_id}):\n{format_breakdown(root)}")
+
+# Global instance
+span_exporter = JSONLinesExporter()
@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Iterable, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from core.models import JDState, MatchResult
+
+# Pseudo JD id whose version changes whenever any JD's data changes
+ALL_JDS = 0
+
+def bump_data_version(db: Session, jd_ids: Iterable[Optional[int]]) -> None:
+    """Mark JDs as changed; runs inside the caller's transaction"""
+    ids = {jd_id for jd_id in jd_ids if jd_id} | {ALL_JDS}
+
+    existing = {jd_id for (jd_id,) in db.query(JDState.jd_id).filter(JDState.jd_id.in_(ids))}
+    if existing:
+        db.query(JDState).filter(JDState.jd_id.in_(existing)).update(
+            {
+                JDState.data_version: JDState.data_version + 1,
+                JDState.updated_at: datetime.utcnow()
+            },
+            synchronize_session=False
+        )
+
+    for jd_id in ids - existing:
+        db.add(JDState(jd_id=jd_id, data_version=1, stats_version=0))
+
+def bump_candidate_versions(db: Session, candidate_ids: Iterable[int]) -> List[int]:
+    """Mark every JD the given candidates are matched against as changed and return those JDs"""
+    jd_ids = [
+        jd_id for (jd_id,) in db.query(MatchResult.jd_id)
+        .filter(MatchResult.candidate_id.in_(list(candidate_ids)))
+        .distinct()
+    ]
+    bump_data_version(db, jd_ids)
+    return jd_ids
+
+def get_jd_state(db: Session, jd_id: Optional[int]) -> Optional[JDState]:
+    """Get the version state for a JD (or for all JDs when jd_id is None)"""
+    return db.query(JDState).filter(JDState.jd_id == (jd_id or ALL_JDS)).first()
+
+def get_data_version(db: Session, jd_id: Optional[int]) -> int:
+    """Get the current data version for a JD (or for all JDs when jd_id is None)"""
+    version = db.query(JDState.data_version).filter(JDState.jd_id == (jd_id or ALL_JDS)).scalar()
+    return version or 0
+
+def get_stats_version(db: Session, jd_id: Optional[int]) -> int:
+    """Get a number that grows whenever the stored alerts and metrics of a JD (or of any JD) are refreshed"""
+    if jd_id:
+        version = db.query(JDState.stats_version).filter(JDState.jd_id == jd_id).scalar()
+    else:
+        version = db.query(func.sum(JDState.stats_version)).filter(JDState.jd_id != ALL_JDS).scalar()
+    return version or 0
+
+def get_stale_jd_ids(db: Session) -> List[int]:
+    """Get JDs whose stored alerts and metrics are older than their data"""
+    return [
+        jd_id for (jd_id,) in db.query(JDState.jd_id).filter(
+            JDState.jd_id != ALL_JDS,
+            JDState.stats_version < JDState.data_version
+        )
+    ]
@@ -1,8 +1,17 @@
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from api import jd, resume, dashboard, ai_assistant, candidate
-from core.db import create_tables
+from api import jd, resume, dashboard, ai_assistant, candidate, admin
+from core.db import SessionLocal, create_tables, engine
+from core.events import event_broker
+from core.metrics import METRICS_ENABLED, MetricsMiddleware, registry
+from core.profiling import ProfilingMiddleware
+from core.tracing import TRACING_ENABLED, TracingMiddleware
+from core.cache import response_cache
+from core.responses import CompressionMiddleware
+from services.outbox import outbox_depth
+from services.smtp_pool import close_all_pools, pool_stats
 from core.models import *  # Import all models to ensure they're registered
 
 app = FastAPI(title="Talent Matcher API", version="1.0.0")
@@ -16,6 +25,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (streamed responses such as SSE and exports are left alone)
+app.add_middleware(CompressionMiddleware)
+
+# On-demand profiling (X-Profile header with the admin token, or the /admin/profiling toggle)
+app.add_middleware(ProfilingMiddleware)
+
+# Per-route request latency for /metrics
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Request spans and the slow-request log
+if TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
 # Create database tables
 create_tables()
 
@@ -25,6 +48,7 @@ app.include_router(resume.router, prefix="/resume", tags=["Resumes"])
 app.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
 app.include_router(ai_assistant.router)
 app.include_router(candidate.router, prefix="/candidate", tags=["Candidates"])
+app.include_router(admin.router)
 
 @app.get("/")
 def health_check():
@@ -39,5 +63,49 @@ def detailed_health_check():
     return {
         "status": "healthy",
         "database": "connected",
-        "services": ["jd", "resume", "dashboard", "matching", "email"]
+        "services": ["jd", "resume", "dashboard", "matching", "email"],
+        "response_cache": response_cache.stats(),
+        "smtp_pools": pool_stats()
     }
+
+def _smtp_pool_usage():
+    usage = {}
+    for pool in pool_stats():
+        server = f"{pool['host']}:{pool['port']}"
+        usage[(server, "in_use")] = pool["in_use"]
+        usage[(server, "idle")] = pool["idle"]
+        usage[(server, "max")] = pool["max_connections"]
+    return usage
+
+def _db_pool_usage():
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {}
+    return {("checked_out",): pool.checkedout(), ("idle",): pool.checkedin()}
+
+def _outbox_depth():
+    db = SessionLocal()
+    try:
+        return {(status,): count for status, count in outbox_depth(db).items()}
+    finally:
+        db.close()
+
+def _ai_model_slots_in_use():
+    return {(): ai_assistant.AI_MAX_CONCURRENT_REQUESTS - ai_assistant.model_slots._value}
+
+registry.gauge("smtp_pool_connections", "SMTP connections per server and state", ("server", "state"), callback=_smtp_pool_usage)
+registry.gauge("db_pool_connections", "Database connections by state", ("state",), callback=_db_pool_usage)
+registry.gauge("email_outbox_depth", "Outbox emails by status", ("status",), callback=_outbox_depth)
+registry.gauge("event_stream_subscribers", "Open dashboard event streams", callback=lambda: {(): event_broker.subscriber_count})
+registry.gauge("ai_model_slots_in_use", "AI model calls currently running", callback=_ai_model_slots_in_use)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus scrape endpoint"""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled; set METRICS_ENABLED=true")
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.on_event("shutdown")
+def close_smtp_connections():
+    close_all_pools()
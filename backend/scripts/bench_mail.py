@@ -0,0 +1,77 @@
+"""Compare bulk shortlist email throughput against a local SMTP sink.
+
+Modes:
+    connect-per-message   new connection + login for every message (the old behaviour)
+    pooled-sequential     send_bulk_shortlist_notifications over the connection pool
+    pooled-concurrent     send_bulk_shortlist_notifications_async with --concurrency
+
+Usage (from the backend directory):
+    python -m scripts.bench_mail --messages 200 --latency 0.02 --concurrency 8
+"""
+import argparse
+import asyncio
+import os
+import smtplib
+import time
+from scripts.smtp_sink import start_in_thread
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02, help="Sink delay per message, standing in for the provider")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    port, stats, stop = start_in_thread(latency=args.latency)
+
+    # Point the mailer at the sink before it reads its configuration
+    os.environ.update({
+        "SMTP_SERVER": "127.0.0.1",
+        "SMTP_PORT": str(port),
+        "SMTP_USERNAME": "bench@example.com",
+        "SMTP_PASSWORD": "bench",
+        "FROM_EMAIL": "bench@example.com",
+        "SMTP_USE_TLS": "false",
+        "SMTP_POOL_SIZE": str(args.concurrency)
+    })
+    from services import mailer
+    from services.smtp_pool import close_all_pools
+
+    candidates = [{"name": f"Candidate {i}", "email": f"candidate{i}@example.com"} for i in range(args.messages)]
+
+    def connect_per_message():
+        for candidate in candidates:
+            server = smtplib.SMTP("127.0.0.1", port)
+            server.login("bench@example.com", "bench")
+            server.sendmail("bench@example.com", candidate["email"], f"Subject: Shortlisted\r\n\r\nHello {candidate['name']}")
+            server.quit()
+        return {"sent": len(candidates), "failed": 0}
+
+    modes = [
+        ("connect-per-message", connect_per_message),
+        ("pooled-sequential", lambda: mailer.send_bulk_shortlist_notifications(candidates, "Backend Engineer")),
+        ("pooled-concurrent", lambda: asyncio.run(
+            mailer.send_bulk_shortlist_notifications_async(candidates, "Backend Engineer", args.concurrency)
+        ))
+    ]
+
+    print(f"messages: {args.messages}, sink latency: {args.latency * 1000:.0f} ms, concurrency: {args.concurrency}")
+    try:
+        for name, run in modes:
+            close_all_pools()
+            before = stats.as_dict()
+            start = time.perf_counter()
+            result = run()
+            elapsed = time.perf_counter() - start
+            after = stats.as_dict()
+            print(
+                f"{name:<20} {elapsed:7.2f} s  {args.messages / elapsed:8.1f} msg/s  "
+                f"sent={result['sent']} failed={result['failed']}  "
+                f"connections={after['connections'] - before['connections']} logins={after['logins'] - before['logins']}"
+            )
+    finally:
+        close_all_pools()
+        stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compare JSON serialization of large candidate lists: FastAPI default vs FastJSONResponse.
+
+Usage (from the backend directory):
+    python -m scripts.bench_serialization --rows 5000 --repeat 20
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from fastapi.encoders import jsonable_encoder
+from core.responses import FastJSONResponse, orjson
+
+SKILLS = ["python", "sql", "aws", "docker", "react", "java", "kubernetes", "git", "pandas", "spark"]
+
+def make_rows(count: int) -> list:
+    """Rows shaped like /dashboard/candidates"""
+    now = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        matched = random.sample(SKILLS, random.randint(0, 6))
+        missing = [s for s in SKILLS if s not in matched][:4]
+        rows.append({
+            "id": i,
+            "name": f"Candidate {i}",
+            "email": f"candidate{i}@example.com",
+            "phone": "555-0100",
+            "overall_score": round(random.random(), 2),
+            "skills_match_score": round(random.random(), 2),
+            "experience_match_score": round(random.random(), 2),
+            "matched_skills": matched,
+            "missing_skills": missing,
+            "skill_gaps": [{"skill": s, "importance": "high", "suggestion": f"Consider learning {s}"} for s in missing],
+            "experience_years": random.choice([None, 1, 3, 5, 8, 12]),
+            "education": random.choice([None, "B.Sc Computer Science", "M.Sc Data Science"]),
+            "gender": random.choice([None, "male", "female"]),
+            "status": "pending",
+            "is_shortlisted": False,
+            "jd_id": 1,
+            "jd_title": "Backend Engineer",
+            "created_at": now - timedelta(minutes=i)
+        })
+    return rows
+
+def default_render(rows: list) -> bytes:
+    # What FastAPI does for a plain dict/list return value
+    return json.dumps(jsonable_encoder(rows), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def fast_render(rows: list) -> bytes:
+    return FastJSONResponse(rows).body
+
+def timed(render, rows: list, repeat: int) -> tuple:
+    best = float("inf")
+    body = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = render(rows)
+        best = min(best, time.perf_counter() - start)
+    return best, body
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    default_time, default_body = timed(default_render, rows, args.repeat)
+    fast_time, fast_body = timed(fast_render, rows, args.repeat)
+
+    print(f"rows: {args.rows}, best of {args.repeat}")
+    print(f"orjson installed: {orjson is not None}")
+    print(f"jsonable_encoder + json: {default_time * 1000:8.2f} ms  {len(default_body):>10} bytes")
+    print(f"FastJSONResponse:        {fast_time * 1000:8.2f} ms  {len(fast_body):>10} bytes")
+    print(f"speedup: {default_time / fast_time:.1f}x")
+    print(f"gzip size: {len(gzip.compress(fast_body))} bytes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Load-test the API with a recruiter-like traffic mix against a freshly seeded database.
+
+Seeds a SQLite (default) or Postgres database with scripts.seed_data, starts uvicorn on it in a scratch
+working directory (so uploads do not land in ./uploads), then runs concurrent
+virtual users until --duration is up and reports throughput and p50/p95/p99 per
+endpoint. Needs httpx (pip install httpx).
+
+Actions and default weights (--mix overrides, e.g. "snapshot=5,status=1"):
+    snapshot     GET /dashboard/snapshot, polling with If-None-Match like the dashboard
+    candidates   GET /dashboard/candidates
+    insights     GET /dashboard/insights
+    status       PATCH /candidate/status
+    resume       POST /resume/upload with the sample PDFs from uploads/resumes
+    jd           POST /jd/upload (re-matches every candidate, so keep it rare)
+
+Usage (from the backend directory):
+    python -m scripts.load_test --jds 5 --candidates 2000 --users 16 --duration 60
+    python -m scripts.load_test --database-url postgresql://localhost/loadtest --workers 4
+    python -m scripts.load_test --url http://127.0.0.1:8000 --no-seed   # an already running server
+"""
+import argparse
+import asyncio
+import glob
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MIX = {"snapshot": 40, "candidates": 15, "insights": 10, "status": 20, "resume": 12, "jd": 3}
+STATUSES = ["pending", "shortlisted", "rejected"]
+SAMPLE_JD_TEXT = (
+    "We are hiring a backend engineer with 3+ years of experience in Python, Django or Flask, "
+    "SQL and PostgreSQL, Docker, Kubernetes and AWS. Experience with React, Redis and agile teams is a plus. "
+    "Bachelor's degree in Computer Science or equivalent."
+)
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+class LoadStats:
+    def __init__(self):
+        self.latencies = defaultdict(list)  # action -> ms
+        self.errors = defaultdict(int)
+        self.status_codes = defaultdict(lambda: defaultdict(int))
+
+    def record(self, action: str, elapsed_ms: float, status: int) -> None:
+        self.latencies[action].append(elapsed_ms)
+        self.status_codes[action][status] += 1
+        if status == 0 or status >= 400:
+            self.errors[action] += 1
+
+    def report(self, elapsed: float) -> Dict:
+        endpoints = {}
+        for action, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            endpoints[action] = {
+                "requests": len(values),
+                "errors": self.errors[action],
+                "rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(percentile(values, 0.50), 1),
+                "p95_ms": round(percentile(values, 0.95), 1),
+                "p99_ms": round(percentile(values, 0.99), 1),
+                "max_ms": round(values[-1], 1),
+                "status_codes": dict(self.status_codes[action])
+            }
+        total = sum(len(values) for values in self.latencies.values())
+        return {
+            "duration_s": round(elapsed, 2),
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "rps": round(total / elapsed, 2),
+            "endpoints": endpoints
+        }
+
+class VirtualUser:
+    """One recruiter session: picks weighted actions until the deadline"""
+
+    def __init__(self, client, rng: random.Random, jd_ids: List[int], candidate_count: int, resumes: List, mix: Dict[str, int], stats: LoadStats):
+        self.client = client
+        self.rng = rng
+        self.jd_ids = jd_ids
+        self.candidate_count = candidate_count
+        self.resumes = resumes
+        self.actions = list(mix)
+        self.weights = [mix[action] for action in self.actions]
+        self.stats = stats
+        self.etags = {}
+        self.uploads = 0
+
+    def _jd_id(self) -> int:
+        return self.rng.choice(self.jd_ids)
+
+    async def snapshot(self):
+        jd_id = self._jd_id()
+        headers = {"If-None-Match": self.etags[jd_id]} if jd_id in self.etags else {}
+        response = await self.client.get("/dashboard/snapshot", params={"jd_id": jd_id}, headers=headers)
+        if response.status_code == 200 and "etag" in response.headers:
+            self.etags[jd_id] = response.headers["etag"]
+        return response
+
+    async def candidates(self):
+        return await self.client.get("/dashboard/candidates", params={"jd_id": self._jd_id()})
+
+    async def insights(self):
+        return await self.client.get("/dashboard/insights", params={"jd_id": self._jd_id()})
+
+    async def status(self):
+        return await self.client.patch("/candidate/status", json={
+            "candidate_id": self.rng.randint(1, self.candidate_count),
+            "status": self.rng.choice(STATUSES)
+        })
+
+    async def resume(self):
+        filename, content = self.rng.choice(self.resumes)
+        self.uploads += 1
+        return await self.client.post(
+            "/resume/upload",
+            data={"name": f"Uploaded Candidate {self.uploads}", "jd_id": str(self._jd_id())},
+            files={"file": (filename, content, "application/pdf")}
+        )
+
+    async def jd(self):
+        self.uploads += 1
+        return await self.client.post("/jd/upload", data={"title": f"Load Test Upload {self.uploads}", "text": SAMPLE_JD_TEXT})
+
+    async def run(self, deadline: float, think_time: float) -> None:
+        while time.perf_counter() < deadline:
+            action = self.rng.choices(self.actions, self.weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await getattr(self, action)()
+                status = response.status_code
+            except Exception as e:
+                print(f"{action} failed: {e}")
+                status = 0
+            self.stats.record(action, (time.perf_counter() - start) * 1000, status)
+            if think_time:
+                await asyncio.sleep(self.rng.uniform(0, 2 * think_time))
+
+async def drive(url: str, users: int, duration: float, think_time: float, jd_ids: List[int], candidate_count: int, resumes: List, mix: Dict[str, int], seed: int) -> Dict:
+    import httpx
+
+    stats = LoadStats()
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=url, timeout=120, limits=limits) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*[
+            VirtualUser(client, random.Random(seed + i), jd_ids, candidate_count, resumes, mix, stats).run(deadline, think_time)
+            for i in range(users)
+        ])
+        return stats.report(time.perf_counter() - start)
+
+def start_server(port: int, workers: int, workdir: str, env: Dict[str, str]) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--app-dir", BACKEND_DIR, "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning"
+    ]
+    return subprocess.Popen(command, cwd=workdir, env=env)
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 120) -> None:
+    import httpx
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{url}/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Server at {url} did not become ready within {timeout:.0f} s")
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix = dict(DEFAULT_MIX)
+    if value:
+        mix = {}
+        for part in value.split(","):
+            action, weight = part.split("=")
+            if action not in DEFAULT_MIX:
+                raise SystemExit(f"Unknown action {action!r}; choose from {', '.join(DEFAULT_MIX)}")
+            mix[action] = int(weight)
+    return {action: weight for action, weight in mix.items() if weight > 0}
+
+def print_report(report: Dict) -> None:
+    print(f"\n{report['requests']} requests in {report['duration_s']} s: {report['rps']} req/s, {report['errors']} errors\n")
+    print(f"{'endpoint':<12} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for action, row in report["endpoints"].items():
+        print(
+            f"{action:<12} {row['requests']:>8} {row['errors']:>6} {row['rps']:>8} "
+            f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8} {row['max_ms']:>8}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Defaults to a SQLite file in the scratch directory")
+    parser.add_argument("--jds", type=int, default=5)
+    parser.add_argument("--candidates", type=int, default=2000)
+    parser.add_argument("--matches-per-candidate", type=int, default=3)
+    parser.add_argument("--no-seed", action="store_true", help="Use the database as it is")
+    parser.add_argument("--url", help="Target an already running server instead of starting one")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--users", type=int, default=8, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds of load")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between a user's requests, in seconds")
+    parser.add_argument("--mix", default="", help="Action weights, e.g. snapshot=40,status=20,resume=10")
+    parser.add_argument("--resume-dir", default=os.path.join(BACKEND_DIR, "uploads", "resumes"))
+    parser.add_argument("--workdir", help="Scratch directory for the server (uploads, SQLite file)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="talent-matcher-load-"))
+    os.makedirs(workdir, exist_ok=True)
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'loadtest.db')}"
+
+    resumes = [(os.path.basename(path), open(path, "rb").read()) for path in sorted(glob.glob(os.path.join(args.resume_dir, "*.pdf")))]
+    if "resume" in mix and not resumes:
+        raise SystemExit(f"No sample PDFs found in {args.resume_dir}")
+
+    # The seeding code and the server both read the database from the environment
+    env = dict(os.environ, DATABASE_URL=database_url, OUTBOX_DRAIN_IN_APP="false")
+    os.environ.update(env)
+
+    if args.no_seed:
+        from core.db import SessionLocal
+        from core.models import JD, Candidate
+        db = SessionLocal()
+        try:
+            jd_ids = [jd_id for (jd_id,) in db.query(JD.id).filter(JD.is_active == True)]
+            candidate_count = db.query(Candidate).count()
+        finally:
+            db.close()
+    else:
+        from scripts.seed_data import seed
+        start = time.perf_counter()
+        jd_ids = seed(args.jds, args.candidates, args.matches_per_candidate, args.seed)
+        candidate_count = args.candidates
+        print(f"seeded {args.jds} JDs, {args.candidates} candidates in {time.perf_counter() - start:.1f} s ({database_url})")
+    if not jd_ids:
+        raise SystemExit("The database has no active JDs to test against")
+
+    process = None
+    url = args.url
+    if not url:
+        url = f"http://127.0.0.1:{args.port}"
+        process = start_server(args.port, args.workers, workdir, env)
+    try:
+        if process:
+            wait_until_ready(url, process)
+        print(f"driving {url} with {args.users} users for {args.duration:.0f} s, mix {mix}")
+        report = asyncio.run(drive(url, args.users, args.duration, args.think_time, jd_ids, candidate_count, resumes, mix, args.seed))
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=30)
+
+    report.update({"users": args.users, "workers": args.workers, "mix": mix, "database_url": database_url})
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
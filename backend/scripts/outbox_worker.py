@@ -0,0 +1,47 @@
+"""Deliver queued candidate emails from the outbox table.
+
+Usage (from the backend directory):
+    python -m scripts.outbox_worker              # run until interrupted
+    python -m scripts.outbox_worker --once       # drain what is due, then exit
+
+Several workers can run side by side; each claims its own batches.
+"""
+import argparse
+from core.db import SessionLocal, create_tables
+from services.outbox import OUTBOX_BATCH_SIZE, drain_outbox, outbox_depth, run_worker
+from services.smtp_pool import close_all_pools
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=OUTBOX_BATCH_SIZE)
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="Seconds to sleep when nothing is due")
+    parser.add_argument("--once", action="store_true", help="Drain due emails once and exit")
+    args = parser.parse_args()
+
+    create_tables()
+    try:
+        if args.once:
+            totals = {}
+            while True:
+                results = drain_outbox(args.batch_size)
+                for key, value in results.items():
+                    totals[key] = totals.get(key, 0) + value
+                if not results["sent"] and not results["retrying"] and not results["failed"]:
+                    break
+            print(f"outbox drained: {totals}")
+        else:
+            print(f"outbox worker started (batch size {args.batch_size})")
+            run_worker(args.poll_interval, args.batch_size)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close_all_pools()
+
+    db = SessionLocal()
+    try:
+        print(f"outbox status: {outbox_depth(db)}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
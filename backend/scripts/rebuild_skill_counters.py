@@ -0,0 +1,20 @@
+"""Rebuild the skill heatmap counters from existing match results.
+
+Usage (from the backend directory):
+    python -m scripts.rebuild_skill_counters
+"""
+from core.db import SessionLocal, create_tables
+from core.models import *  # Import all models to ensure they're registered
+from services.skill_stats import rebuild_skill_counters
+
+def main():
+    create_tables()
+    db = SessionLocal()
+    try:
+        counted = rebuild_skill_counters(db)
+        print(f"Rebuilt skill counters from {counted} match results")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
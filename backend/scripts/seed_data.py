@@ -0,0 +1,308 @@
+"""Bulk-load synthetic JDs, candidates and match results for testing at production scale.
+
+Skills are drawn from COMMON_SKILLS with a few popular ones dominating, match
+scores follow the matcher's weighting (skills 0.5, experience 0.3, text 0.2) and
+statuses track the scores. Rows go in through DBAPI executemany on SQLite and
+COPY on PostgreSQL, in chunks; skill counters and data versions are filled in
+from the generated rows instead of re-reading them.
+
+Usage (from the backend directory):
+    python -m scripts.seed_data --jds 50 --candidates 100000 --matches-per-candidate 20
+    DATABASE_URL=postgresql://localhost/talent python -m scripts.seed_data --candidates 100000
+"""
+import argparse
+import csv
+import io
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+from sqlalchemy import JSON, Boolean, DateTime
+from core.db import Base, SessionLocal, create_tables, engine
+from core.models import JD, Candidate, MatchResult
+from core.versions import bump_data_version
+from services.matcher import calculate_experience_match
+from services.parser import COMMON_SKILLS
+from services.skill_stats import SkillCounterBatch
+
+try:
+    import orjson
+
+    def dumps(value) -> str:
+        return orjson.dumps(value).decode()
+except ImportError:
+    dumps = json.dumps
+
+CHUNK_SIZE = 10000
+MATCH_WEIGHTS = {"skills": 0.5, "experience": 0.3, "text_similarity": 0.2}
+SHORTLIST_THRESHOLD = 0.7
+DB_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+ROLE_TITLES = {
+    "programming": ["Backend Engineer", "Software Engineer", "Java Developer", "Python Developer"],
+    "web": ["Frontend Engineer", "Full Stack Developer", "Web Developer"],
+    "database": ["Database Administrator", "Data Engineer"],
+    "cloud": ["DevOps Engineer", "Site Reliability Engineer", "Cloud Architect"],
+    "data": ["Data Scientist", "Machine Learning Engineer", "Data Analyst"],
+    "mobile": ["Android Developer", "iOS Developer", "Mobile Engineer"],
+    "other": ["Engineering Manager", "Scrum Master"]
+}
+EDUCATION = ["Bachelor of Technology", "Bachelor of Science in Computer Science", "Master of Science", "MBA", "PhD", None]
+EDUCATION_WEIGHTS = [35, 25, 20, 5, 3, 12]
+GENDERS = ["male", "female", None]
+GENDER_WEIGHTS = [55, 38, 7]
+FIRST_NAMES = ["Aarav", "Priya", "Rahul", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya", "Rohan", "Isha", "James", "Maria", "Wei", "Fatima", "Lucas", "Emma"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Reddy", "Gupta", "Nair", "Singh", "Khan", "Smith", "Garcia", "Chen", "Ali", "Silva", "Menon"]
+
+class SkillSampler:
+    """Draws skills from COMMON_SKILLS, favouring a primary category and the popular skills in each"""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.categories = list(COMMON_SKILLS)
+        # Earlier entries in each category are the more common ones (python before matlab)
+        self.weights = {
+            category: [1.0 / (rank + 1) for rank in range(len(skills))]
+            for category, skills in COMMON_SKILLS.items()
+        }
+
+    def category(self) -> str:
+        return self.rng.choices(self.categories, [30, 25, 10, 15, 12, 5, 3])[0]
+
+    def sample(self, category: str, count: int, spread: float = 0.3) -> List[str]:
+        skills = set()
+        while len(skills) < count:
+            pick = category if self.rng.random() > spread else self.rng.choice(self.categories)
+            skills.add(self.rng.choices(COMMON_SKILLS[pick], self.weights[pick])[0])
+        return sorted(skills)
+
+def make_jd(jd_id: int, sampler: SkillSampler, rng: random.Random, now: datetime) -> Dict:
+    category = sampler.category()
+    title = rng.choice(ROLE_TITLES[category])
+    skills = sampler.sample(category, rng.randint(5, 10), spread=0.2)
+    experience = rng.choice([1, 2, 3, 5, 7, 10])
+    return {
+        "id": jd_id,
+        "title": f"{title} #{jd_id}",
+        "description": f"We are looking for a {title} with {experience}+ years of experience in {', '.join(skills)}.",
+        "file_path": None,
+        "required_skills": skills,
+        "created_at": now - timedelta(days=rng.randint(0, 90)),
+        "is_active": rng.random() < 0.9,
+        # Not a column; used for the experience score
+        "required_experience": experience
+    }
+
+def make_candidate(candidate_id: int, sampler: SkillSampler, rng: random.Random, now: datetime) -> Dict:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        "id": candidate_id,
+        "name": f"{first} {last}",
+        "email": f"{first.lower()}.{last.lower()}.{candidate_id}@example.com",
+        "phone": f"+91 9{rng.randint(100000000, 999999999)}",
+        "resume_path": f"uploads/resumes/seed_{candidate_id}.pdf",
+        "extracted_skills": sampler.sample(sampler.category(), rng.randint(3, 15)),
+        "experience_years": None if rng.random() < 0.08 else min(int(rng.expovariate(1 / 5)), 30),
+        "education": rng.choices(EDUCATION, EDUCATION_WEIGHTS)[0],
+        "gender": rng.choices(GENDERS, GENDER_WEIGHTS)[0],
+        "status": "pending",
+        "created_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 90)),
+        "is_shortlisted": False
+    }
+
+def make_match(match_id: int, jd: Dict, candidate: Dict, rng: random.Random) -> Dict:
+    candidate_skills = set(candidate["extracted_skills"])
+    required = jd["required_skills"]
+    matched = [skill for skill in required if skill in candidate_skills]
+    missing = [skill for skill in required if skill not in candidate_skills]
+    skills_score = round(len(matched) / len(required), 2) if required else 1.0
+    experience_score = calculate_experience_match(jd["required_experience"], candidate["experience_years"])
+    text_similarity = min(max(rng.gauss(0.15 + 0.3 * skills_score, 0.08), 0.0), 1.0)
+    overall = round(
+        skills_score * MATCH_WEIGHTS["skills"]
+        + experience_score * MATCH_WEIGHTS["experience"]
+        + text_similarity * MATCH_WEIGHTS["text_similarity"],
+        2
+    )
+    return {
+        "id": match_id,
+        "jd_id": jd["id"],
+        "candidate_id": candidate["id"],
+        "overall_score": overall,
+        "skills_match_score": skills_score,
+        "experience_match_score": experience_score,
+        "matched_skills": matched,
+        "missing_skills": missing,
+        "skill_gaps": [
+            {"skill": skill, "importance": "high" if skill in required[:5] else "medium", "suggestion": f"Consider learning {skill}"}
+            for skill in missing
+        ],
+        "created_at": candidate["created_at"]
+    }
+
+def pick_status(best_score: float, rng: random.Random) -> str:
+    """Recruiters act on the strongest candidates first; most of the pool stays pending"""
+    roll = rng.random()
+    if best_score >= SHORTLIST_THRESHOLD:
+        return "shortlisted" if roll < 0.35 else "accepted" if roll < 0.42 else "pending"
+    if best_score < 0.4 and roll < 0.3:
+        return "rejected"
+    return "pending"
+
+class BulkWriter:
+    """Chunked inserts: COPY on PostgreSQL, DBAPI executemany elsewhere"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.cursor = connection.cursor()
+        self.postgres = engine.dialect.name == "postgresql"
+
+    def _converter(self, column):
+        """Per-column conversion to what the DBAPI driver or COPY expects, picked once per table"""
+        if isinstance(column.type, JSON):
+            return lambda value: None if value is None else dumps(value)
+        if isinstance(column.type, DateTime):
+            return lambda value: None if value is None else value.strftime(DB_DATETIME_FORMAT)
+        if isinstance(column.type, Boolean) and not self.postgres:
+            return lambda value: None if value is None else int(value)
+        return None
+
+    def write(self, model, rows: List[Dict]) -> None:
+        if not rows:
+            return
+        table = model.__table__
+        columns = [column for column in table.columns if column.name in rows[0]]
+        names = [column.name for column in columns]
+        converters = [(column.name, self._converter(column)) for column in columns]
+        values = [
+            [convert(row[name]) if convert else row[name] for name, convert in converters]
+            for row in rows
+        ]
+
+        if self.postgres:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in values:
+                # COPY's CSV format reads an unquoted empty field as NULL
+                writer.writerow(["" if value is None else value for value in row])
+            buffer.seek(0)
+            self.cursor.copy_expert(f"COPY {table.name} ({', '.join(names)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        else:
+            placeholders = ", ".join(["?" if engine.dialect.paramstyle == "qmark" else "%s"] * len(names))
+            self.cursor.executemany(f"INSERT INTO {table.name} ({', '.join(names)}) VALUES ({placeholders})", values)
+
+    def commit(self) -> None:
+        self.connection.commit()
+
+    def reset_sequences(self) -> None:
+        """COPY with explicit ids leaves PostgreSQL sequences behind"""
+        if not self.postgres:
+            return
+        for model in (JD, Candidate, MatchResult):
+            table = model.__table__.name
+            self.cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT COALESCE(MAX(id), 1) FROM {table}))"
+            )
+        self.connection.commit()
+
+def next_id(db, model) -> int:
+    return (db.query(model.id).order_by(model.id.desc()).limit(1).scalar() or 0) + 1
+
+def seed(
+    jds: int,
+    candidates: int,
+    matches_per_candidate: int,
+    seed: int = 42,
+    chunk_size: int = CHUNK_SIZE,
+    progress: bool = False
+) -> List[int]:
+    """Insert synthetic data and update counters and versions; returns the new JD ids"""
+    rng = random.Random(seed)
+    sampler = SkillSampler(rng)
+    now = datetime.utcnow()
+    create_tables()
+
+    db = SessionLocal()
+    try:
+        jd_start, candidate_start, match_id = next_id(db, JD), next_id(db, Candidate), next_id(db, MatchResult)
+    finally:
+        db.close()
+
+    jd_rows = [make_jd(jd_start + i, sampler, rng, now) for i in range(jds)]
+    active_jds = [jd for jd in jd_rows if jd["is_active"]] or jd_rows
+    counters = {jd["id"]: SkillCounterBatch(jd["id"]) for jd in jd_rows}
+    per_candidate = min(matches_per_candidate, len(active_jds))
+
+    connection = engine.raw_connection()
+    try:
+        writer = BulkWriter(connection)
+        writer.write(JD, [{k: v for k, v in jd.items() if k != "required_experience"} for jd in jd_rows])
+        writer.commit()
+
+        started = time.perf_counter()
+        for start in range(0, candidates, chunk_size):
+            candidate_rows, match_rows = [], []
+            for i in range(start, min(start + chunk_size, candidates)):
+                candidate = make_candidate(candidate_start + i, sampler, rng, now)
+                best = 0.0
+                for jd in rng.sample(active_jds, per_candidate):
+                    match = make_match(match_id, jd, candidate, rng)
+                    match_id += 1
+                    match_rows.append(match)
+                    # COMMON_SKILLS are already normalized, so count directly instead of SkillCounterBatch.add
+                    batch = counters[jd["id"]]
+                    batch.matches += 1
+                    batch.matched.update(match["matched_skills"])
+                    batch.missing.update(match["missing_skills"])
+                    best = max(best, match["overall_score"])
+                candidate["status"] = pick_status(best, rng)
+                candidate["is_shortlisted"] = candidate["status"] in ("shortlisted", "accepted")
+                candidate_rows.append(candidate)
+
+            writer.write(Candidate, candidate_rows)
+            writer.write(MatchResult, match_rows)
+            writer.commit()
+            if progress:
+                done = min(start + chunk_size, candidates)
+                elapsed = time.perf_counter() - started
+                print(f"  {done}/{candidates} candidates, {match_id - 1} match ids ({done / elapsed:.0f} candidates/s)")
+        writer.reset_sequences()
+    finally:
+        connection.close()
+
+    db = SessionLocal()
+    try:
+        for batch in counters.values():
+            batch.apply(db)
+        bump_data_version(db, list(counters))
+        db.commit()
+    finally:
+        db.close()
+    return [jd["id"] for jd in active_jds]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jds", type=int, default=50)
+    parser.add_argument("--candidates", type=int, default=100000)
+    parser.add_argument("--matches-per-candidate", type=int, default=10, help="Each candidate is matched against this many active JDs")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first (deletes existing data)")
+    args = parser.parse_args()
+
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+
+    start = time.perf_counter()
+    print(f"seeding {engine.url.render_as_string(hide_password=True)}")
+    jd_ids = seed(args.jds, args.candidates, args.matches_per_candidate, args.seed, args.chunk_size, progress=True)
+    elapsed = time.perf_counter() - start
+    matches = args.candidates * min(args.matches_per_candidate, len(jd_ids))
+    print(
+        f"inserted {args.jds} JDs, {args.candidates} candidates and {matches} match results "
+        f"in {elapsed:.1f} s ({(args.candidates + matches) / elapsed:.0f} rows/s)"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Local stand-in SMTP server that accepts and discards mail, for exercising the mailer offline.
+
+Usage (from the backend directory):
+    python -m scripts.smtp_sink --port 1025 --latency 0.05
+    python -m scripts.smtp_sink --port 1025 --drop-after 3   # hang up every session after 3 messages
+
+Then point the app at it:
+    SMTP_SERVER=localhost SMTP_PORT=1025 SMTP_USE_TLS=false
+"""
+import argparse
+import asyncio
+import threading
+import time
+from typing import Dict
+
+class SinkStats:
+    def __init__(self):
+        self.connections = 0
+        self.logins = 0
+        self.messages = 0
+        self.recipients = 0
+        self.bytes = 0
+        self.dropped = 0
+        self.started = time.monotonic()
+
+    def as_dict(self) -> Dict:
+        return {
+            "connections": self.connections,
+            "logins": self.logins,
+            "messages": self.messages,
+            "recipients": self.recipients,
+            "bytes": self.bytes,
+            "dropped": self.dropped
+        }
+
+class SMTPSinkProtocol(asyncio.Protocol):
+    """Enough of RFC 5321 for smtplib: EHLO/HELO, AUTH PLAIN (any credentials), MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+
+    def __init__(self, stats: SinkStats, latency: float, drop_after: int = 0):
+        self.stats = stats
+        self.latency = latency
+        self.drop_after = drop_after
+        self.session_messages = 0
+        self.buffer = b""
+        self.in_data = False
+        self.data = []
+        self.recipients = 0
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+        self.stats.connections += 1
+        self.reply("220 localhost SMTP sink ready")
+
+    def reply(self, line: str) -> None:
+        self.transport.write(line.encode("ascii") + b"\r\n")
+
+    def data_received(self, data: bytes) -> None:
+        self.buffer += data
+        while b"\r\n" in self.buffer:
+            line, self.buffer = self.buffer.split(b"\r\n", 1)
+            if self.in_data:
+                self.data_line(line)
+            else:
+                self.command(line.decode("utf-8", "replace"))
+
+    def data_line(self, line: bytes) -> None:
+        if line != b".":
+            self.data.append(line)
+            return
+        self.in_data = False
+        self.stats.messages += 1
+        self.stats.recipients += self.recipients
+        self.stats.bytes += sum(len(part) + 2 for part in self.data)
+        self.data = []
+        self.recipients = 0
+        self.session_messages += 1
+        if self.latency:
+            # Simulates the provider's per-message processing time
+            asyncio.get_running_loop().call_later(self.latency, self.acknowledge)
+        else:
+            self.acknowledge()
+
+    def acknowledge(self) -> None:
+        self.reply("250 OK: queued")
+        if self.drop_after and self.session_messages >= self.drop_after:
+            # Hang up without QUIT, like a server ending a long or idle session
+            self.stats.dropped += 1
+            self.transport.close()
+
+    def command(self, line: str) -> None:
+        verb = line[:4].upper()
+        if verb == "EHLO":
+            self.transport.write(b"250-localhost\r\n250-8BITMIME\r\n250-AUTH PLAIN\r\n250 SIZE 10485760\r\n")
+        elif verb == "HELO":
+            self.reply("250 localhost")
+        elif verb == "AUTH":
+            self.stats.logins += 1
+            self.reply("235 Authentication successful")
+        elif verb == "MAIL":
+            self.recipients = 0
+            self.reply("250 OK")
+        elif verb == "RCPT":
+            self.recipients += 1
+            self.reply("250 OK")
+        elif verb == "DATA":
+            self.in_data = True
+            self.reply("354 End data with <CR><LF>.<CR><LF>")
+        elif verb in ("RSET", "NOOP"):
+            self.recipients = 0
+            self.reply("250 OK")
+        elif verb == "QUIT":
+            self.reply("221 Bye")
+            self.transport.close()
+        else:
+            self.reply("502 Command not implemented")
+
+async def serve(host: str, port: int, latency: float, stats: SinkStats, drop_after: int = 0):
+    loop = asyncio.get_running_loop()
+    return await loop.create_server(lambda: SMTPSinkProtocol(stats, latency, drop_after), host, port)
+
+def start_in_thread(host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, drop_after: int = 0):
+    """Run a sink on a background thread; returns (port, stats, stop)"""
+    stats = SinkStats()
+    ready = threading.Event()
+    state = {}
+
+    def run():
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(serve(host, port, latency, stats, drop_after))
+        state["port"] = server.sockets[0].getsockname()[1]
+        state["loop"] = loop
+        ready.set()
+        loop.run_forever()
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    ready.wait()
+
+    def stop():
+        state["loop"].call_soon_threadsafe(state["loop"].stop)
+        thread.join()
+
+    return state["port"], stats, stop
+
+async def main_async(args):
+    stats = SinkStats()
+    server = await serve(args.host, args.port, args.latency, stats, args.drop_after)
+    print(f"SMTP sink listening on {args.host}:{args.port}")
+    async with server:
+        while True:
+            await asyncio.sleep(args.report_every)
+            print(f"sink stats: {stats.as_dict()}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before acknowledging each message")
+    parser.add_argument("--drop-after", type=int, default=0, help="Close each connection after this many messages (0 never)")
+    parser.add_argument("--report-every", type=float, default=10.0)
+    args = parser.parse_args()
+    try:
+        asyncio.run(main_async(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
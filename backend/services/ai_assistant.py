@@ -1,15 +1,129 @@
 import google.generativeai as genai
 import os
 import json
-from typing import Dict, List, Optional
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from core.db import get_db
-from core.models import Candidate, JD, MatchResult, BiasAlert, DiversityMetrics
+from core.models import JD, JDState, MatchResult, BiasAlert, DiversityMetrics
+from core.versions import ALL_JDS
+from core.queries import get_context_candidate_rows, get_match_aggregates, get_top_match_rows, iter_matched_skills
+from services.ai_cache import ai_response_cache, normalize_query
+from services.skill_stats import normalize_skill
+from services.reports import calculate_actual_diversity_score
+
+# Bounds on what goes into the prompt, independent of pool size
+CONTEXT_TOP_CANDIDATES = int(os.getenv("AI_CONTEXT_TOP_CANDIDATES", "10"))
+CONTEXT_MAX_ALERTS = 10
+CONTEXT_TOKEN_BUDGET = int(os.getenv("AI_CONTEXT_TOKEN_BUDGET", "2000"))
+
+AI_MODEL_BACKEND = os.getenv("AI_MODEL_BACKEND", "gemini")  # gemini, fake (offline stand-in)
+
+PROMPT_TEMPLATE = """
+You are an AI assistant for a talent matching dashboard. You help HR professionals understand candidate data, matching results, and recruitment insights.
+
+Current Dashboard Context:
+- Job Description: {job_description}
+- Total Candidates: {total_candidates}
+- Shortlisted Candidates: {shortlisted_candidates}
+- Average Match Score: {average_score}
+- Bias Alerts: {alert_count} active alerts
+- Diversity Score: {diversity_score}
+
+Top {shown_candidates} Candidates by Match Score:
+{candidates}
+
+Bias Alerts:
+{bias_alerts}
+
+Diversity Metrics:
+{diversity}
+
+User Query: {query}
+
+Please provide a helpful, professional response that:
+1. Directly answers the user's question
+2. Uses the dashboard data to provide specific insights
+3. Offers actionable recommendations when appropriate
+4. Maintains a professional HR-focused tone
+5. Keeps responses concise but informative
+
+Response:
+"""
+
+def _estimate_tokens(text: str) -> int:
+    # Rough rule of thumb: about four characters per token
+    return len(text) // 4 + 1
+
+# Suggested questions that can be answered exactly from the database
+LOCAL_INTENTS = [
+    ("best_skill_matches", re.compile(r"\b(best|strongest|highest) skills? match")),
+    ("common_skills", re.compile(r"\b(most )?common skills\b|\bskills (are|is) (the )?most common\b")),
+    ("top_candidates", re.compile(r"\b(top|best|strongest) (candidates|applicants)\b"))
+]
+LOCAL_MAX_QUERY_WORDS = 12  # Longer questions are treated as open-ended
+LOCAL_ANSWER_LIMIT = 5
+LOCAL_SKILL_LIMIT = 10
+HIGH_SCORE_THRESHOLD = 0.7
+# calculate_actual_diversity_score is on a 0-100 scale
+LOW_DIVERSITY_SCORE = 50
+
+def match_intent(query: str) -> Optional[str]:
+    """Map a question to a locally answerable intent, if it is one"""
+    text = normalize_query(query)
+    if len(text.split()) > LOCAL_MAX_QUERY_WORDS:
+        return None
+    for intent, pattern in LOCAL_INTENTS:
+        if pattern.search(text):
+            return intent
+    return None
+
+def _percent(value: Optional[float]) -> str:
+    return f"{round((value or 0) * 100)}%"
+
+def _scope_phrase(rows: List, jd_id: Optional[int]) -> str:
+    if not jd_id:
+        return "across all positions"
+    return f"for {rows[0].jd_title}" if rows else "for this position"
+
+class _FakeChunk:
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeModel:
+    """Offline stand-in for the Gemini model with the same generate_content interface"""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        query = prompt.rsplit("User Query:", 1)[-1].split("\n", 1)[0].strip()
+        total = re.search(r"Total Candidates: (\S+)", prompt)
+        text = (
+            f"(offline model) You asked: {query}. "
+            f"There are {total.group(1) if total else 'no'} candidates in the current view; "
+            "see the dashboard for the ranked list and diversity metrics."
+        )
+        if not stream:
+            time.sleep(self.delay)
+            return _FakeChunk(text)
+        return self._stream(text)
+
+    def _stream(self, text: str) -> Iterator[_FakeChunk]:
+        # Chunks join back into exactly the non-streamed text
+        for chunk in re.findall(r"\S+\s*", text):
+            time.sleep(self.delay)
+            yield _FakeChunk(chunk)
 
 class AIAssistant:
     def __init__(self):
         self.api_key = os.getenv("GEMINI_API_KEY")
-        if self.api_key and self.api_key != "your_gemini_api_key_here":
+        if AI_MODEL_BACKEND == "fake":
+            self.model = FakeModel()
+        elif self.api_key and self.api_key != "your_gemini_api_key_here":
             genai.configure(api_key=self.api_key)
             self.model = genai.GenerativeModel('gemini-1.5-flash')
         else:
@@ -21,101 +135,236 @@ class AIAssistant:
         
         # Get candidates and matches
         if jd_id:
-            matches = db.query(MatchResult).filter(MatchResult.jd_id == jd_id).all()
-            jd = db.query(JD).filter(JD.id == jd_id).first()
+            jd = db.query(JD.title, JD.required_skills).filter(JD.id == jd_id).first()
             context["job_description"] = {
                 "title": jd.title if jd else "Unknown",
                 "requirements": jd.required_skills if jd else {}
             }
         else:
-            matches = db.query(MatchResult).all()
             context["job_description"] = "All job descriptions"
         
-        # Prepare candidate data
-        candidates_data = []
-        for match in matches:
-            candidate = db.query(Candidate).filter(Candidate.id == match.candidate_id).first()
-            if candidate:
-                candidates_data.append({
-                    "name": candidate.name,
-                    "email": candidate.email,
-                    "match_score": match.overall_score,
-                    "skill_match": match.skills_match_score,
-                    "experience_match": match.experience_match_score,
-                    "skills": candidate.extracted_skills,
-                    "experience_years": candidate.experience_years,
-                    "education": candidate.education
-                })
-        
-        context["candidates"] = candidates_data
-        context["total_candidates"] = len(candidates_data)
-        
-        # Get bias alerts
-        bias_alerts = db.query(BiasAlert).all()
+        # Pool-wide numbers come from SQL aggregates rather than loaded rows
+        aggregates = get_match_aggregates(db, jd_id)
+        context["total_candidates"] = aggregates.total
+        context["shortlisted_candidates"] = int(aggregates.shortlisted or 0)
+        context["average_score"] = round(aggregates.average_score or 0, 2)
+        
+        # Only the top-ranked candidates are described to the model
+        context["candidates"] = [
+            {
+                "name": row.name,
+                "email": row.email,
+                "match_score": row.overall_score,
+                "skill_match": row.skills_match_score,
+                "experience_match": row.experience_match_score,
+                "skills": row.extracted_skills,
+                "experience_years": row.experience_years,
+                "education": row.education
+            }
+            for row in get_context_candidate_rows(db, jd_id, limit=CONTEXT_TOP_CANDIDATES)
+        ]
+        
+        # Stored bias alerts for this JD (projection only)
+        alerts_query = db.query(BiasAlert.alert_type, BiasAlert.description, BiasAlert.severity)
+        if jd_id:
+            alerts_query = alerts_query.filter(BiasAlert.jd_id == jd_id)
         context["bias_alerts"] = [
             {
                 "type": alert.alert_type,
-                "message": alert.message,
+                "message": alert.description,
                 "severity": alert.severity
-            } for alert in bias_alerts
+            } for alert in alerts_query.order_by(BiasAlert.id.desc()).limit(CONTEXT_MAX_ALERTS)
         ]
         
-        # Get diversity metrics
-        diversity_metrics = db.query(DiversityMetrics).all()
-        if diversity_metrics:
-            latest_metrics = diversity_metrics[-1]
-            context["diversity"] = {
+        # Get the latest diversity metrics row only
+        metrics_query = db.query(
+            DiversityMetrics.gender_distribution,
+            DiversityMetrics.experience_distribution,
+            DiversityMetrics.education_distribution
+        )
+        if jd_id:
+            metrics_query = metrics_query.filter(DiversityMetrics.jd_id == jd_id)
+        latest_metrics = metrics_query.order_by(DiversityMetrics.id.desc()).first()
+        if latest_metrics:
+            diversity = {
                 "gender_distribution": latest_metrics.gender_distribution,
-                "diversity_score": latest_metrics.diversity_score,
-                "inclusion_score": latest_metrics.inclusion_score
+                "experience_distribution": latest_metrics.experience_distribution,
+                "education_distribution": latest_metrics.education_distribution
             }
+            diversity["diversity_score"] = calculate_actual_diversity_score(diversity)
+            context["diversity"] = diversity
         
         return context
     
-    def generate_response(self, query: str, context: Dict) -> str:
-        """Generate AI response using Gemini API"""
+    def build_prompt(self, query: str, context: Dict) -> str:
+        """Render the prompt, trimming the candidate summary to the token budget"""
+        prompt_parts = {
+            "job_description": context.get('job_description', 'N/A'),
+            "bias_alerts": json.dumps(context.get('bias_alerts', []), indent=2),
+            "diversity": json.dumps(context.get('diversity', {}), indent=2),
+            "query": query
+        }
+        fixed_tokens = _estimate_tokens(PROMPT_TEMPLATE) + sum(_estimate_tokens(str(part)) for part in prompt_parts.values())
+        
+        # Candidates are ranked, so keep as many from the top as fit
+        candidates = []
+        remaining = CONTEXT_TOKEN_BUDGET - fixed_tokens
+        for candidate in context.get('candidates', []):
+            cost = _estimate_tokens(json.dumps(candidate, indent=2))
+            if candidates and cost > remaining:
+                break
+            candidates.append(candidate)
+            remaining -= cost
+        
+        return PROMPT_TEMPLATE.format(
+            total_candidates=context.get('total_candidates', 0),
+            shortlisted_candidates=context.get('shortlisted_candidates', 0),
+            average_score=context.get('average_score', 'N/A'),
+            alert_count=len(context.get('bias_alerts', [])),
+            diversity_score=context.get('diversity', {}).get('diversity_score', 'N/A'),
+            shown_candidates=len(candidates),
+            candidates=json.dumps(candidates, indent=2),
+            **prompt_parts
+        )
+    
+    def cached_response(self, query: str, context: Dict, jd_id: Optional[int] = None, version: int = 0) -> Optional[str]:
+        """Return the cached answer for this query and data version, or None if the model has to be called"""
+        return ai_response_cache.get(ai_response_cache.make_key(query, context, jd_id, version))
+    
+    def generate_response(self, query: str, context: Dict, jd_id: Optional[int] = None, version: int = 0) -> str:
+        """Generate AI response using Gemini API and cache it (callers check cached_response first)"""
         if not self.model:
             return "AI Assistant is not configured. Please set up your Gemini API key in the environment variables."
         
-        # Create a comprehensive prompt
-        prompt = f"""
-You are an AI assistant for a talent matching dashboard. You help HR professionals understand candidate data, matching results, and recruitment insights.
-
-Current Dashboard Context:
-- Job Description: {context.get('job_description', 'N/A')}
-- Total Candidates: {context.get('total_candidates', 0)}
-- Bias Alerts: {len(context.get('bias_alerts', []))} active alerts
-- Diversity Score: {context.get('diversity', {}).get('diversity_score', 'N/A')}
-
-Candidate Summary:
-{json.dumps(context.get('candidates', [])[:5], indent=2)}
-
-Bias Alerts:
-{json.dumps(context.get('bias_alerts', []), indent=2)}
-
-Diversity Metrics:
-{json.dumps(context.get('diversity', {}), indent=2)}
-
-User Query: {query}
-
-Please provide a helpful, professional response that:
-1. Directly answers the user's question
-2. Uses the dashboard data to provide specific insights
-3. Offers actionable recommendations when appropriate
-4. Maintains a professional HR-focused tone
-5. Keeps responses concise but informative
-
-Response:
-"""
+        cache_key = ai_response_cache.make_key(query, context, jd_id, version)
+        prompt = self.build_prompt(query, context)
         
         try:
             response = self.model.generate_content(prompt)
-            return response.text
+            text = response.text
         except Exception as e:
             return f"I apologize, but I'm having trouble processing your request right now. Error: {str(e)}"
+        
+        # Only successful answers are cached so errors are retried
+        ai_response_cache.set(cache_key, text, jd_id, version)
+        return text
+    
+    def stream_response(
+        self,
+        query: str,
+        context: Dict,
+        jd_id: Optional[int] = None,
+        version: int = 0,
+        cancelled: Optional[threading.Event] = None
+    ) -> Iterator[str]:
+        """Yield the answer in chunks as the model produces them (blocking; run off the event loop)"""
+        if not self.model:
+            yield "AI Assistant is not configured. Please set up your Gemini API key in the environment variables."
+            return
+        
+        cache_key = ai_response_cache.make_key(query, context, jd_id, version)
+        prompt = self.build_prompt(query, context)
+        parts = []
+        try:
+            for chunk in self.model.generate_content(prompt, stream=True):
+                if cancelled is not None and cancelled.is_set():
+                    return
+                if chunk.text:
+                    parts.append(chunk.text)
+                    yield chunk.text
+        except Exception as e:
+            yield f"I apologize, but I'm having trouble processing your request right now. Error: {str(e)}"
+            return
+        
+        ai_response_cache.set(cache_key, "".join(parts), jd_id, version)
+    
+    def answer_locally(self, db: Session, query: str, jd_id: Optional[int] = None) -> Optional[str]:
+        """Answer known dashboard questions straight from the database, or None to use the model"""
+        intent = match_intent(query)
+        if intent is None:
+            return None
+        return self._local_answers[intent](self, db, jd_id)
+    
+    def _answer_top_candidates(self, db: Session, jd_id: Optional[int]) -> str:
+        rows = get_top_match_rows(db, jd_id, MatchResult.overall_score, LOCAL_ANSWER_LIMIT)
+        if not rows:
+            return f"There are no scored candidates {_scope_phrase(rows, jd_id)} yet."
+        lines = [
+            f"{rank}. {row.name} - {_percent(row.overall_score)} overall "
+            f"(skills {_percent(row.skills_match_score)}, experience {_percent(row.experience_match_score)})"
+            + ("" if jd_id else f" for {row.jd_title}")
+            for rank, row in enumerate(rows, 1)
+        ]
+        return f"Top {len(rows)} candidates {_scope_phrase(rows, jd_id)} by overall match score:\n" + "\n".join(lines)
+    
+    def _answer_best_skill_matches(self, db: Session, jd_id: Optional[int]) -> str:
+        rows = get_top_match_rows(db, jd_id, MatchResult.skills_match_score, LOCAL_ANSWER_LIMIT)
+        if not rows:
+            return f"There are no scored candidates {_scope_phrase(rows, jd_id)} yet."
+        lines = [
+            f"{rank}. {row.name} - skills match {_percent(row.skills_match_score)}"
+            + (f", matched: {', '.join(row.matched_skills[:8])}" if row.matched_skills else "")
+            + ("" if jd_id else f" ({row.jd_title})")
+            for rank, row in enumerate(rows, 1)
+        ]
+        return f"Candidates with the best skill matches {_scope_phrase(rows, jd_id)}:\n" + "\n".join(lines)
+    
+    def _answer_common_skills(self, db: Session, jd_id: Optional[int]) -> str:
+        counts = Counter()
+        high_scorers = 0
+        for skills in iter_matched_skills(db, jd_id, HIGH_SCORE_THRESHOLD):
+            high_scorers += 1
+            counts.update({normalize_skill(skill) for skill in skills if skill})
+        if not counts:
+            return f"No candidates score {_percent(HIGH_SCORE_THRESHOLD)} or higher yet, so there are no common skills to report."
+        lines = [
+            f"{rank}. {skill} - {count} of {high_scorers} candidates ({_percent(count / high_scorers)})"
+            for rank, (skill, count) in enumerate(counts.most_common(LOCAL_SKILL_LIMIT), 1)
+        ]
+        return (
+            f"Most common skills among the {high_scorers} candidates scoring {_percent(HIGH_SCORE_THRESHOLD)} or higher:\n"
+            + "\n".join(lines)
+        )
+    
+    _local_answers = {
+        "top_candidates": _answer_top_candidates,
+        "best_skill_matches": _answer_best_skill_matches,
+        "common_skills": _answer_common_skills
+    }
+    
+    def get_suggestion_stats(self, db: Session, jd_id: Optional[int] = None) -> Dict:
+        """The few numbers get_suggested_questions reads, from counters and indexed lookups"""
+        alerts_query = db.query(BiasAlert.id)
+        if jd_id:
+            alerts_query = alerts_query.filter(BiasAlert.jd_id == jd_id)
+        has_alerts = db.query(alerts_query.exists()).scalar()
+        
+        # Match counts are maintained alongside the skill counters
+        counts_query = db.query(func.coalesce(func.sum(JDState.match_count), 0))
+        if jd_id:
+            counts_query = counts_query.filter(JDState.jd_id == jd_id)
+        else:
+            counts_query = counts_query.filter(JDState.jd_id != ALL_JDS)
+        
+        metrics_query = db.query(
+            DiversityMetrics.gender_distribution,
+            DiversityMetrics.experience_distribution,
+            DiversityMetrics.education_distribution
+        )
+        if jd_id:
+            metrics_query = metrics_query.filter(DiversityMetrics.jd_id == jd_id)
+        latest_metrics = metrics_query.order_by(DiversityMetrics.id.desc()).first()
+        
+        stats = {
+            "bias_alerts": bool(has_alerts),
+            "total_candidates": counts_query.scalar()
+        }
+        if latest_metrics:
+            stats["diversity"] = {"diversity_score": calculate_actual_diversity_score(dict(latest_metrics._mapping))}
+        return stats
     
     def get_suggested_questions(self, context: Dict) -> List[str]:
-        """Generate suggested questions based on current dashboard state"""
+        """Generate suggested questions based on current dashboard state (full context or suggestion stats)"""
         suggestions = [
             "What are the top candidates for this position?",
             "Are there any bias concerns in the current candidate pool?",
@@ -131,7 +380,8 @@ Response:
         if context.get('total_candidates', 0) > 10:
             suggestions.append("How can I narrow down this large candidate pool?")
         
-        if context.get('diversity', {}).get('diversity_score', 0) < 0.5:
+        # Without stored metrics the score counts as low, as before
+        if context.get('diversity', {}).get('diversity_score', 0) < LOW_DIVERSITY_SCORE:
             suggestions.append("How can I improve diversity in my candidate selection?")
         
         return suggestions[:6]  # Return top 6 suggestions
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "256"))
+AI_CACHE_TTL_SECONDS = int(os.getenv("AI_CACHE_TTL_SECONDS", "3600"))
+AI_CACHE_DB_PATH = os.getenv("AI_CACHE_DB_PATH", "")  # Empty keeps the cache in memory only
+
+def normalize_query(query: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation so rephrasings of the same text match"""
+    return re.sub(r"\s+", " ", query.strip().lower()).rstrip("?!. ")
+
+def context_hash(context: Dict) -> str:
+    return hashlib.sha256(json.dumps(context, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+class SQLiteResponseStore:
+    """Persistent tier so answers survive restarts and are shared by workers on one host"""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ai_responses ("
+                "key TEXT PRIMARY KEY, scope TEXT, version INTEGER, response TEXT, created_at REAL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str, ttl: int) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM ai_responses WHERE key = ? AND created_at > ?",
+                (key, time.time() - ttl)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, scope: str, version: int, response: str, ttl: int) -> None:
+        with self._lock:
+            # Answers for older data versions of this scope can never be hit again
+            self._conn.execute(
+                "DELETE FROM ai_responses WHERE (scope = ? AND version < ?) OR created_at <= ?",
+                (scope, version, time.time() - ttl)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ai_responses (key, scope, version, response, created_at) VALUES (?, ?, ?, ?, ?)",
+                (key, scope, version, response, time.time())
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM ai_responses")
+            self._conn.commit()
+
+class AIResponseCache:
+    """LRU + TTL cache of assistant answers keyed by query, context and JD data version"""
+
+    def __init__(
+        self,
+        max_entries: int = AI_CACHE_MAX_ENTRIES,
+        ttl: int = AI_CACHE_TTL_SECONDS,
+        db_path: str = AI_CACHE_DB_PATH
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.store = SQLiteResponseStore(db_path) if db_path else None
+        self._entries = OrderedDict()  # key -> (expires_at, response)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, query: str, context: Dict, jd_id: Optional[int], version: int) -> str:
+        digest = hashlib.sha256(f"{normalize_query(query)}\n{context_hash(context)}".encode("utf-8")).hexdigest()
+        return f"ai:{_scope(jd_id)}:v{version}:{digest}"
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[key]
+
+        response = self.store.get(key, self.ttl) if self.store else None
+        with self._lock:
+            if response is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        self._remember(key, response)
+        return response
+
+    def set(self, key: str, response: str, jd_id: Optional[int], version: int) -> None:
+        self._remember(key, response)
+        if self.store:
+            self.store.set(key, _scope(jd_id), version, response, self.ttl)
+
+    def _remember(self, key: str, response: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+        if self.store:
+            self.store.clear()
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "persistent": self.store is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+def _scope(jd_id: Optional[int]) -> str:
+    return str(jd_id) if jd_id else "all"
+
+# Global instance
+ai_response_cache = AIResponseCache()
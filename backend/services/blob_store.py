@@ -0,0 +1,111 @@
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, Callable, Dict, Iterable, Optional, Tuple
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from core.models import Blob
+
+BLOB_DIR = os.getenv("BLOB_DIR", "uploads/blobs")
+BLOB_CHUNK_SIZE = 1024 * 1024
+
+class BlobStore:
+    """Content-addressed file storage: files are kept once, under the SHA-256 of their bytes.
+
+    Paths are sharded by the first two byte pairs of the hash (ab/cd/abcd...),
+    so no single directory grows unbounded.
+    """
+
+    def __init__(self, root: str = BLOB_DIR):
+        self.root = root
+
+    def path_for(self, blob_id: str, extension: str = "") -> str:
+        return os.path.join(self.root, blob_id[:2], blob_id[2:4], blob_id + extension)
+
+    def hash_stream(self, fileobj: BinaryIO) -> Tuple[str, int]:
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in iter(lambda: fileobj.read(BLOB_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+        return digest.hexdigest(), size
+
+    def write(self, fileobj: BinaryIO, path: str) -> None:
+        """Copy the stream to path atomically; readers never see a partial file"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in iter(lambda: fileobj.read(BLOB_CHUNK_SIZE), b""):
+                    out.write(chunk)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def put(self, db: Session, fileobj: BinaryIO, filename: Optional[str]) -> Tuple[Blob, bool]:
+        """Store an upload unless identical content is already stored; returns the blob and whether it is new.
+
+        The hash is taken in a streaming pass over the (seekable) upload, so a
+        duplicate is never written again.
+        """
+        blob_id, size = self.hash_stream(fileobj)
+        blob = db.get(Blob, blob_id)
+        if blob is not None and os.path.exists(blob.storage_path):
+            return blob, False
+
+        # The extension is kept because text extraction dispatches on it
+        extension = os.path.splitext(filename or "")[1].lower()
+        path = blob.storage_path if blob is not None else self.path_for(blob_id, extension)
+        fileobj.seek(0)
+        self.write(fileobj, path)
+        if blob is not None:
+            # Row survived but the file was lost; it has been restored
+            return blob, False
+
+        blob = Blob(id=blob_id, size=size, storage_path=path, original_filename=filename)
+        try:
+            with db.begin_nested():
+                db.add(blob)
+        except IntegrityError:
+            # A concurrent upload of the same content won the insert; same bytes, same path
+            blob = db.get(Blob, blob_id)
+            return blob, False
+        return blob, True
+
+    def parsed(self, db: Session, blob: Blob, parser: str, parse: Callable[[str], Dict]) -> Dict:
+        """Parse the blob's file once per parser; later uploads of the same content reuse the result"""
+        results = blob.parsed_data or {}
+        if parser in results:
+            return results[parser]
+        result = parse(blob.storage_path)
+        if "error" not in result:
+            # Reassign so the JSON column is seen as changed
+            blob.parsed_data = {**results, parser: result}
+            db.flush()
+        return result
+
+    def cached_result(self, db: Session, blob_id: Optional[str], parser: str) -> Optional[Dict]:
+        """A stored parse result for a blob, if there is one"""
+        if not blob_id:
+            return None
+        blob = db.get(Blob, blob_id)
+        if blob is None or not blob.parsed_data:
+            return None
+        return blob.parsed_data.get(parser)
+
+    def cached_results(self, db: Session, blob_ids: Iterable[Optional[str]], parser: str) -> Dict[str, Dict]:
+        """Stored parse results for many blobs in one query, by blob id"""
+        ids = {blob_id for blob_id in blob_ids if blob_id}
+        if not ids:
+            return {}
+        rows = db.query(Blob.id, Blob.parsed_data).filter(Blob.id.in_(ids))
+        return {
+            blob_id: parsed_data[parser]
+            for blob_id, parsed_data in rows
+            if parsed_data and parser in parsed_data
+        }
+
+# Global instance
+blob_store = BlobStore()
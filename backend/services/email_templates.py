@@ -0,0 +1,48 @@
+import os
+from pathlib import Path
+from typing import Dict, Tuple
+from core.metrics import stage_timer
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+# Compiled template bytecode is reused across processes; defaults to the system temp dir
+EMAIL_TEMPLATE_CACHE_DIR = os.getenv("EMAIL_TEMPLATE_CACHE_DIR", "")
+
+# Subject line per mail type; each type has <name>.html and <name>.txt templates
+EMAIL_SUBJECTS = {
+    "shortlist_notification": "Shortlisted for {job_title} Position",
+    "shortlist_invite": "Congratulations! You've been shortlisted for {position}",
+    "rejection": "Application Update - {position}"
+}
+
+def _bytecode_cache() -> FileSystemBytecodeCache:
+    if EMAIL_TEMPLATE_CACHE_DIR:
+        os.makedirs(EMAIL_TEMPLATE_CACHE_DIR, exist_ok=True)
+        return FileSystemBytecodeCache(EMAIL_TEMPLATE_CACHE_DIR)
+    return FileSystemBytecodeCache()
+
+# Templates are compiled once per process and kept; auto_reload off skips
+# the per-render stat of the template file
+environment = Environment(
+    loader=FileSystemLoader(str(TEMPLATE_DIR)),
+    autoescape=select_autoescape(enabled_extensions=("html",), default_for_string=False),
+    bytecode_cache=_bytecode_cache(),
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True
+)
+
+@stage_timer("email_render")
+def render_email(name: str, **context) -> Tuple[str, str, str]:
+    """Render a mail type's subject, HTML body and text body"""
+    subject = EMAIL_SUBJECTS[name].format(**context)
+    html_content = environment.get_template(f"{name}.html").render(**context)
+    text_content = environment.get_template(f"{name}.txt").render(**context)
+    return subject, html_content, text_content
+
+def warm_templates() -> Dict[str, int]:
+    """Compile every email template up front (e.g. before a bulk send)"""
+    for name in EMAIL_SUBJECTS:
+        environment.get_template(f"{name}.html")
+        environment.get_template(f"{name}.txt")
+    return {"templates": len(EMAIL_SUBJECTS) * 2}
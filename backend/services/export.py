@@ -0,0 +1,124 @@
+import csv
+import io
+from typing import Iterator, List
+from sqlalchemy import select, desc
+from core.db import SessionLocal
+from core.models import Candidate, MatchResult
+
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_COLUMNS = [
+    "rank", "candidate_id", "name", "email", "overall_score", "skills_match_score",
+    "experience_match_score", "matched_skills", "missing_skills", "status"
+]
+
+def iter_ranked_chunks(jd_id: int, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[tuple]]:
+    """Yield a JD's ranked candidates in chunks from a server-side cursor"""
+    # The stream outlives the request handler, so it uses its own session
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            select(
+                Candidate.id,
+                Candidate.name,
+                Candidate.email,
+                MatchResult.overall_score,
+                MatchResult.skills_match_score,
+                MatchResult.experience_match_score,
+                MatchResult.matched_skills,
+                MatchResult.missing_skills,
+                Candidate.status
+            )
+            .join(Candidate, MatchResult.candidate_id == Candidate.id)
+            .where(MatchResult.jd_id == jd_id, MatchResult.overall_score.isnot(None))
+            .order_by(desc(MatchResult.overall_score), MatchResult.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        rank = 0
+        for partition in result.partitions():
+            chunk = []
+            for row in partition:
+                rank += 1
+                chunk.append((rank, *row))
+            yield chunk
+    finally:
+        db.close()
+
+def stream_csv(jd_id: int) -> Iterator[str]:
+    """Stream a JD's ranked candidates as CSV, one chunk of rows at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue()
+
+    for chunk in iter_ranked_chunks(jd_id):
+        buffer.seek(0)
+        buffer.truncate()
+        for row in chunk:
+            row = list(row)
+            row[7] = "; ".join(row[7] or [])
+            row[8] = "; ".join(row[8] or [])
+            writer.writerow(row)
+        yield buffer.getvalue()
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the stream"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def stream_parquet(jd_id: int) -> Iterator[bytes]:
+    """Stream a JD's ranked candidates as Parquet, one row group per chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("rank", pa.int64()),
+        ("candidate_id", pa.int64()),
+        ("name", pa.string()),
+        ("email", pa.string()),
+        ("overall_score", pa.float64()),
+        ("skills_match_score", pa.float64()),
+        ("experience_match_score", pa.float64()),
+        ("matched_skills", pa.list_(pa.string())),
+        ("missing_skills", pa.list_(pa.string())),
+        ("status", pa.string())
+    ])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for chunk in iter_ranked_chunks(jd_id):
+            columns = list(zip(*chunk))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -3,8 +3,10 @@ from typing import Dict, List, Tuple
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from core.metrics import stage_timer
 from services.parser import extract_skills_with_nlp, extract_experience_years
 
+@stage_timer("match_skills")
 def calculate_skills_match(jd_skills: List[str], candidate_skills: List[str]) -> Dict:
     """Calculate skill matching score with generalized matching and identify gaps"""
     if not jd_skills or not candidate_skills:
@@ -111,6 +113,7 @@ def calculate_skills_match(jd_skills: List[str], candidate_skills: List[str]) ->
         "skill_gaps": skill_gaps
     }
 
+@stage_timer("match_experience")
 def calculate_experience_match(required_exp: int, candidate_exp: int) -> float:
     """Calculate experience matching score"""
     if required_exp is None or candidate_exp is None:
@@ -127,6 +130,7 @@ def calculate_experience_match(required_exp: int, candidate_exp: int) -> float:
     else:
         return 0.2
 
+@stage_timer("match_text_similarity")
 def calculate_text_similarity(jd_text: str, resume_text: str) -> float:
     """Calculate text similarity using TF-IDF and cosine similarity"""
     try:
@@ -148,6 +152,7 @@ def calculate_text_similarity(jd_text: str, resume_text: str) -> float:
         print(f"Error calculating text similarity: {e}")
         return 0.5
 
+@stage_timer("match_total")
 def calculate_comprehensive_match(jd_data: Dict, candidate_data: Dict) -> Dict:
     """Calculate comprehensive matching score with detailed breakdown"""
     
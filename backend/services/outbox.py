@@ -0,0 +1,210 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+from core.db import SessionLocal
+from core.models import EmailOutbox
+from services.mailer import MAIL_BULK_CONCURRENCY, deliver_rejection_email, deliver_shortlist_email
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_BACKOFF_BASE_SECONDS = float(os.getenv("OUTBOX_BACKOFF_BASE_SECONDS", "30"))
+OUTBOX_BACKOFF_MAX_SECONDS = float(os.getenv("OUTBOX_BACKOFF_MAX_SECONDS", "3600"))
+OUTBOX_DOMAIN_RATE_PER_MINUTE = float(os.getenv("OUTBOX_DOMAIN_RATE_PER_MINUTE", "60"))
+OUTBOX_LOCK_TIMEOUT_SECONDS = float(os.getenv("OUTBOX_LOCK_TIMEOUT_SECONDS", "300"))
+# Also drain from the API process after enqueueing, for deployments without a worker
+OUTBOX_DRAIN_IN_APP = os.getenv("OUTBOX_DRAIN_IN_APP", "true").lower() == "true"
+
+DELIVERERS = {
+    "shortlist": deliver_shortlist_email,
+    "rejection": deliver_rejection_email
+}
+
+def enqueue_email(
+    db: Session,
+    candidate_id: int,
+    kind: str,
+    to_email: Optional[str],
+    payload: Dict,
+    jd_id: Optional[int] = None
+) -> Optional[EmailOutbox]:
+    """Add an email to the outbox inside the caller's transaction"""
+    if not to_email:
+        return None
+    if kind not in DELIVERERS:
+        raise ValueError(f"Unknown email kind: {kind}")
+
+    email = EmailOutbox(
+        candidate_id=candidate_id,
+        jd_id=jd_id,
+        kind=kind,
+        to_email=to_email,
+        recipient_domain=to_email.rsplit("@", 1)[-1].lower(),
+        payload=payload,
+        status="pending",
+        attempts=0,
+        next_attempt_at=datetime.utcnow()
+    )
+    db.add(email)
+    return email
+
+class DomainRateLimiter:
+    """Token bucket per recipient domain, so one provider is not flooded"""
+
+    def __init__(self, per_minute: float = OUTBOX_DOMAIN_RATE_PER_MINUTE, burst: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.burst = burst or max(1.0, per_minute / 6)
+        self._buckets = {}  # domain -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def reserve(self, domain: str) -> float:
+        """Take a token for the domain; returns 0 if allowed now, else seconds until one is available"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(domain, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            if tokens >= 1:
+                self._buckets[domain] = (tokens - 1, now)
+                return 0.0
+            self._buckets[domain] = (tokens, now)
+            return (1 - tokens) / self.rate
+
+def backoff_delay(attempts: int) -> float:
+    """Exponential backoff with jitter for the given number of failed attempts"""
+    delay = min(OUTBOX_BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), OUTBOX_BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+def claim_batch(db: Session, batch_size: int = OUTBOX_BATCH_SIZE) -> List[EmailOutbox]:
+    """Mark a batch of due emails as sending; rows claimed by another worker are skipped"""
+    now = datetime.utcnow()
+    claimable = or_(
+        and_(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now),
+        # A worker that died mid-send leaves rows locked; take them back after the timeout
+        and_(EmailOutbox.status == "sending", EmailOutbox.locked_at < now - timedelta(seconds=OUTBOX_LOCK_TIMEOUT_SECONDS))
+    )
+    candidate_ids = [
+        email_id for (email_id,) in db.query(EmailOutbox.id)
+        .filter(claimable)
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ]
+
+    claimed = []
+    for email_id in candidate_ids:
+        updated = db.query(EmailOutbox).filter(EmailOutbox.id == email_id, claimable).update(
+            {EmailOutbox.status: "sending", EmailOutbox.locked_at: now},
+            synchronize_session=False
+        )
+        if updated:
+            claimed.append(email_id)
+    db.commit()
+
+    if not claimed:
+        return []
+    return db.query(EmailOutbox).filter(EmailOutbox.id.in_(claimed)).order_by(EmailOutbox.id).all()
+
+def deliver(kind: str, to_email: str, payload: Dict) -> None:
+    DELIVERERS[kind](to_email, **payload)
+
+def _record_outcome(email: EmailOutbox, error: Optional[BaseException], results: Dict) -> None:
+    if error is None:
+        email.status = "sent"
+        email.sent_at = datetime.utcnow()
+        email.last_error = None
+        results["sent"] += 1
+    else:
+        email.attempts = (email.attempts or 0) + 1
+        email.last_error = str(error)
+        if email.attempts >= OUTBOX_MAX_ATTEMPTS:
+            email.status = "failed"
+            results["failed"] += 1
+            print(f"Giving up on {email.kind} email {email.id} to {email.to_email}: {error}")
+        else:
+            email.status = "pending"
+            email.next_attempt_at = datetime.utcnow() + timedelta(seconds=backoff_delay(email.attempts))
+            results["retrying"] += 1
+    email.locked_at = None
+
+def drain_outbox(
+    batch_size: int = OUTBOX_BATCH_SIZE,
+    limiter: Optional[DomainRateLimiter] = None,
+    concurrency: int = MAIL_BULK_CONCURRENCY
+) -> Dict:
+    """Send one batch of due emails, several at a time over the SMTP pool, recording the outcome of each"""
+    limiter = limiter or domain_limiter
+    results = {"sent": 0, "retrying": 0, "failed": 0, "deferred": 0}
+    db = SessionLocal()
+    try:
+        due = []
+        for email in claim_batch(db, batch_size):
+            wait = limiter.reserve(email.recipient_domain)
+            if wait:
+                # Over the domain's rate; put it back without counting an attempt
+                email.status = "pending"
+                email.locked_at = None
+                email.next_attempt_at = datetime.utcnow() + timedelta(seconds=wait)
+                results["deferred"] += 1
+                continue
+            # Read while loaded; the worker threads must not touch the session
+            due.append((email, email.kind, email.to_email, email.payload))
+        db.commit()
+
+        if due:
+            # smtplib blocks, so messages go out from worker threads while outcomes
+            # are recorded here, each committed as soon as its send finishes
+            with ThreadPoolExecutor(max_workers=max(min(concurrency, len(due)), 1)) as executor:
+                sends = {executor.submit(deliver, kind, to_email, payload): email for email, kind, to_email, payload in due}
+                for done in as_completed(sends):
+                    _record_outcome(sends[done], done.exception(), results)
+                    db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Error draining email outbox: {e}")
+    finally:
+        db.close()
+    return results
+
+def drain_after_enqueue() -> None:
+    """Background task run by the API after enqueueing, when no separate worker is relied on"""
+    if OUTBOX_DRAIN_IN_APP:
+        drain_outbox()
+
+def run_worker(poll_interval: float = 5.0, batch_size: int = OUTBOX_BATCH_SIZE, stop: Optional[threading.Event] = None) -> None:
+    """Drain the outbox until stopped, sleeping when nothing is due"""
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        results = drain_outbox(batch_size)
+        if not any(results.values()):
+            stop.wait(poll_interval)
+
+def outbox_depth(db: Session) -> Dict[str, int]:
+    """Number of outbox rows per status"""
+    return dict(db.query(EmailOutbox.status, func.count(EmailOutbox.id)).group_by(EmailOutbox.status).all())
+
+def get_candidate_emails(db: Session, candidate_id: int) -> List[Dict]:
+    """Delivery status of every email queued for a candidate, newest first"""
+    emails = db.query(EmailOutbox).filter(EmailOutbox.candidate_id == candidate_id).order_by(EmailOutbox.id.desc()).all()
+    return [
+        {
+            "id": email.id,
+            "kind": email.kind,
+            "to_email": email.to_email,
+            "jd_id": email.jd_id,
+            "status": email.status,
+            "attempts": email.attempts,
+            "last_error": email.last_error,
+            "created_at": email.created_at,
+            "next_attempt_at": email.next_attempt_at if email.status == "pending" else None,
+            "sent_at": email.sent_at
+        }
+        for email in emails
+    ]
+
+# Global instance
+domain_limiter = DomainRateLimiter()
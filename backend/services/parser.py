@@ -4,6 +4,7 @@ import re
 import json
 from typing import Dict, List, Optional
 import spacy
+from core.metrics import stage_timer
 
 # Load spaCy model for NLP processing
 try:
@@ -23,6 +24,7 @@ COMMON_SKILLS = {
     "other": ["agile", "scrum", "devops", "machine learning", "artificial intelligence", "blockchain"]
 }
 
+@stage_timer("pdf_extraction")
 def extract_text_from_pdf(file_path: str) -> str:
     """Extract text from PDF file"""
     try:
@@ -36,6 +38,7 @@ def extract_text_from_pdf(file_path: str) -> str:
         print(f"Error extracting PDF: {e}")
         return ""
 
+@stage_timer("docx_extraction")
 def extract_text_from_docx(file_path: str) -> str:
     """Extract text from DOCX file"""
     try:
@@ -92,7 +95,8 @@ def extract_name(text: str) -> Optional[str]:
     
     # If spaCy is available, try NER
     if nlp:
-        doc = nlp(text[:1000])  # Process first 1000 chars for performance
+        with stage_timer("spacy"):
+            doc = nlp(text[:1000])  # Process first 1000 chars for performance
         for ent in doc.ents:
             if ent.label_ == "PERSON" and len(ent.text.split()) >= 2:
                 return ent.text.title()
@@ -167,13 +171,15 @@ def extract_skills_from_text(text: str) -> List[str]:
     # Remove duplicates and return
     return list(set(found_skills))
 
+@stage_timer("skill_extraction")
 def extract_skills_with_nlp(text: str) -> List[str]:
     """Extract skills using NLP if spaCy is available"""
     if not nlp:
         return extract_skills_from_text(text)
     
     # Process text with spaCy
-    doc = nlp(text)
+    with stage_timer("spacy"):
+        doc = nlp(text)
     
     # Extract entities and noun phrases that might be skills
     potential_skills = []
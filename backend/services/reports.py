@@ -0,0 +1,187 @@
+from typing import Dict
+import math
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from core.models import Candidate, JD, MatchResult
+
+# Same buckets as the per-JD dashboard metrics
+EXPERIENCE_BINS = [-np.inf, 2, 5, 10, np.inf]
+EXPERIENCE_LABELS = ["0-2", "2-5", "5-10", "10+"]
+EXPERIENCE_COLUMNS = EXPERIENCE_LABELS + ["unknown"]
+
+# Weights used by calculate_actual_diversity_score
+DIVERSITY_WEIGHTS = {"gender": 0.4, "experience": 0.35, "education": 0.25}
+
+ORG_KEY = "organization"
+
+def load_report_frame(db: Session) -> pd.DataFrame:
+    """Load match/candidate attributes for every active JD into one columnar frame"""
+    rows = db.execute(
+        select(
+            MatchResult.jd_id,
+            JD.title.label("jd_title"),
+            MatchResult.overall_score,
+            Candidate.gender,
+            Candidate.experience_years,
+            Candidate.education
+        )
+        .join(Candidate, MatchResult.candidate_id == Candidate.id)
+        .join(JD, MatchResult.jd_id == JD.id)
+        .where(JD.is_active == True, MatchResult.overall_score.isnot(None))
+    ).all()
+
+    frame = pd.DataFrame(rows, columns=["jd_id", "jd_title", "overall_score", "gender", "experience_years", "education"])
+    frame["experience_years"] = pd.to_numeric(frame["experience_years"], errors="coerce")
+    return frame
+
+def calculate_actual_diversity_score(diversity_metrics: dict) -> float:
+    """Calculate diversity score based on actual distribution data"""
+    if not diversity_metrics:
+        return 75.0
+    
+    # Calculate gender diversity (Shannon entropy)
+    gender_dist = diversity_metrics.get("gender_distribution", {})
+    gender_entropy = 0
+    if gender_dist:
+        for percentage in gender_dist.values():
+            if percentage > 0:
+                p = percentage / 100.0  # Convert percentage to probability
+                gender_entropy += -p * math.log2(p)
+    
+    # Calculate experience diversity
+    exp_dist = diversity_metrics.get("experience_distribution", {})
+    exp_entropy = 0
+    if exp_dist:
+        for percentage in exp_dist.values():
+            if percentage > 0:
+                p = percentage / 100.0
+                exp_entropy += -p * math.log2(p)
+    
+    # Calculate education diversity
+    edu_dist = diversity_metrics.get("education_distribution", {})
+    edu_entropy = 0
+    if edu_dist:
+        for percentage in edu_dist.values():
+            if percentage > 0:
+                p = percentage / 100.0
+                edu_entropy += -p * math.log2(p)
+    
+    # Normalize entropies to 0-100 scale
+    max_gender_entropy = math.log2(len(gender_dist)) if gender_dist else 1
+    max_exp_entropy = math.log2(len(exp_dist)) if exp_dist else 1
+    max_edu_entropy = math.log2(len(edu_dist)) if edu_dist else 1
+    
+    gender_score = (gender_entropy / max_gender_entropy * 100) if max_gender_entropy > 0 else 0
+    exp_score = (exp_entropy / max_exp_entropy * 100) if max_exp_entropy > 0 else 0
+    edu_score = (edu_entropy / max_edu_entropy * 100) if max_edu_entropy > 0 else 0
+    
+    # Weighted average (gender 40%, experience 35%, education 25%)
+    diversity_score = (gender_score * 0.4 + exp_score * 0.35 + edu_score * 0.25)
+    
+    return round(diversity_score, 1)
+
+def _percentages(counts: pd.DataFrame, totals: pd.Series) -> pd.DataFrame:
+    return (counts.div(totals, axis=0) * 100).round(1)
+
+def _normalized_entropy(percentages: pd.DataFrame, present: pd.DataFrame) -> pd.Series:
+    """Shannon entropy of each row's distribution scaled to 0-100 (as in calculate_actual_diversity_score)"""
+    p = percentages.to_numpy(dtype=float) / 100.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(p > 0, -p * np.log2(p), 0.0)
+    entropy = terms.sum(axis=1)
+
+    categories = present.to_numpy().sum(axis=1)
+    max_entropy = np.log2(np.maximum(categories, 1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(max_entropy > 0, entropy / max_entropy * 100, 0.0)
+    return pd.Series(scores, index=percentages.index)
+
+def _grouped_counts(frame: pd.DataFrame, column: str) -> pd.DataFrame:
+    return frame.groupby(["jd_id", column], dropna=False).size().unstack(fill_value=0)
+
+def _label(value):
+    # Missing attributes are reported under None, like the per-JD metrics
+    return None if pd.isna(value) else value
+
+def compute_report(frame: pd.DataFrame) -> Dict:
+    """Distributions, diversity scores and bias alerts for every JD in one pass over the frame"""
+    if frame.empty:
+        return {"jds": [], ORG_KEY: None}
+
+    # Treat the whole organization as one more group alongside the JDs
+    org = frame.assign(jd_id=ORG_KEY, jd_title="All active job descriptions")
+    frame = pd.concat([frame.assign(jd_id=frame["jd_id"].astype(object)), org], ignore_index=True)
+
+    groups = frame.groupby("jd_id", sort=False)
+    titles = groups["jd_title"].first()
+    totals = groups.size()
+    average_scores = groups["overall_score"].mean().round(2)
+
+    gender_counts = _grouped_counts(frame, "gender").reindex(totals.index)
+    education_counts = _grouped_counts(frame, "education").reindex(totals.index)
+
+    experience_bucket = pd.cut(
+        frame["experience_years"], bins=EXPERIENCE_BINS, labels=EXPERIENCE_LABELS, right=False
+    ).astype(object).fillna("unknown")
+    experience_counts = (
+        pd.crosstab(frame["jd_id"], experience_bucket)
+        .reindex(index=totals.index, columns=EXPERIENCE_COLUMNS, fill_value=0)
+    )
+
+    gender_pct = _percentages(gender_counts, totals)
+    education_pct = _percentages(education_counts, totals)
+    experience_pct = _percentages(experience_counts, totals)
+
+    # Experience keeps empty buckets (as the per-JD metrics do), the others only observed values
+    diversity_scores = (
+        _normalized_entropy(gender_pct, gender_counts > 0) * DIVERSITY_WEIGHTS["gender"]
+        + _normalized_entropy(experience_pct, experience_pct.notna()) * DIVERSITY_WEIGHTS["experience"]
+        + _normalized_entropy(education_pct, education_counts > 0) * DIVERSITY_WEIGHTS["education"]
+    ).round(1)
+
+    # Bias checks mirror detect_bias_in_candidates
+    low_gender = (gender_pct < 20) & (gender_counts > 0) & (totals.to_numpy()[:, None] > 5)
+    senior_counts = (frame["experience_years"] > 15).groupby(frame["jd_id"], sort=False).sum().reindex(totals.index)
+    senior_bias = senior_counts > totals * 0.8
+
+    reports = {}
+    for jd_id in totals.index:
+        alerts = [
+            {
+                "type": "gender",
+                "description": f"Low representation of {_label(gender)} candidates ({gender_pct.at[jd_id, gender]:.1f}%)",
+                "severity": "medium" if gender_pct.at[jd_id, gender] < 10 else "low"
+            }
+            for gender in gender_pct.columns[low_gender.loc[jd_id].to_numpy()]
+        ]
+        if senior_bias[jd_id]:
+            alerts.append({
+                "type": "experience",
+                "description": f"High concentration of senior candidates ({int(senior_counts[jd_id])}/{int(totals[jd_id])})",
+                "severity": "medium"
+            })
+
+        reports[jd_id] = {
+            "jd_id": None if jd_id == ORG_KEY else int(jd_id),
+            "jd_title": titles[jd_id],
+            "total_candidates": int(totals[jd_id]),
+            "average_score": float(average_scores[jd_id]),
+            "gender_distribution": _row_dict(gender_pct, gender_counts, jd_id),
+            "experience_distribution": {k: float(v) for k, v in experience_pct.loc[jd_id].items()},
+            "education_distribution": _row_dict(education_pct, education_counts, jd_id),
+            "diversity_score": float(diversity_scores[jd_id]),
+            "bias_alerts": alerts
+        }
+
+    organization = reports.pop(ORG_KEY)
+    return {"jds": list(reports.values()), ORG_KEY: organization}
+
+def _row_dict(percentages: pd.DataFrame, counts: pd.DataFrame, jd_id) -> Dict:
+    present = counts.loc[jd_id] > 0
+    return {_label(k): float(v) for k, v in percentages.loc[jd_id][present].items()}
+
+def build_org_report(db: Session) -> Dict:
+    """Org-wide diversity and bias report across all active JDs"""
+    return compute_report(load_report_frame(db))
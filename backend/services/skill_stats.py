@@ -0,0 +1,150 @@
+from collections import Counter
+from typing import Iterable, List, Optional
+from sqlalchemy import select, update, func
+from sqlalchemy.orm import Session
+from core.models import JD, JDState, MatchResult, SkillCounter
+from core.versions import bump_data_version
+
+def normalize_skill(skill: str) -> str:
+    return (skill or "").lower().strip()
+
+class SkillCounterBatch:
+    """Accumulates skill counter changes for one JD and applies them in one go"""
+
+    def __init__(self, jd_id: int):
+        self.jd_id = jd_id
+        self.matches = 0
+        self.matched = Counter()
+        self.missing = Counter()
+
+    def add(self, matched_skills: Iterable[str], missing_skills: Iterable[str], sign: int = 1) -> None:
+        """Count one match result (or remove it again with sign=-1)"""
+        self.matches += sign
+        for skill in {normalize_skill(s) for s in matched_skills or []}:
+            self.matched[skill] += sign
+        for skill in {normalize_skill(s) for s in missing_skills or []}:
+            self.missing[skill] += sign
+
+    def apply(self, db: Session) -> None:
+        """Add the accumulated deltas to the stored counters; runs inside the caller's transaction"""
+        # Make pending JDState rows (e.g. from bump_data_version) visible to the updates
+        db.flush()
+
+        for skill in (set(self.matched) | set(self.missing)) - {""}:
+            matched, missing = self.matched[skill], self.missing[skill]
+            if not matched and not missing:
+                continue
+            result = db.execute(
+                update(SkillCounter)
+                .where(SkillCounter.jd_id == self.jd_id, SkillCounter.skill == skill)
+                .values(
+                    matched_count=SkillCounter.matched_count + matched,
+                    missing_count=SkillCounter.missing_count + missing
+                )
+            )
+            if result.rowcount == 0:
+                db.add(SkillCounter(jd_id=self.jd_id, skill=skill, matched_count=matched, missing_count=missing))
+
+        if self.matches:
+            result = db.execute(
+                update(JDState)
+                .where(JDState.jd_id == self.jd_id)
+                .values(match_count=JDState.match_count + self.matches)
+            )
+            if result.rowcount == 0:
+                db.add(JDState(jd_id=self.jd_id, data_version=0, stats_version=0, match_count=self.matches))
+
+        db.flush()
+
+def record_match(db: Session, jd_id: int, matched_skills: Iterable[str], missing_skills: Iterable[str]) -> None:
+    """Count a newly written match result into the skill counters"""
+    batch = SkillCounterBatch(jd_id)
+    batch.add(matched_skills, missing_skills)
+    batch.apply(db)
+
+def get_skill_heatmap(db: Session, jd_id: Optional[int] = None, limit: int = 20) -> List[dict]:
+    """Demand, supply and gap per required skill, read from the maintained counters
+
+    demand: share of matches whose JD requires the skill
+    supply: share of matches where the candidate has the skill
+    gap:    demand - supply
+    """
+    jd_query = db.query(JD.id, JD.required_skills)
+    if jd_id:
+        jd_query = jd_query.filter(JD.id == jd_id)
+    else:
+        jd_query = jd_query.filter(JD.is_active == True)
+    jds = jd_query.all()
+    jd_ids = [jd.id for jd in jds]
+    if not jd_ids:
+        return []
+
+    match_counts = dict(
+        db.query(JDState.jd_id, JDState.match_count).filter(JDState.jd_id.in_(jd_ids)).all()
+    )
+    total_matches = sum(count or 0 for count in match_counts.values())
+    if not total_matches:
+        return []
+
+    demand = Counter()
+    for jd in jds:
+        for skill in {normalize_skill(s) for s in jd.required_skills or []} - {""}:
+            demand[skill] += match_counts.get(jd.id) or 0
+
+    supply = dict(
+        db.query(SkillCounter.skill, func.sum(SkillCounter.matched_count))
+        .filter(SkillCounter.jd_id.in_(jd_ids))
+        .group_by(SkillCounter.skill)
+        .all()
+    )
+
+    skills_data = []
+    for skill, required in demand.items():
+        skill_demand = required / total_matches
+        skill_supply = min((supply.get(skill) or 0) / total_matches, skill_demand)
+        skills_data.append({
+            "skill": skill,
+            "demand": round(skill_demand, 2),
+            "supply": round(skill_supply, 2),
+            "gap": round(skill_demand - skill_supply, 2)
+        })
+
+    skills_data.sort(key=lambda s: (s["demand"], s["gap"]), reverse=True)
+    return skills_data[:limit]
+
+def rebuild_skill_counters(db: Session, chunk_size: int = 1000) -> int:
+    """Recompute every skill counter from the stored match results (for backfills)"""
+    db.query(SkillCounter).delete(synchronize_session=False)
+    db.query(JDState).update({JDState.match_count: 0}, synchronize_session=False)
+
+    batches = {}
+    rows = db.execute(
+        select(MatchResult.jd_id, MatchResult.matched_skills, MatchResult.missing_skills)
+        .where(MatchResult.jd_id.isnot(None))
+        .execution_options(yield_per=chunk_size)
+    )
+    for row in rows:
+        if row.jd_id not in batches:
+            batches[row.jd_id] = SkillCounterBatch(row.jd_id)
+        batches[row.jd_id].add(row.matched_skills, row.missing_skills)
+
+    for batch in batches.values():
+        batch.apply(db)
+
+    # Cached heatmaps were built from the old counters
+    bump_data_version(db, list(batches))
+    db.commit()
+    return sum(batch.matches for batch in batches.values())
+
+def backfill_skill_counters_if_empty(db: Session) -> Optional[int]:
+    """Build the counters once for match results stored before the counters existed.
+
+    Returns the number of matches counted, or None if the counters were already in use.
+    """
+    if db.query(SkillCounter.jd_id).first() is not None:
+        return None
+    if db.query(JDState.jd_id).filter(JDState.match_count > 0).first() is not None:
+        return None
+    if db.query(MatchResult.id).filter(MatchResult.jd_id.isnot(None)).first() is None:
+        return None
+    return rebuild_skill_counters(db)
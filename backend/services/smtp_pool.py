@@ -0,0 +1,176 @@
+import os
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from email.message import Message
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from dotenv import load_dotenv
+from core.metrics import stage_timer
+
+load_dotenv()
+
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "4"))
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+SMTP_IDLE_TIMEOUT_SECONDS = float(os.getenv("SMTP_IDLE_TIMEOUT_SECONDS", "60"))
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "30"))
+SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "true").lower()  # true, auto (if advertised), false
+
+def _is_connection_error(error: Exception) -> bool:
+    # SMTP protocol errors subclass OSError too, but a server reply means the link works
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+class PooledConnection:
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+    def close(self) -> None:
+        try:
+            self.smtp.quit()
+        except Exception:
+            try:
+                self.smtp.close()
+            except Exception:
+                pass
+
+class SMTPConnectionPool:
+    """Reuses authenticated SMTP connections across messages"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: str = SMTP_USE_TLS,
+        max_connections: int = SMTP_POOL_SIZE,
+        max_messages_per_connection: int = SMTP_MAX_MESSAGES_PER_CONNECTION,
+        idle_timeout: float = SMTP_IDLE_TIMEOUT_SECONDS,
+        timeout: float = SMTP_TIMEOUT_SECONDS
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.max_connections = max_connections
+        self.max_messages_per_connection = max_messages_per_connection
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+
+        self._idle: List[PooledConnection] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self.connections_opened = 0
+        self.messages_sent = 0
+        self.in_use = 0
+
+    def _connect(self) -> PooledConnection:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.ehlo()
+            if self.use_tls == "true" or (self.use_tls == "auto" and smtp.has_extn("starttls")):
+                smtp.starttls()
+                smtp.ehlo()
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        with self._lock:
+            self.connections_opened += 1
+        return PooledConnection(smtp)
+
+    def _checkout(self) -> PooledConnection:
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                connection = self._idle.pop()
+                if now - connection.last_used < self.idle_timeout:
+                    return connection
+                # Servers drop idle sessions; close ours rather than finding out mid-send
+                connection.close()
+        return self._connect()
+
+    def _checkin(self, connection: PooledConnection) -> None:
+        connection.last_used = time.monotonic()
+        if connection.messages_sent >= self.max_messages_per_connection:
+            connection.close()
+            return
+        with self._lock:
+            self._idle.append(connection)
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """Borrow a connection; it is returned to the pool unless the block raised"""
+        self._slots.acquire()
+        with self._lock:
+            self.in_use += 1
+        try:
+            connection = self._checkout()
+            try:
+                yield connection
+            except Exception:
+                connection.close()
+                raise
+            self._checkin(connection)
+        finally:
+            with self._lock:
+                self.in_use -= 1
+            self._slots.release()
+
+    def send_message(self, msg: Message, from_addr: Optional[str] = None, to_addrs: Union[str, List[str], None] = None) -> None:
+        """Send a message over a pooled connection, reconnecting once if the connection went stale"""
+        for attempt in range(2):
+            try:
+                with self.connection() as connection, stage_timer("smtp_send"):
+                    connection.smtp.send_message(msg, from_addr, to_addrs)
+                    connection.messages_sent += 1
+                with self._lock:
+                    self.messages_sent += 1
+                return
+            except Exception as e:
+                if attempt or not _is_connection_error(e):
+                    raise
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    def stats(self) -> Dict:
+        return {
+            "host": self.host,
+            "port": self.port,
+            "max_connections": self.max_connections,
+            "in_use": self.in_use,
+            "idle": len(self._idle),
+            "connections_opened": self.connections_opened,
+            "messages_sent": self.messages_sent
+        }
+
+_pools: Dict[Tuple, SMTPConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_smtp_pool(host: str, port: int, username: Optional[str] = None, password: Optional[str] = None) -> SMTPConnectionPool:
+    """Get the shared pool for a server and set of credentials"""
+    key = (host, port, username, password)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = SMTPConnectionPool(host, port, username, password)
+        return _pools[key]
+
+def pool_stats() -> List[Dict]:
+    with _pools_lock:
+        return [pool.stats() for pool in _pools.values()]
+
+def close_all_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
@@ -0,0 +1,76 @@
+"""Test setup: the app reads its settings from the environment at import time,
+so a scratch database and directories are configured before anything is imported.
+"""
+import os
+import socket
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEST_DIR = tempfile.mkdtemp(prefix="talent-matcher-tests-")
+ADMIN_TOKEN = "test-admin-token"
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}",
+    "BLOB_DIR": os.path.join(TEST_DIR, "blobs"),
+    "PROFILE_DIR": os.path.join(TEST_DIR, "profiles"),
+    "TRACE_FILE": os.path.join(TEST_DIR, "traces.jsonl"),
+    "ADMIN_TOKEN": ADMIN_TOKEN,
+    "METRICS_ENABLED": "true",
+    "TRACING_ENABLED": "false",
+    "RESPONSE_CACHE_BACKEND": "local",
+    "AI_MODEL_BACKEND": "fake",
+    "AI_CACHE_DB_PATH": "",
+    "OUTBOX_DRAIN_IN_APP": "false",
+    "SMTP_SERVER": "127.0.0.1",
+    "SMTP_USE_TLS": "false",
+})
+sys.path.insert(0, BACKEND_DIR)
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.db import Base, SessionLocal, engine
+from core.cache import response_cache
+
+@pytest.fixture(scope="session")
+def app():
+    from main import app
+    return app
+
+@pytest.fixture
+def client(app):
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture
+def smtp_sink():
+    """A local SMTP sink (scripts/smtp_sink.py) on a free port; yields (port, stats)"""
+    from scripts.smtp_sink import start_in_thread
+    from services.smtp_pool import close_all_pools
+
+    port, stats, stop = start_in_thread()
+    try:
+        yield port, stats
+    finally:
+        close_all_pools()
+        stop()
+
+@pytest.fixture
+def closed_port():
+    """A local port nothing is listening on"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture
+def db(app):
+    """A session on freshly created tables"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    response_cache.clear()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import api.admin
+import core.profiling
+from conftest import ADMIN_TOKEN
+from core.profiling import ProfileStore, ProfilingMiddleware, ProfilingSettings
+
+ADMIN = {"X-Admin-Token": ADMIN_TOKEN}
+
+@pytest.mark.parametrize("method, path", [
+    ("get", "/admin/profiling"),
+    ("post", "/admin/profiling"),
+    ("get", "/admin/profiles"),
+    ("get", "/admin/profiles/anything.prof"),
+])
+def test_admin_endpoints_need_the_token(client, method, path):
+    assert getattr(client, method)(path).status_code == 403
+    assert getattr(client, method)(path, headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+def test_admin_endpoints_are_hidden_without_configured_token(client, monkeypatch):
+    monkeypatch.setattr(api.admin, "ADMIN_TOKEN", "")
+    monkeypatch.setattr(core.profiling, "ADMIN_TOKEN", "")
+
+    assert client.get("/admin/profiling").status_code == 404
+    # An empty token never matches an empty setting
+    assert client.get("/admin/profiling", headers={"X-Admin-Token": ""}).status_code == 404
+
+def test_toggle_validates_and_updates(client):
+    assert client.get("/admin/profiling", headers=ADMIN).json()["enabled"] is False
+    assert client.post("/admin/profiling", headers=ADMIN, json={"enabled": True, "mode": "bogus"}).status_code == 400
+    assert client.post("/admin/profiling", headers=ADMIN, json={"enabled": True, "sample_rate": 2}).status_code == 400
+
+    response = client.post("/admin/profiling", headers=ADMIN, json={"enabled": False, "sample_rate": 0.5})
+    assert response.status_code == 200
+    assert response.json()["sample_rate"] == 0.5
+
+def test_profile_header_needs_the_token(client, db):
+    response = client.get("/candidate/statuses", headers={"X-Profile": "cprofile"})
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+
+    response = client.get("/candidate/statuses", headers={"X-Profile": "cprofile", "X-Admin-Token": "wrong"})
+    assert "x-profile-id" not in response.headers
+
+def test_profiled_request_can_be_downloaded(client, db):
+    response = client.get("/candidate/statuses", headers={"X-Profile": "cprofile", **ADMIN})
+    assert response.status_code == 200
+    name = response.headers["x-profile-id"]
+
+    listed = client.get("/admin/profiles", headers=ADMIN).json()["profiles"]
+    assert name in [profile["name"] for profile in listed]
+
+    summary = client.get(f"/admin/profiles/{name}", headers=ADMIN, params={"format": "text"})
+    assert summary.status_code == 200
+    assert "cumulative" in summary.text
+
+    assert client.get(f"/admin/profiles/{name}").status_code == 403
+    assert client.get("/admin/profiles/..%2Fconftest.py", headers=ADMIN).status_code == 404
+
+def test_default_mode_sees_sync_endpoints(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.profiling, "profiling_settings", ProfilingSettings())
+    monkeypatch.setattr(core.profiling, "profile_store", ProfileStore(tmp_path))
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/report")
+    def slow_sync_report():
+        # Sync endpoints run in FastAPI's threadpool, off the event-loop thread
+        time.sleep(0.1)
+        return {}
+
+    response = TestClient(app).get("/report", headers={"X-Profile": "default", **ADMIN})
+    assert response.headers["x-profile-id"].endswith(".folded")
+    stacks = (tmp_path / response.headers["x-profile-id"]).read_text()
+    assert "slow_sync_report" in stacks
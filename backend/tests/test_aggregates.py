@@ -0,0 +1,140 @@
+"""The single-pass aggregates must give the same results as the separate passes they replaced"""
+import random
+
+import pytest
+from sqlalchemy import desc
+
+from api.dashboard import CandidateAggregates, _build_insights, _get_candidates_data, candidate_row
+from core.models import JD, Candidate, MatchResult
+
+def _old_bias_alerts(candidates: list) -> list:
+    alerts = []
+    if not candidates:
+        return alerts
+    gender_counts = {}
+    for candidate in candidates:
+        gender = candidate.get("gender", "unknown")
+        gender_counts[gender] = gender_counts.get(gender, 0) + 1
+    total_candidates = len(candidates)
+    for gender, count in gender_counts.items():
+        percentage = (count / total_candidates) * 100
+        if percentage < 20 and total_candidates > 5:
+            alerts.append({
+                "type": "gender",
+                "description": f"Low representation of {gender} candidates ({percentage:.1f}%)",
+                "severity": "medium" if percentage < 10 else "low"
+            })
+    high_exp_count = sum(1 for c in candidates if c.get("experience_years") is not None and c.get("experience_years") > 15)
+    if high_exp_count > total_candidates * 0.8:
+        alerts.append({
+            "type": "experience",
+            "description": f"High concentration of senior candidates ({high_exp_count}/{total_candidates})",
+            "severity": "medium"
+        })
+    return alerts
+
+def _old_diversity_metrics(candidates: list) -> dict:
+    if not candidates:
+        return {}
+    total_candidates = len(candidates)
+    gender_counts, education_counts = {}, {}
+    experience_ranges = {"0-2": 0, "2-5": 0, "5-10": 0, "10+": 0, "unknown": 0}
+    for candidate in candidates:
+        gender = candidate.get("gender", "unknown")
+        gender_counts[gender] = gender_counts.get(gender, 0) + 1
+        education = candidate.get("education", "unknown")
+        education_counts[education] = education_counts.get(education, 0) + 1
+        exp = candidate.get("experience_years")
+        if exp is None:
+            experience_ranges["unknown"] += 1
+        elif exp < 2:
+            experience_ranges["0-2"] += 1
+        elif exp < 5:
+            experience_ranges["2-5"] += 1
+        elif exp < 10:
+            experience_ranges["5-10"] += 1
+        else:
+            experience_ranges["10+"] += 1
+    return {
+        "gender_distribution": {g: round((c / total_candidates) * 100, 1) for g, c in gender_counts.items()},
+        "experience_distribution": {r: round((c / total_candidates) * 100, 1) for r, c in experience_ranges.items()},
+        "education_distribution": {e: round((c / total_candidates) * 100, 1) for e, c in education_counts.items()},
+        "total_candidates": total_candidates
+    }
+
+def _old_top_counts(candidates: list, key: str) -> list:
+    counts = {}
+    for candidate in candidates:
+        for skill in candidate.get(key, []):
+            counts[skill] = counts.get(skill, 0) + 1
+    sorted_counts = sorted(counts.items(), key=lambda x: x[1], reverse=True)[:10]
+    return [{"skill": skill, "count": count} for skill, count in sorted_counts]
+
+SKILLS = ["python", "sql", "aws", "docker", "react", "java", "go", "spark", "airflow", "kafka", "rust", "c++"]
+
+def _rows(rng: random.Random, size: int) -> list:
+    return [
+        {
+            "overall_score": round(rng.random(), 3),
+            "is_shortlisted": rng.random() < 0.3,
+            "gender": rng.choice(["male", "male", "female", "non-binary", None]),
+            "experience_years": rng.choice([None, 0, 1, 2, 3.5, 5, 7, 10, 14, 16, 25]),
+            "education": rng.choice(["Bachelor's", "Master's", "PhD", None]),
+            "matched_skills": rng.sample(SKILLS, rng.randint(0, 5)),
+            "missing_skills": rng.sample(SKILLS, rng.randint(0, 4))
+        }
+        for _ in range(size)
+    ]
+
+@pytest.mark.parametrize("seed, size", [(1, 0), (2, 1), (3, 6), (4, 40), (5, 250)])
+def test_single_pass_matches_the_separate_passes(seed, size):
+    rows = _rows(random.Random(seed), size)
+    # Generators are consumed once, as the streamed rows are
+    aggregates = CandidateAggregates.from_rows(iter(rows))
+
+    assert aggregates.total == len(rows)
+    assert aggregates.bias_alerts() == _old_bias_alerts(rows)
+    assert aggregates.diversity_metrics() == _old_diversity_metrics(rows)
+    assert aggregates.top_skills() == _old_top_counts(rows, "matched_skills")
+    assert aggregates.common_skill_gaps() == _old_top_counts(rows, "missing_skills")
+    assert aggregates.shortlisted == len([row for row in rows if row.get("is_shortlisted", False)])
+    expected_average = round(sum(row["overall_score"] for row in rows) / len(rows), 2) if rows else 0
+    assert aggregates.average_score() == expected_average
+
+def test_senior_pool_alert():
+    rows = [{"overall_score": 0.5, "experience_years": 20}] * 9 + [{"overall_score": 0.5, "experience_years": 3}]
+    assert CandidateAggregates.from_rows(rows).bias_alerts() == _old_bias_alerts(rows)
+    assert CandidateAggregates.from_rows(rows).bias_alerts()[-1]["type"] == "experience"
+
+def test_projected_rows_match_the_orm_rows(db):
+    rng = random.Random(9)
+    jds = [JD(title="Backend"), JD(title="Frontend")]
+    db.add_all(jds)
+    db.flush()
+    for i, row in enumerate(_rows(rng, 12)):
+        candidate = Candidate(
+            name=f"Candidate {i}", email=f"c{i}@example.com", resume_path="resume.pdf",
+            gender=row["gender"], experience_years=row["experience_years"], education=row["education"],
+            is_shortlisted=row["is_shortlisted"]
+        )
+        db.add(candidate)
+        db.flush()
+        db.add(MatchResult(
+            jd_id=jds[i % 2].id, candidate_id=candidate.id, overall_score=row["overall_score"],
+            skills_match_score=0.5, experience_match_score=0.5,
+            matched_skills=row["matched_skills"], missing_skills=row["missing_skills"], skill_gaps={}
+        ))
+    db.commit()
+
+    for jd_id in (None, jds[0].id):
+        query = db.query(MatchResult, Candidate, JD).join(Candidate, MatchResult.candidate_id == Candidate.id).join(JD, MatchResult.jd_id == JD.id)
+        if jd_id:
+            query = query.filter(MatchResult.jd_id == jd_id)
+        old_rows = [candidate_row(*result) for result in query.order_by(desc(MatchResult.overall_score))]
+        rows = _get_candidates_data(jd_id, db)
+        assert rows == old_rows
+
+        insights = _build_insights(rows, jd_id, db)
+        assert insights["bias_alerts"] == _old_bias_alerts(old_rows)
+        assert insights["diversity_metrics"] == _old_diversity_metrics(old_rows)
+        assert insights["top_skills"] == _old_top_counts(old_rows, "matched_skills")
@@ -0,0 +1,13 @@
+from services.ai_cache import AIResponseCache
+
+def test_persistent_tier_serves_answers_after_restart(tmp_path):
+    path = str(tmp_path / "ai.db")
+    cache = AIResponseCache(db_path=path)
+    key = cache.make_key("Who are the top candidates?", {"total_candidates": 3}, 7, 2)
+    cache.set(key, "Ada, Grace and Linus", 7, 2)
+
+    restarted = AIResponseCache(db_path=path)
+    assert restarted.get(key) == "Ada, Grace and Linus"
+    assert restarted.get(key + "-other") is None
+    assert restarted.stats()["hits"] == 1
+    assert restarted.stats()["misses"] == 1
@@ -0,0 +1,165 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+import api.ai_assistant
+from api.ai_assistant import ChatRequest, chat_with_ai, stream_chat_with_ai
+from core.db import SessionLocal
+from services.ai_assistant import FakeModel, ai_assistant
+from services.ai_cache import ai_response_cache
+
+class CountingModel(FakeModel):
+    """FakeModel that records how many calls run at once"""
+
+    def __init__(self, delay: float):
+        super().__init__(delay)
+        self.running = 0
+        self.peak = 0
+        self.finished = threading.Event()
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            if stream:
+                return list(super().generate_content(prompt, stream=True))
+            return super().generate_content(prompt)
+        finally:
+            with self._lock:
+                self.running -= 1
+            self.finished.set()
+
+@pytest.fixture
+def slots(monkeypatch):
+    """Two model slots and a clean answer cache"""
+    semaphore = threading.BoundedSemaphore(2)
+    monkeypatch.setattr(api.ai_assistant, "model_slots", semaphore)
+    ai_response_cache.clear()
+    yield semaphore
+    ai_response_cache.clear()
+
+def _slots_in_use(semaphore) -> int:
+    return 2 - semaphore._value
+
+def _events(body: str) -> list:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n") if ": " in line)
+        if "event" in lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+def test_timed_out_call_keeps_its_slot_until_it_returns(client, db, slots, monkeypatch):
+    model = CountingModel(delay=0.5)
+    monkeypatch.setattr(ai_assistant, "model", model)
+    monkeypatch.setattr(api.ai_assistant, "AI_RESPONSE_TIMEOUT_SECONDS", 0.1)
+
+    response = client.post("/ai/chat", json={"message": "Summarize the pool for the hiring manager"})
+    assert response.status_code == 504
+
+    # The abandoned model call is still running and still counts against the limit
+    assert _slots_in_use(slots) == 1
+    assert model.finished.wait(2)
+    time.sleep(0.05)
+    assert _slots_in_use(slots) == 0
+
+def test_concurrent_calls_are_limited_to_the_slots(db, slots, monkeypatch):
+    model = CountingModel(delay=0.1)
+    monkeypatch.setattr(ai_assistant, "model", model)
+
+    async def chat_burst():
+        return await asyncio.gather(*[
+            chat_with_ai(ChatRequest(message=f"Explain candidate pool trend number {i}"), db)
+            for i in range(6)
+        ])
+
+    responses = asyncio.run(chat_burst())
+    assert len(responses) == 6
+    assert all("(offline model)" in response.response for response in responses)
+    assert model.peak == 2
+    assert _slots_in_use(slots) == 0
+
+def test_streamed_answer_matches_non_streamed(client, db, slots, monkeypatch):
+    monkeypatch.setattr(ai_assistant, "model", FakeModel(delay=0))
+    message = "Summarize the interview pipeline for this week"
+
+    answer = client.post("/ai/chat", json={"message": message}).json()["response"]
+    ai_response_cache.clear()
+    response = client.post("/ai/chat/stream", json={"message": message})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    tokens = [data["text"] for event, data in events if event == "token"]
+    assert len(tokens) > 1
+    assert "".join(tokens) == answer
+    assert events[-1][0] == "done"
+    assert _slots_in_use(slots) == 0
+
+def test_streamed_timeout_releases_slot_when_model_stops(client, db, slots, monkeypatch):
+    monkeypatch.setattr(ai_assistant, "model", FakeModel(delay=0.2))
+    monkeypatch.setattr(api.ai_assistant, "AI_RESPONSE_TIMEOUT_SECONDS", 0.3)
+
+    response = client.post("/ai/chat/stream", json={"message": "Describe the shortlisted candidates in detail"})
+    events = _events(response.text)
+    assert events[-1] == ("error", {"detail": "AI Assistant timed out"})
+
+    # The model thread notices the cancellation at its next chunk and gives the slot back
+    deadline = time.time() + 2
+    while _slots_in_use(slots) and time.time() < deadline:
+        time.sleep(0.02)
+    assert _slots_in_use(slots) == 0
+
+class BlockingModel(FakeModel):
+    """FakeModel whose calls wait until released"""
+
+    def __init__(self):
+        super().__init__(delay=0)
+        self.release = threading.Event()
+        self.started = threading.Semaphore(0)
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        self.started.release()
+        assert self.release.wait(5)
+        return super().generate_content(prompt, stream)
+
+def test_cached_answer_does_not_wait_for_a_model_slot(db, slots, monkeypatch):
+    model = BlockingModel()
+    monkeypatch.setattr(ai_assistant, "model", model)
+    monkeypatch.setattr(api.ai_assistant, "AI_RESPONSE_TIMEOUT_SECONDS", 0.5)
+    message = "Summarize the pool for the hiring manager"
+
+    async def scenario():
+        model.release.set()
+        answer = (await chat_with_ai(ChatRequest(message=message), SessionLocal())).response
+        model.release.clear()
+        model.started = threading.Semaphore(0)
+
+        # Every slot is taken by a model call that cannot finish yet
+        blocked = [
+            asyncio.ensure_future(chat_with_ai(ChatRequest(message=f"Explain trend number {i}"), SessionLocal()))
+            for i in range(2)
+        ]
+        for _ in blocked:
+            await asyncio.get_running_loop().run_in_executor(None, model.started.acquire)
+        assert _slots_in_use(slots) == 2
+
+        try:
+            cached = await asyncio.wait_for(chat_with_ai(ChatRequest(message=message), SessionLocal()), timeout=0.2)
+            streamed = await stream_chat_with_ai(ChatRequest(message=message), SessionLocal())
+            body = "".join([chunk async for chunk in streamed.body_iterator])
+        finally:
+            model.release.set()
+            await asyncio.gather(*blocked)
+        return answer, cached.response, body
+
+    answer, cached, body = asyncio.run(scenario())
+    assert cached == answer
+    events = _events(body)
+    assert events[0] == ("token", {"text": answer})
+    assert [event for event, _ in events] == ["token", "done"]
+    assert _slots_in_use(slots) == 0
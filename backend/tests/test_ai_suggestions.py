@@ -0,0 +1,38 @@
+import pytest
+
+from core.models import JD, BiasAlert, JDState
+from core.versions import bump_data_version
+from services.ai_assistant import ai_assistant
+
+BIAS_QUESTION = "What do the bias alerts mean and how should I address them?"
+
+@pytest.mark.parametrize("scope", ["jd", "all"])
+def test_suggestions_follow_refreshed_alerts(client, db, scope):
+    jd = JD(title="Backend Engineer")
+    db.add(jd)
+    db.commit()
+    bump_data_version(db, [jd.id])
+    db.commit()
+    params = {"jd_id": jd.id} if scope == "jd" else {}
+
+    assert BIAS_QUESTION not in client.get("/ai/suggestions", params=params).json()["suggestions"]
+
+    # What refresh_stale_stats does after a change: store alerts, then mark the stats fresh
+    # without bumping the data version
+    db.add(BiasAlert(jd_id=jd.id, alert_type="gender", description="Skewed pool", severity="high"))
+    state = db.get(JDState, jd.id)
+    state.stats_version = state.data_version
+    db.commit()
+
+    assert BIAS_QUESTION in client.get("/ai/suggestions", params=params).json()["suggestions"]
+
+DIVERSITY_QUESTION = "How can I improve diversity in my candidate selection?"
+
+@pytest.mark.parametrize("context, suggested", [
+    ({}, True),
+    ({"diversity": {"diversity_score": 35.0}}, True),
+    ({"diversity": {"diversity_score": 50.0}}, False),
+    ({"diversity": {"diversity_score": 82.5}}, False),
+])
+def test_diversity_question_uses_0_to_100_score(context, suggested):
+    assert (DIVERSITY_QUESTION in ai_assistant.get_suggested_questions(context)) is suggested
@@ -0,0 +1,98 @@
+import hashlib
+import io
+import os
+
+import api.resume
+from core.models import JD, Blob, Candidate
+from services.blob_store import BlobStore, blob_store
+
+SAMPLE_RESUME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uploads", "resumes", "aditi resume.pdf")
+
+def _files_under(path: str) -> list:
+    return [os.path.join(root, name) for root, _, names in os.walk(path) for name in names]
+
+def test_same_bytes_are_stored_once(db, tmp_path):
+    store = BlobStore(str(tmp_path))
+    content = b"Python developer with 5 years of experience"
+
+    first, first_new = store.put(db, io.BytesIO(content), "resume.txt")
+    db.commit()
+    second, second_new = store.put(db, io.BytesIO(content), "copy-of-resume.txt")
+    db.commit()
+
+    assert first.id == second.id == hashlib.sha256(content).hexdigest()
+    assert (first_new, second_new) == (True, False)
+    assert db.query(Blob).count() == 1
+    assert _files_under(str(tmp_path)) == [store.path_for(first.id, ".txt")]
+    # The first upload's name is kept
+    assert second.original_filename == "resume.txt"
+
+def test_lost_file_is_restored(db, tmp_path):
+    store = BlobStore(str(tmp_path))
+    blob, _ = store.put(db, io.BytesIO(b"content"), "a.txt")
+    db.commit()
+    os.remove(blob.storage_path)
+
+    restored, new = store.put(db, io.BytesIO(b"content"), "a.txt")
+    assert not new
+    assert open(restored.storage_path, "rb").read() == b"content"
+
+def test_parse_result_is_reused_per_parser(db, tmp_path):
+    store = BlobStore(str(tmp_path))
+    calls = []
+
+    def parse(path):
+        calls.append(path)
+        return {"skills": ["python"]}
+
+    blob, _ = store.put(db, io.BytesIO(b"resume"), "resume.txt")
+    assert store.parsed(db, blob, "resume", parse) == {"skills": ["python"]}
+    db.commit()
+    db.expire_all()
+
+    again, _ = store.put(db, io.BytesIO(b"resume"), "resume.txt")
+    assert store.parsed(db, again, "resume", parse) == {"skills": ["python"]}
+    assert len(calls) == 1
+    assert store.cached_result(db, blob.id, "resume") == {"skills": ["python"]}
+    assert store.cached_result(db, blob.id, "jd") is None
+
+    # Errors are not cached, so a later upload retries
+    store.parsed(db, blob, "jd", lambda path: {"error": "unreadable"})
+    assert store.cached_result(db, blob.id, "jd") is None
+
+def test_repeated_resume_uploads_share_blob_and_parse(client, db, monkeypatch):
+    calls = []
+    real_parse = api.resume.parse_resume
+
+    def counting_parse(path):
+        calls.append(path)
+        return real_parse(path)
+
+    monkeypatch.setattr(api.resume, "parse_resume", counting_parse)
+    jd = JD(title="ML Engineer", description="Python, TensorFlow and AWS", required_skills=["python", "aws"])
+    db.add(jd)
+    db.commit()
+    content = open(SAMPLE_RESUME, "rb").read()
+    blob_id = hashlib.sha256(content).hexdigest()
+
+    # The preview parses the file but stores nothing
+    extracted = client.post("/resume/extract", files={"file": ("aditi.pdf", content, "application/pdf")})
+    assert extracted.status_code == 200
+    assert db.query(Blob).count() == 0
+    assert not os.path.exists(os.path.dirname(blob_store.path_for(blob_id)))
+
+    for i in range(2):
+        uploaded = client.post(
+            "/resume/upload",
+            data={"name": f"Aditi {i}", "jd_id": str(jd.id)},
+            files={"file": (f"aditi-{i}.pdf", content, "application/pdf")}
+        )
+        assert uploaded.status_code == 200, uploaded.text
+
+    # A preview of an uploaded file reuses its stored parse
+    assert client.post("/resume/extract", files={"file": ("aditi.pdf", content, "application/pdf")}).json() == extracted.json()
+
+    assert len(calls) == 2
+    assert db.query(Blob).count() == 1
+    assert {candidate.blob_id for candidate in db.query(Candidate)} == {blob_id}
+    assert _files_under(os.path.dirname(blob_store.path_for(blob_id))) == [blob_store.path_for(blob_id, ".pdf")]
@@ -0,0 +1,54 @@
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from core.models import JD
+from core.responses import GZIP_MINIMUM_SIZE, CompressionMiddleware
+
+GZIP = {"Accept-Encoding": "gzip"}
+LARGE = "candidate," * GZIP_MINIMUM_SIZE
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware)
+
+@app.get("/large", response_class=PlainTextResponse)
+def large():
+    return LARGE
+
+@app.get("/small", response_class=PlainTextResponse)
+def small():
+    return "ok"
+
+@app.get("/streamed")
+def streamed():
+    return StreamingResponse(iter([LARGE, LARGE]), media_type="text/csv")
+
+def _raw(response) -> bytes:
+    # The test client decodes gzip itself; read what went over the wire
+    return b"".join(response.iter_raw())
+
+def test_large_response_is_compressed():
+    with TestClient(app).stream("GET", "/large", headers=GZIP) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(_raw(response)).decode() == LARGE
+
+def test_small_response_is_not_compressed():
+    response = TestClient(app).get("/small", headers=GZIP)
+    assert "content-encoding" not in response.headers
+
+def test_streamed_response_passes_through():
+    with TestClient(app).stream("GET", "/streamed", headers=GZIP) as response:
+        assert "content-encoding" not in response.headers
+        assert _raw(response).decode() == LARGE + LARGE
+
+def test_export_is_not_compressed(client, db):
+    jd = JD(title="Backend Engineer")
+    db.add(jd)
+    db.commit()
+
+    with client.stream("GET", "/dashboard/export", params={"jd_id": jd.id}, headers=GZIP) as response:
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert _raw(response).startswith(b"rank,")
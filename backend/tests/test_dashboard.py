@@ -0,0 +1,124 @@
+import api.candidate
+from api.dashboard import refresh_stale_stats
+from core.cache import response_cache
+from core.models import JD, BiasAlert, Candidate, DiversityMetrics, JDState, MatchResult
+from core.versions import ALL_JDS, bump_data_version, get_data_version, get_stale_jd_ids
+
+def _seed_pool(db, size: int = 8) -> int:
+    """One JD with a pool skewed enough to raise bias alerts; returns the JD id"""
+    jd = JD(title="Backend Engineer", description="Python and SQL", required_skills=["python", "sql"])
+    db.add(jd)
+    db.flush()
+    for i in range(size):
+        candidate = Candidate(
+            name=f"Candidate {i}",
+            email=f"candidate{i}@example.com",
+            resume_path=f"resume{i}.pdf",
+            gender="female" if i == 0 else "male",
+            experience_years=[1, 3, 6, 12][i % 4],
+            education="Master's" if i % 2 else "Bachelor's"
+        )
+        db.add(candidate)
+        db.flush()
+        db.add(MatchResult(
+            jd_id=jd.id,
+            candidate_id=candidate.id,
+            overall_score=0.5 + i / 20,
+            skills_match_score=0.6,
+            experience_match_score=0.7,
+            matched_skills=["python"],
+            missing_skills=["sql"]
+        ))
+    bump_data_version(db, [jd.id])
+    db.commit()
+    return jd.id
+
+def _state(db, jd_id: int) -> JDState:
+    db.expire_all()
+    return db.get(JDState, jd_id)
+
+def test_dashboard_gets_do_not_write(client, db):
+    jd_id = _seed_pool(db)
+    before = (_state(db, jd_id).data_version, _state(db, jd_id).stats_version)
+
+    alerts = client.get("/dashboard/bias-alerts", params={"jd_id": jd_id}).json()
+    metrics = client.get("/dashboard/diversity-metrics", params={"jd_id": jd_id}).json()
+    assert client.get("/dashboard/insights", params={"jd_id": jd_id}).status_code == 200
+
+    # Computed on the fly, but nothing is stored until the refresher runs
+    assert alerts[0]["description"] == "Low representation of female candidates (12.5%)"
+    assert metrics["total_candidates"] == 8
+    assert db.query(BiasAlert).count() == 0
+    assert db.query(DiversityMetrics).count() == 0
+    assert (_state(db, jd_id).data_version, _state(db, jd_id).stats_version) == before
+
+def test_status_change_bumps_versions_and_marks_stats_stale(client, db, monkeypatch):
+    monkeypatch.setattr(api.candidate, "refresh_stale_stats", lambda: None)
+    jd_id = _seed_pool(db)
+    refresh_stale_stats()
+    assert get_stale_jd_ids(db) == []
+    versions = (get_data_version(db, jd_id), get_data_version(db, None))
+
+    candidate_id = db.query(Candidate.id).first()[0]
+    response = client.patch("/candidate/status", json={"candidate_id": candidate_id, "status": "rejected"})
+    assert response.status_code == 200
+
+    db.expire_all()
+    assert (get_data_version(db, jd_id), get_data_version(db, None)) == (versions[0] + 1, versions[1] + 1)
+    assert get_stale_jd_ids(db) == [jd_id]
+
+    # The same status again is not a change
+    client.patch("/candidate/status", json={"candidate_id": candidate_id, "status": "rejected"})
+    db.expire_all()
+    assert get_data_version(db, jd_id) == versions[0] + 1
+
+def test_refresh_stores_stats_that_gets_then_serve(client, db):
+    jd_id = _seed_pool(db)
+    computed_alerts = client.get("/dashboard/bias-alerts", params={"jd_id": jd_id}).json()
+    computed_metrics = client.get("/dashboard/diversity-metrics", params={"jd_id": jd_id}).json()
+
+    refresh_stale_stats()
+
+    state = _state(db, jd_id)
+    assert state.stats_version == state.data_version
+    assert state.total_candidates == 8
+    assert get_stale_jd_ids(db) == []
+    assert [alert.description for alert in db.query(BiasAlert).filter(BiasAlert.jd_id == jd_id)] == [
+        alert["description"] for alert in computed_alerts
+    ]
+    assert db.query(DiversityMetrics).filter(DiversityMetrics.jd_id == jd_id).count() == 1
+    # The all-JDs pseudo row is never refreshed on its own
+    assert db.get(JDState, ALL_JDS).stats_version == 0
+
+    # Fresh stats are read back from the stored rows with the same result
+    response_cache.clear()
+    assert client.get("/dashboard/bias-alerts", params={"jd_id": jd_id}).json() == computed_alerts
+    assert client.get("/dashboard/diversity-metrics", params={"jd_id": jd_id}).json() == computed_metrics
+
+def test_snapshot_etag_answers_304_until_data_changes(client, db):
+    jd_id = _seed_pool(db)
+    version = get_data_version(db, jd_id)
+
+    first = client.get("/dashboard/snapshot", params={"jd_id": jd_id})
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag == f'W/"dashboard-{jd_id}-v{version}"'
+    assert first.json()["version"] == version
+    assert len(first.json()["candidates"]) == 8
+    assert first.json()["insights"]["total_candidates"] == 8
+
+    for if_none_match in (etag, f'W/"other", {etag}', "*"):
+        unchanged = client.get("/dashboard/snapshot", params={"jd_id": jd_id}, headers={"If-None-Match": if_none_match})
+        assert unchanged.status_code == 304
+        assert unchanged.content == b""
+        assert unchanged.headers["etag"] == etag
+
+    # Other scopes have their own tags
+    assert client.get("/dashboard/snapshot", headers={"If-None-Match": etag}).status_code == 200
+
+    bump_data_version(db, [jd_id])
+    db.commit()
+    changed = client.get("/dashboard/snapshot", params={"jd_id": jd_id}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] == f'W/"dashboard-{jd_id}-v{version + 1}"'
+    assert changed.json()["version"] == version + 1
@@ -0,0 +1,69 @@
+"""Rendered emails must match the HTML the mailer built inline before the shared templates.
+
+tests/fixtures/email holds that HTML, rendered for the CONTEXT below.
+"""
+import os
+import re
+
+import pytest
+
+from services.email_templates import EMAIL_SUBJECTS, render_email, warm_templates
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "email")
+
+CONTEXT = {
+    "candidate_name": "Ada Lovelace",
+    "job_title": "Backend Engineer",
+    "position": "Backend Engineer",
+    "interview_date": "May 04, 2026 at 10:30 AM",
+    "rejection_reasons": [
+        "Skills alignment did not meet the minimum requirements",
+        "Overall profile compatibility was below our threshold"
+    ]
+}
+
+def _normalize(html: str) -> str:
+    # Indentation and line breaks between tags differ; the markup and text do not
+    html = re.sub(r">\s+<", "><", html.strip())
+    return re.sub(r"\s+", " ", html)
+
+@pytest.mark.parametrize("name, subject", [
+    ("shortlist_notification", "Shortlisted for Backend Engineer Position"),
+    ("shortlist_invite", "Congratulations! You've been shortlisted for Backend Engineer"),
+    ("rejection", "Application Update - Backend Engineer"),
+])
+def test_html_matches_the_previous_inline_html(name, subject):
+    with open(os.path.join(FIXTURE_DIR, f"{name}.html")) as f:
+        previous = f.read()
+
+    rendered_subject, html, text = render_email(name, **CONTEXT)
+    assert rendered_subject == subject
+    assert _normalize(html) == _normalize(previous)
+    assert "Ada Lovelace" in text
+
+def test_shortlist_notification_text_matches_the_previous_text():
+    previous = """
+    Dear Ada Lovelace,
+
+    Congratulations! You have been shortlisted for the position of Backend Engineer.
+
+    Our HR team will contact you within 2-3 business days to schedule an interview.
+
+    Best regards,
+    The Recruitment Team
+    """
+    _, _, text = render_email("shortlist_notification", **CONTEXT)
+    assert [line.strip() for line in text.strip().splitlines()] == [line.strip() for line in previous.strip().splitlines()]
+
+def test_rejection_text_lists_every_reason():
+    _, _, text = render_email("rejection", **CONTEXT)
+    assert "\n".join(f"- {reason}" for reason in CONTEXT["rejection_reasons"]) in text
+
+def test_html_escapes_candidate_data_but_text_does_not():
+    context = {**CONTEXT, "candidate_name": "<b>Eve</b> & co"}
+    _, html, text = render_email("shortlist_invite", **context)
+    assert "&lt;b&gt;Eve&lt;/b&gt; &amp; co" in html
+    assert "<b>Eve</b> & co" in text
+
+def test_every_mail_type_has_both_templates():
+    assert warm_templates() == {"templates": len(EMAIL_SUBJECTS) * 2}
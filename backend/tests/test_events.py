@@ -0,0 +1,39 @@
+import json
+from datetime import datetime
+
+from core.events import format_sse
+from core.responses import FastJSONResponse
+
+def test_sse_payload_encodes_like_the_snapshot():
+    uploaded_at = datetime(2026, 5, 1, 9, 30, 15, 250000)
+    event = {"id": 7, "type": "candidate_added", "jd_id": 3, "data": {"candidate_id": 11, "created_at": uploaded_at}}
+
+    frame = format_sse(event)
+    lines = frame.split("\n")
+    assert lines[:2] == ["id: 7", "event: candidate_added"]
+    assert frame.endswith("\n\n")
+
+    payload = json.loads(lines[2][len("data: "):])
+    assert payload == {"jd_id": 3, "candidate_id": 11, "created_at": uploaded_at.isoformat()}
+    snapshot = json.loads(FastJSONResponse({"created_at": uploaded_at}).body)
+    assert payload["created_at"] == snapshot["created_at"]
+
+def test_jd_upload_matches_existing_candidates_and_asks_for_a_resync(client, db, monkeypatch):
+    import api.jd
+    from core.models import Candidate, MatchResult
+
+    db.add_all([
+        Candidate(name=f"Candidate {i}", email=f"c{i}@example.com", resume_path="missing.pdf", extracted_skills=["python"], experience_years=i)
+        for i in range(3)
+    ])
+    db.commit()
+    published = []
+    monkeypatch.setattr(api.jd.event_broker, "publish", lambda event_type, jd_id, data: published.append(event_type))
+
+    response = client.post("/jd/upload", data={"title": "Backend Engineer", "text": "Python developer with 3+ years of experience"})
+    assert response.status_code == 200
+    assert response.json()["candidates_matched"] == 3
+
+    assert db.query(MatchResult).filter(MatchResult.jd_id == response.json()["jd_id"]).count() == 3
+    # Rows of a new JD are all new; the refreshed stats follow as an aggregates event
+    assert published == ["resync", "aggregates"]
@@ -0,0 +1,94 @@
+import csv
+import functools
+import io
+
+import pyarrow.parquet as pq
+
+import api.dashboard
+import services.export
+from core.models import JD, Candidate, MatchResult
+from services.export import EXPORT_COLUMNS, iter_ranked_chunks
+
+def _seed(db) -> int:
+    jd = JD(title="Data Engineer")
+    other = JD(title="Other role")
+    db.add_all([jd, other])
+    db.flush()
+    scores = [0.4, 0.9, 0.7, 0.9, None]
+    for i, score in enumerate(scores):
+        candidate = Candidate(name=f"Candidate {i}", email=f"c{i}@example.com", resume_path="resume.pdf")
+        db.add(candidate)
+        db.flush()
+        db.add(MatchResult(
+            jd_id=jd.id,
+            candidate_id=candidate.id,
+            overall_score=score,
+            skills_match_score=0.5,
+            experience_match_score=0.6,
+            matched_skills=["python", "sql"] if i % 2 else [],
+            missing_skills=["spark"]
+        ))
+        db.add(MatchResult(jd_id=other.id, candidate_id=candidate.id, overall_score=0.99))
+    db.commit()
+    return jd.id
+
+# Ranked by score, ties in match order; unscored matches are left out
+EXPECTED_ORDER = ["Candidate 1", "Candidate 3", "Candidate 2", "Candidate 0"]
+
+def test_chunks_are_ranked_across_chunk_boundaries(db):
+    jd_id = _seed(db)
+    chunks = list(iter_ranked_chunks(jd_id, chunk_size=3))
+
+    assert [len(chunk) for chunk in chunks] == [3, 1]
+    rows = [row for chunk in chunks for row in chunk]
+    assert [row[0] for row in rows] == [1, 2, 3, 4]
+    assert [row[2] for row in rows] == EXPECTED_ORDER
+
+def test_csv_export(client, db):
+    jd_id = _seed(db)
+    response = client.get("/dashboard/export", params={"jd_id": jd_id, "format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == f'attachment; filename="jd-{jd_id}-candidates.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert list(rows[0]) == EXPORT_COLUMNS
+    assert [row["name"] for row in rows] == EXPECTED_ORDER
+    assert rows[0]["rank"] == "1"
+    assert rows[0]["overall_score"] == "0.9"
+    assert rows[0]["matched_skills"] == "python; sql"
+    assert rows[3]["matched_skills"] == ""
+
+def test_parquet_export_writes_a_row_group_per_chunk(client, db, monkeypatch):
+    monkeypatch.setattr(services.export, "iter_ranked_chunks", functools.partial(iter_ranked_chunks, chunk_size=3))
+    jd_id = _seed(db)
+    response = client.get("/dashboard/export", params={"jd_id": jd_id, "format": "parquet"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    parquet = pq.ParquetFile(io.BytesIO(response.content))
+    assert parquet.num_row_groups == 2
+    table = parquet.read()
+    assert table.column_names == EXPORT_COLUMNS
+    assert table.column("name").to_pylist() == EXPECTED_ORDER
+    assert table.column("matched_skills").to_pylist()[0] == ["python", "sql"]
+
+def test_empty_export_is_still_a_valid_file(client, db):
+    jd = JD(title="No applicants yet")
+    db.add(jd)
+    db.commit()
+
+    csv_response = client.get("/dashboard/export", params={"jd_id": jd.id})
+    assert csv_response.text.splitlines() == [",".join(EXPORT_COLUMNS)]
+    parquet_response = client.get("/dashboard/export", params={"jd_id": jd.id, "format": "parquet"})
+    assert pq.read_table(io.BytesIO(parquet_response.content)).num_rows == 0
+
+def test_export_errors(client, db, monkeypatch):
+    jd_id = _seed(db)
+    assert client.get("/dashboard/export", params={"jd_id": jd_id + 100}).status_code == 404
+    assert client.get("/dashboard/export", params={"jd_id": jd_id, "format": "xlsx"}).status_code == 400
+
+    monkeypatch.setattr(api.dashboard, "parquet_available", lambda: False)
+    response = client.get("/dashboard/export", params={"jd_id": jd_id, "format": "parquet"})
+    assert response.status_code == 501
+    assert "requirements.txt" in response.json()["detail"]
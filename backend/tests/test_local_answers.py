@@ -0,0 +1,94 @@
+import pytest
+
+from core.models import JD, Candidate, MatchResult
+from services.ai_assistant import ai_assistant, match_intent
+from services.ai_cache import ai_response_cache
+
+@pytest.mark.parametrize("query, intent", [
+    ("What are the top candidates for this position?", "top_candidates"),
+    ("who are the BEST applicants", "top_candidates"),
+    ("Which candidates have the best skill matches?", "best_skill_matches"),
+    ("strongest skills match?", "best_skill_matches"),
+    ("What skills are most common among high-scoring candidates?", "common_skills"),
+    ("common skills", "common_skills"),
+    ("Are there any bias concerns in the current candidate pool?", None),
+    ("How diverse is our candidate selection?", None),
+    # Long questions are open-ended even when they mention an intent
+    ("Compare the top candidates with last quarter's hires and explain what changed in our sourcing channels", None),
+])
+def test_intent_routing(query, intent):
+    assert match_intent(query) == intent
+
+def _seed(db) -> tuple:
+    backend = JD(title="Backend Engineer")
+    frontend = JD(title="Frontend Engineer")
+    db.add_all([backend, frontend])
+    db.flush()
+    pool = [
+        ("Ada", backend, 0.91, 0.8, ["Python", "SQL"]),
+        ("Grace", backend, 0.75, 0.95, ["python", "Go"]),
+        ("Linus", backend, 0.4, 0.3, ["C"]),
+        ("Margaret", frontend, 0.88, 0.7, ["React", "python"]),
+    ]
+    for name, jd, overall, skills_score, skills in pool:
+        candidate = Candidate(name=name, resume_path="resume.pdf")
+        db.add(candidate)
+        db.flush()
+        db.add(MatchResult(
+            jd_id=jd.id, candidate_id=candidate.id, overall_score=overall,
+            skills_match_score=skills_score, experience_match_score=0.5, matched_skills=skills
+        ))
+    db.commit()
+    return backend.id, frontend.id
+
+def test_answers_come_from_the_database(db):
+    backend_id, _ = _seed(db)
+
+    top = ai_assistant.answer_locally(db, "top candidates", backend_id)
+    assert top.splitlines() == [
+        "Top 3 candidates for Backend Engineer by overall match score:",
+        "1. Ada - 91% overall (skills 80%, experience 50%)",
+        "2. Grace - 75% overall (skills 95%, experience 50%)",
+        "3. Linus - 40% overall (skills 30%, experience 50%)",
+    ]
+
+    skills = ai_assistant.answer_locally(db, "best skill matches", None)
+    assert skills.splitlines()[:2] == [
+        "Candidates with the best skill matches across all positions:",
+        "1. Grace - skills match 95%, matched: python, Go (Backend Engineer)",
+    ]
+
+    common = ai_assistant.answer_locally(db, "most common skills", None)
+    assert common.splitlines() == [
+        "Most common skills among the 3 candidates scoring 70% or higher:",
+        "1. python - 3 of 3 candidates (100%)",
+        "2. sql - 1 of 3 candidates (33%)",
+        "3. go - 1 of 3 candidates (33%)",
+        "4. react - 1 of 3 candidates (33%)",
+    ]
+
+    assert ai_assistant.answer_locally(db, "How diverse is our candidate selection?", None) is None
+
+def test_answers_for_an_empty_pool(db):
+    jd = JD(title="Designer")
+    db.add(jd)
+    db.commit()
+    assert ai_assistant.answer_locally(db, "top candidates", jd.id) == "There are no scored candidates for this position yet."
+    assert ai_assistant.answer_locally(db, "common skills", jd.id).startswith("No candidates score 70% or higher yet")
+
+def test_local_questions_never_reach_the_model(client, db, monkeypatch):
+    class FailingModel:
+        def generate_content(self, prompt, stream=False):
+            raise AssertionError("the model should not be called")
+
+    monkeypatch.setattr(ai_assistant, "model", FailingModel())
+    ai_response_cache.clear()
+    backend_id, _ = _seed(db)
+
+    response = client.post("/ai/chat", json={"message": "What are the top candidates for this position?", "jd_id": backend_id})
+    assert response.status_code == 200
+    assert response.json()["response"].startswith("Top 3 candidates for Backend Engineer")
+    streamed = client.post("/ai/chat/stream", json={"message": "Which candidates have the best skill matches?"})
+    assert "event: token" in streamed.text and "Grace" in streamed.text
+    # Local answers are not cached as model answers
+    assert ai_response_cache.stats()["entries"] == 0
@@ -0,0 +1,52 @@
+import re
+
+from core.metrics import MetricsRegistry
+
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\]|\\.)*"(,[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\]|\\.)*")*\})? (-?[0-9.e+-]+|\+Inf|NaN)$')
+
+def test_registry_renders_exposition_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("jobs_total", "Jobs run", ("kind",))
+    latency = registry.histogram("job_seconds", "Job latency", buckets=(0.1, 1.0))
+    registry.gauge("queue_depth", "Queued jobs", callback=lambda: {(): 3})
+    requests.inc(kind='say "hi"\n')
+    requests.inc(2, kind="plain")
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    lines = registry.render().splitlines()
+    assert "# HELP jobs_total Jobs run" in lines
+    assert "# TYPE jobs_total counter" in lines
+    assert 'jobs_total{kind="say \\"hi\\"\\n"} 1' in lines
+    assert 'jobs_total{kind="plain"} 2' in lines
+    assert "# TYPE job_seconds histogram" in lines
+    # Buckets are cumulative and +Inf equals the count
+    assert 'job_seconds_bucket{le="0.1"} 1' in lines
+    assert 'job_seconds_bucket{le="1"} 2' in lines
+    assert 'job_seconds_bucket{le="+Inf"} 3' in lines
+    assert "job_seconds_sum 5.55" in lines
+    assert "job_seconds_count 3" in lines
+    assert "queue_depth 3" in lines
+
+def test_metrics_endpoint(client, db):
+    assert client.get("/candidate/1/emails").status_code == 404
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert response.text.endswith("\n")
+    for line in response.text.splitlines():
+        assert line.startswith("# HELP ") or line.startswith("# TYPE ") or SAMPLE.match(line), line
+
+    # Latency is labelled with the route template, not the raw path
+    assert re.search(
+        r'^http_request_duration_seconds_count\{method="GET",route="/candidate/\{candidate_id\}/emails",status="404"\} \d+$',
+        response.text,
+        re.MULTILINE
+    )
+    assert "/candidate/1/emails" not in response.text
+    for name in ("db_pool_connections", "email_outbox_depth", "event_stream_subscribers", "ai_model_slots_in_use"):
+        assert f"# TYPE {name} gauge" in response.text
+    # The scrape itself is not recorded
+    assert 'route="/metrics"' not in response.text
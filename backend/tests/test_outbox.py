@@ -0,0 +1,148 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import services.outbox
+from core.models import JD, Candidate, EmailOutbox
+from scripts.smtp_sink import start_in_thread
+from services.outbox import DomainRateLimiter, claim_batch, drain_outbox, enqueue_email
+from services.smtp_pool import close_all_pools
+
+SHORTLIST_PAYLOAD = {"candidate_name": "Ada", "position": "Backend Engineer", "interview_date": "May 01, 2026 at 10:00 AM"}
+
+@pytest.fixture
+def queued(db):
+    """Two shortlist emails waiting in the outbox"""
+    ids = []
+    for i in range(2):
+        candidate = Candidate(name=f"Candidate {i}", email=f"candidate{i}@example.com", resume_path="resume.pdf")
+        db.add(candidate)
+        db.flush()
+        ids.append(enqueue_email(db, candidate.id, "shortlist", candidate.email, SHORTLIST_PAYLOAD))
+    db.commit()
+    return [email.id for email in ids]
+
+def _point_mailer_at(monkeypatch, port: int) -> None:
+    # Candidate emails read the server and sender from the environment when sent
+    monkeypatch.setenv("SMTP_SERVER", "127.0.0.1")
+    monkeypatch.setenv("SMTP_PORT", str(port))
+    monkeypatch.setenv("SENDER_EMAIL", "recruiting@example.com")
+    monkeypatch.setenv("SENDER_PASSWORD", "secret")
+
+def _drain():
+    # A fresh limiter so earlier tests' sends do not count against the domain
+    return drain_outbox(limiter=DomainRateLimiter(per_minute=600))
+
+def _rows(db, ids):
+    db.expire_all()
+    return [db.get(EmailOutbox, email_id) for email_id in ids]
+
+def test_enqueue_skips_candidates_without_email(db):
+    assert enqueue_email(db, 1, "shortlist", None, SHORTLIST_PAYLOAD) is None
+    with pytest.raises(ValueError):
+        enqueue_email(db, 1, "unknown", "a@example.com", {})
+
+def test_claim_marks_rows_sending_and_skips_claimed_rows(db, queued, monkeypatch):
+    claimed = claim_batch(db)
+    assert [email.id for email in claimed] == queued
+    assert all(email.status == "sending" and email.locked_at for email in _rows(db, queued))
+
+    # Another worker finds nothing while the lock is fresh
+    assert claim_batch(db) == []
+
+    # A worker that died mid-send is taken over once the lock times out
+    monkeypatch.setattr(services.outbox, "OUTBOX_LOCK_TIMEOUT_SECONDS", 0)
+    assert [email.id for email in claim_batch(db)] == queued
+
+def test_drain_sends_through_sink(db, queued, smtp_sink, monkeypatch):
+    port, stats = smtp_sink
+    _point_mailer_at(monkeypatch, port)
+
+    assert _drain() == {"sent": 2, "retrying": 0, "failed": 0, "deferred": 0}
+    assert stats.messages == 2
+    for email in _rows(db, queued):
+        assert email.status == "sent"
+        assert email.sent_at is not None
+        assert email.locked_at is None
+        assert email.attempts == 0
+
+    # Sent rows are not claimed again
+    assert _drain() == {"sent": 0, "retrying": 0, "failed": 0, "deferred": 0}
+
+def test_failed_delivery_backs_off_then_gives_up(db, queued, closed_port, smtp_sink, monkeypatch):
+    monkeypatch.setattr(services.outbox, "OUTBOX_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(services.outbox, "OUTBOX_BACKOFF_BASE_SECONDS", 30)
+    _point_mailer_at(monkeypatch, closed_port)
+
+    before = datetime.utcnow()
+    assert _drain() == {"sent": 0, "retrying": 2, "failed": 0, "deferred": 0}
+    for email in _rows(db, queued):
+        assert email.status == "pending"
+        assert email.attempts == 1
+        assert email.last_error
+        # First retry waits the base delay with +/-20% jitter
+        delay = (email.next_attempt_at - before).total_seconds()
+        assert 24 <= delay <= 37
+
+    # Not due yet
+    assert _drain() == {"sent": 0, "retrying": 0, "failed": 0, "deferred": 0}
+
+    db.query(EmailOutbox).update({EmailOutbox.next_attempt_at: datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+    assert _drain() == {"sent": 0, "retrying": 0, "failed": 2, "deferred": 0}
+    assert all(email.status == "failed" and email.attempts == 2 for email in _rows(db, queued))
+
+    # Failed rows stay failed even once the server is reachable
+    _point_mailer_at(monkeypatch, smtp_sink[0])
+    assert _drain()["sent"] == 0
+
+def test_retry_succeeds_after_server_recovers(db, queued, closed_port, smtp_sink, monkeypatch):
+    _point_mailer_at(monkeypatch, closed_port)
+    assert _drain()["retrying"] == 2
+
+    _point_mailer_at(monkeypatch, smtp_sink[0])
+    db.query(EmailOutbox).update({EmailOutbox.next_attempt_at: datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+    assert _drain()["sent"] == 2
+    assert all(email.status == "sent" and email.last_error is None for email in _rows(db, queued))
+
+def test_domain_rate_limit_defers_without_counting_an_attempt(db, queued, smtp_sink, monkeypatch):
+    _point_mailer_at(monkeypatch, smtp_sink[0])
+
+    results = drain_outbox(limiter=DomainRateLimiter(per_minute=6, burst=1))
+    assert results == {"sent": 1, "retrying": 0, "failed": 0, "deferred": 1}
+    deferred = [email for email in _rows(db, queued) if email.status == "pending"]
+    assert len(deferred) == 1
+    assert deferred[0].attempts == 0
+    assert deferred[0].next_attempt_at > datetime.utcnow()
+
+def test_shortlist_is_delivered_concurrently(client, db, monkeypatch):
+    port, stats, stop = start_in_thread(latency=0.2)
+    try:
+        _point_mailer_at(monkeypatch, port)
+        jd = JD(title="Backend Engineer")
+        candidates = [Candidate(name=f"Candidate {i}", email=f"c{i}@example.com", resume_path="resume.pdf") for i in range(8)]
+        db.add_all([jd, *candidates])
+        db.commit()
+
+        response = client.post(
+            "/dashboard/shortlist",
+            params={"jd_id": jd.id},
+            json=[candidate.id for candidate in candidates]
+        )
+        assert response.status_code == 200
+
+        started = time.perf_counter()
+        results = drain_outbox(limiter=DomainRateLimiter(per_minute=600), concurrency=4)
+        elapsed = time.perf_counter() - started
+
+        assert results["sent"] == 8
+        assert stats.messages == 8
+        # Four at a time over four pooled connections, not eight sends back to back
+        assert stats.connections == 4
+        assert elapsed < 8 * 0.2
+        assert db.query(EmailOutbox).filter(EmailOutbox.status == "sent").count() == 8
+    finally:
+        close_all_pools()
+        stop()
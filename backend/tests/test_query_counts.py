@@ -0,0 +1,130 @@
+"""The number of SQL statements behind these endpoints must not grow with the number of matches"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+import api.candidate
+import api.jd
+from core.db import Base, engine
+from core.models import JD, Blob, Candidate, MatchResult
+from services.ai_assistant import ai_assistant
+
+MATCH_COUNTS = (1, 8)
+
+def _seed(db, matches: int) -> int:
+    """Candidates with the given number of matches each, one per JD; returns the first candidate's id"""
+    jds = [
+        JD(title=f"Engineer {i}", description="Python and SQL", required_skills={"technical_skills": ["python", "sql"]})
+        for i in range(matches)
+    ]
+    db.add_all(jds)
+    db.flush()
+    candidates = []
+    for i in range(matches):
+        candidate = Candidate(
+            name=f"Candidate {i}",
+            email=f"candidate{i}@example.com",
+            resume_path="resume.pdf",
+            extracted_skills=["python"],
+            experience_years=3,
+            education="Bachelor's"
+        )
+        db.add(candidate)
+        db.flush()
+        candidates.append(candidate)
+        for jd in jds:
+            db.add(MatchResult(
+                jd_id=jd.id,
+                candidate_id=candidate.id,
+                overall_score=0.7,
+                skills_match_score=0.5,
+                experience_match_score=0.8,
+                matched_skills=["python"],
+                missing_skills=["sql"],
+                skill_gaps={}
+            ))
+    db.commit()
+    return candidates[0].id
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+def _counts(db, run) -> list:
+    counts = []
+    for matches in MATCH_COUNTS:
+        db.expunge_all()
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        candidate_id = _seed(db, matches)
+        db.expire_all()
+        with count_queries() as statements:
+            run(candidate_id)
+        counts.append(len(statements))
+    return counts
+
+def test_get_resume_query_count(client, db):
+    def run(candidate_id):
+        response = client.get(f"/resume/{candidate_id}")
+        assert response.status_code == 200
+
+    assert _counts(db, run) == [2, 2]
+
+def test_candidate_details_query_count(client, db):
+    def run(candidate_id):
+        response = client.get(f"/dashboard/candidate/{candidate_id}/details")
+        assert response.status_code == 200
+
+    assert _counts(db, run) == [2, 2]
+
+def test_status_update_query_count(client, db, monkeypatch):
+    # The stats refresh runs after the response and is measured on its own
+    monkeypatch.setattr(api.candidate, "refresh_stale_stats", lambda: None)
+
+    def run(candidate_id):
+        response = client.patch("/candidate/status", json={"candidate_id": candidate_id, "status": "shortlisted"})
+        assert response.status_code == 200
+
+    assert _counts(db, run) == [7, 7]
+
+@pytest.mark.parametrize("jd_scope, expected", [("jd", 5), ("all", 4)])
+def test_dashboard_context_query_count(db, jd_scope, expected):
+    def run(candidate_id):
+        # Tables are recreated for each run, so the first JD has id 1
+        jd_id = 1 if jd_scope == "jd" else None
+        ai_assistant.get_dashboard_context(db, jd_id)
+
+    assert _counts(db, run) == [expected, expected]
+
+def test_jd_upload_reads_stored_parses_in_one_query(client, db, monkeypatch):
+    # The stats refresh runs after the response and is measured on its own
+    monkeypatch.setattr(api.jd, "refresh_stale_stats", lambda: None)
+    counts = []
+    for candidates in MATCH_COUNTS:
+        db.expunge_all()
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        for i in range(candidates):
+            blob_id = f"{i:064x}"
+            db.add(Blob(id=blob_id, size=1, storage_path=f"{blob_id}.pdf", parsed_data={"resume": {"raw_text": "Python and SQL"}}))
+            db.add(Candidate(name=f"Candidate {i}", email=f"c{i}@example.com", resume_path=f"{blob_id}.pdf", blob_id=blob_id, extracted_skills=["python"]))
+        db.commit()
+
+        with count_queries() as statements:
+            response = client.post("/jd/upload", data={"title": "Data Engineer", "text": "Python and SQL developer"})
+            assert response.status_code == 200
+        reads = [statement for statement in statements if statement.lstrip().upper().startswith("SELECT")]
+        counts.append(len(reads))
+        assert sum("FROM blobs" in statement for statement in reads) == 1
+
+    assert counts[0] == counts[1]
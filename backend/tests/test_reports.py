@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from api.dashboard import _get_candidates_data, calculate_diversity_metrics, detect_bias_in_candidates
+from core.models import JD, Candidate, MatchResult
+from services.reports import build_org_report, calculate_actual_diversity_score
+
+GENDERS = ["male", "female", "non-binary", None]
+EDUCATIONS = ["Bachelor's", "Master's", "PhD", None]
+
+def _seed(db, seed: int = 7) -> list:
+    """Three active JDs with mixed pools (including missing attributes) and one inactive JD"""
+    rng = random.Random(seed)
+    jds = [JD(title=f"Role {i}", is_active=i < 3) for i in range(4)]
+    db.add_all(jds)
+    db.flush()
+    sizes = [12, 4, 9, 5]
+    for jd, size in zip(jds, sizes):
+        for i in range(size):
+            candidate = Candidate(
+                name=f"{jd.title} candidate {i}",
+                resume_path="resume.pdf",
+                gender=rng.choice(GENDERS[:2] * 4 + GENDERS[2:]),
+                experience_years=rng.choice([None, 0, 1.5, 2, 4, 5, 9, 10, 16, 20]),
+                education=rng.choice(EDUCATIONS)
+            )
+            db.add(candidate)
+            db.flush()
+            db.add(MatchResult(jd_id=jd.id, candidate_id=candidate.id, overall_score=round(rng.random(), 3)))
+    # A pool where almost everyone is senior, to raise the experience alert
+    for i in range(20):
+        candidate = Candidate(name=f"Senior {i}", resume_path="resume.pdf", gender="male", experience_years=18, education="PhD")
+        db.add(candidate)
+        db.flush()
+        db.add(MatchResult(jd_id=jds[1].id, candidate_id=candidate.id, overall_score=0.8))
+    db.commit()
+    return [jd.id for jd in jds[:3]]
+
+def _expected(rows: list) -> dict:
+    """The report entry the per-JD dashboard functions give for these rows"""
+    metrics = calculate_diversity_metrics(rows)
+    return {
+        "total_candidates": len(rows),
+        "average_score": round(sum(row["overall_score"] for row in rows) / len(rows), 2),
+        "gender_distribution": metrics["gender_distribution"],
+        "experience_distribution": metrics["experience_distribution"],
+        "education_distribution": metrics["education_distribution"],
+        "diversity_score": calculate_actual_diversity_score(metrics),
+        "bias_alerts": sorted(detect_bias_in_candidates(rows), key=lambda alert: alert["description"])
+    }
+
+def _comparable(entry: dict) -> dict:
+    # Alert order follows first appearance per JD but column order in the report
+    comparable = {key: value for key, value in entry.items() if key not in ("jd_id", "jd_title")}
+    comparable["bias_alerts"] = sorted(entry["bias_alerts"], key=lambda alert: alert["description"])
+    return comparable
+
+@pytest.mark.parametrize("seed", [7, 11, 23])
+def test_report_matches_the_per_jd_functions(db, seed):
+    active_ids = _seed(db, seed)
+    report = build_org_report(db)
+
+    assert [entry["jd_id"] for entry in report["jds"]] == active_ids
+    all_rows = []
+    for entry in report["jds"]:
+        rows = _get_candidates_data(entry["jd_id"], db)
+        all_rows.extend(rows)
+        assert entry["jd_title"] == rows[0]["jd_title"]
+        assert _comparable(entry) == _expected(rows)
+
+    # The organization entry covers active JDs only
+    organization = report["organization"]
+    assert organization["jd_id"] is None
+    assert _comparable(organization) == _expected(all_rows)
+
+def test_senior_pool_raises_the_experience_alert(db):
+    _, senior_jd, _ = _seed(db)
+    entry = next(entry for entry in build_org_report(db)["jds"] if entry["jd_id"] == senior_jd)
+    assert "experience" in [alert["type"] for alert in entry["bias_alerts"]]
+
+def test_empty_report(db):
+    assert build_org_report(db) == {"jds": [], "organization": None}
@@ -0,0 +1,64 @@
+from core.cache import FakeSharedCacheBackend, LocalCacheBackend, ResponseCache, cache_key, cached_response, response_cache
+from core.models import JD
+from core.versions import bump_data_version
+
+def test_fake_shared_backend_round_trip():
+    backend = FakeSharedCacheBackend()
+    value = {"candidates": [{"name": "Ada", "score": 0.9}], "total": 1}
+    backend.set("key", value)
+
+    cached = backend.get("key")
+    assert cached == value
+    # Values travel pickled, so callers never share the stored object
+    assert cached is not value
+    cached["total"] = 2
+    assert backend.get("key")["total"] == 1
+
+def test_version_change_replaces_slot():
+    cache = ResponseCache(FakeSharedCacheBackend())
+    key = cache_key("dashboard:candidates", 3)
+
+    assert cache.get_or_set(key, 1, lambda: "v1") == "v1"
+    assert cache.get_or_set(key, 1, lambda: "recomputed") == "v1"
+    assert cache.get_or_set(key, 2, lambda: "v2") == "v2"
+    assert cache.get_or_set(key, 2, lambda: "recomputed") == "v2"
+
+    # The superseded version does not linger in the store
+    assert len(cache.backend) == 1
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+def test_older_version_does_not_replace_newer_entry():
+    cache = ResponseCache(LocalCacheBackend())
+    key = cache_key("dashboard:snapshot", None)
+    cache.get_or_set(key, 5, lambda: "v5")
+
+    assert cache.get_or_set(key, 4, lambda: "v4") == "v4"
+    assert cache.get_or_set(key, 5, lambda: "recomputed") == "v5"
+
+def test_params_get_their_own_slots():
+    cache = ResponseCache(LocalCacheBackend(max_entries=2))
+    cache.get_or_set(cache_key("page", 1, page=1), 1, lambda: "first")
+    cache.get_or_set(cache_key("page", 1, page=2), 1, lambda: "second")
+    cache.get_or_set(cache_key("page", 1, page=3), 1, lambda: "third")
+
+    assert len(cache.backend) == 2
+    assert cache.get_or_set(cache_key("page", 1, page=1), 1, lambda: "evicted") == "evicted"
+
+def test_cached_response_invalidated_by_data_version(db):
+    jd = JD(title="Backend Engineer")
+    db.add(jd)
+    db.commit()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"call": len(calls)}
+
+    assert cached_response(db, "test:jd", jd.id, compute) == {"call": 1}
+    assert cached_response(db, "test:jd", jd.id, compute) == {"call": 1}
+
+    bump_data_version(db, [jd.id])
+    db.commit()
+    assert cached_response(db, "test:jd", jd.id, compute) == {"call": 2}
+    assert len(response_cache.backend) == 1
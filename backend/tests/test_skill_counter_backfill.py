@@ -0,0 +1,50 @@
+from core.db import create_tables
+from core.models import JD, JDState, MatchResult, SkillCounter
+from services.skill_stats import record_match
+
+def _add_match(db, jd_id: int, matched: list, missing: list) -> None:
+    db.add(MatchResult(jd_id=jd_id, candidate_id=1, overall_score=0.5, matched_skills=matched, missing_skills=missing))
+
+def _counters(db) -> dict:
+    db.expire_all()
+    return {(row.jd_id, row.skill): (row.matched_count, row.missing_count) for row in db.query(SkillCounter)}
+
+def test_existing_matches_are_counted_on_startup(db):
+    jd = JD(title="Data Engineer")
+    db.add(jd)
+    db.flush()
+    # Rows written before the counters existed
+    _add_match(db, jd.id, ["Python", "SQL"], ["Spark"])
+    _add_match(db, jd.id, ["python"], ["spark", "Airflow"])
+    db.commit()
+
+    create_tables()
+
+    assert _counters(db) == {
+        (jd.id, "python"): (2, 0),
+        (jd.id, "sql"): (1, 0),
+        (jd.id, "spark"): (0, 2),
+        (jd.id, "airflow"): (0, 1),
+    }
+    assert db.get(JDState, jd.id).match_count == 2
+
+def test_counters_in_use_are_left_alone(db):
+    jd = JD(title="Data Engineer")
+    db.add(jd)
+    db.flush()
+    _add_match(db, jd.id, ["python"], [])
+    record_match(db, jd.id, ["python"], [])
+    # A match the counters deliberately do not include yet
+    _add_match(db, jd.id, ["go"], [])
+    db.commit()
+    version = db.get(JDState, jd.id).data_version
+
+    create_tables()
+
+    assert _counters(db) == {(jd.id, "python"): (1, 0)}
+    assert db.get(JDState, jd.id).data_version == version
+
+def test_empty_database_is_not_backfilled(db):
+    create_tables()
+    assert _counters(db) == {}
+    assert db.query(JDState).count() == 0
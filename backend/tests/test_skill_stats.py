@@ -0,0 +1,81 @@
+from core.models import JD, Candidate, JDState, SkillCounter
+from services.skill_stats import SkillCounterBatch, get_skill_heatmap, rebuild_skill_counters, record_match
+
+def _counters(db) -> dict:
+    db.expire_all()
+    return {(row.jd_id, row.skill): (row.matched_count, row.missing_count) for row in db.query(SkillCounter)}
+
+def _match_counts(db) -> dict:
+    db.expire_all()
+    return {state.jd_id: state.match_count for state in db.query(JDState) if state.match_count}
+
+def test_record_match_counts_normalized_skills_once_per_match(db):
+    jd = JD(title="Data Engineer")
+    db.add(jd)
+    db.flush()
+
+    record_match(db, jd.id, ["Python", "python ", "SQL"], ["Spark"])
+    record_match(db, jd.id, ["python"], ["spark", "", "Airflow"])
+    db.commit()
+
+    assert _counters(db) == {
+        (jd.id, "python"): (2, 0),
+        (jd.id, "sql"): (1, 0),
+        (jd.id, "spark"): (0, 2),
+        (jd.id, "airflow"): (0, 1),
+    }
+    assert _match_counts(db) == {jd.id: 2}
+
+def test_batch_can_take_a_match_back_out(db):
+    jd = JD(title="Data Engineer")
+    db.add(jd)
+    db.flush()
+    record_match(db, jd.id, ["python", "sql"], ["spark"])
+
+    batch = SkillCounterBatch(jd.id)
+    batch.add(["python", "sql"], ["spark"], sign=-1)
+    batch.add(["python"], ["sql"])
+    batch.apply(db)
+    db.commit()
+
+    assert _counters(db) == {(jd.id, "python"): (1, 0), (jd.id, "sql"): (0, 1), (jd.id, "spark"): (0, 0)}
+    assert _match_counts(db) == {jd.id: 1}
+
+def test_uploads_keep_counters_equal_to_a_full_rebuild(client, db):
+    for i, skills in enumerate([["python", "sql"], ["python"], ["java", "aws"]]):
+        db.add(Candidate(name=f"Candidate {i}", email=f"c{i}@example.com", resume_path="missing.pdf", extracted_skills=skills, experience_years=3))
+    db.commit()
+
+    for title, text in [("Backend", "Python and SQL developer"), ("Cloud", "Java developer with AWS and Docker")]:
+        assert client.post("/jd/upload", data={"title": title, "text": text}).status_code == 200
+
+    incremental = (_counters(db), _match_counts(db))
+    heatmap = get_skill_heatmap(db)
+    assert incremental[0] and sum(incremental[1].values()) == 6
+
+    assert rebuild_skill_counters(db) == 6
+    assert (_counters(db), _match_counts(db)) == incremental
+    assert get_skill_heatmap(db) == heatmap
+
+def test_heatmap_reports_demand_supply_and_gap(db):
+    backend = JD(title="Backend", required_skills=["Python", "SQL"])
+    cloud = JD(title="Cloud", required_skills=["AWS", "python"])
+    db.add_all([backend, cloud])
+    db.flush()
+    # Three backend matches and one cloud match
+    record_match(db, backend.id, ["python", "sql"], [])
+    record_match(db, backend.id, ["python"], ["sql"])
+    record_match(db, backend.id, [], ["python", "sql"])
+    record_match(db, cloud.id, ["python"], ["aws"])
+    db.commit()
+
+    assert get_skill_heatmap(db) == [
+        {"skill": "python", "demand": 1.0, "supply": 0.75, "gap": 0.25},
+        {"skill": "sql", "demand": 0.75, "supply": 0.25, "gap": 0.5},
+        {"skill": "aws", "demand": 0.25, "supply": 0.0, "gap": 0.25},
+    ]
+    assert get_skill_heatmap(db, cloud.id) == [
+        {"skill": "aws", "demand": 1.0, "supply": 0.0, "gap": 1.0},
+        {"skill": "python", "demand": 1.0, "supply": 1.0, "gap": 0.0},
+    ]
+    assert len(get_skill_heatmap(db, limit=1)) == 1
@@ -0,0 +1,68 @@
+from email.message import EmailMessage
+
+import pytest
+
+from scripts.smtp_sink import start_in_thread
+from services.smtp_pool import SMTPConnectionPool
+
+def _message(i: int) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = f"Message {i}"
+    msg["From"] = "recruiting@example.com"
+    msg["To"] = f"candidate{i}@example.com"
+    msg.set_content("Hello")
+    return msg
+
+@pytest.fixture
+def dropping_sink():
+    """A sink that hangs up every session after one message"""
+    port, stats, stop = start_in_thread(drop_after=1)
+    try:
+        yield port, stats
+    finally:
+        stop()
+
+def test_connection_is_reused_across_messages(smtp_sink):
+    port, stats = smtp_sink
+    pool = SMTPConnectionPool("127.0.0.1", port, use_tls="false", max_connections=2)
+
+    for i in range(5):
+        pool.send_message(_message(i))
+    pool.close_all()
+
+    assert stats.messages == 5
+    assert stats.connections == 1
+    assert pool.stats()["connections_opened"] == 1
+    assert pool.stats()["messages_sent"] == 5
+
+def test_connection_is_replaced_after_message_cap(smtp_sink):
+    port, stats = smtp_sink
+    pool = SMTPConnectionPool("127.0.0.1", port, use_tls="false", max_messages_per_connection=2)
+
+    for i in range(5):
+        pool.send_message(_message(i))
+    pool.close_all()
+
+    assert stats.messages == 5
+    assert stats.connections == 3
+
+def test_reconnects_after_server_dropped_connection(dropping_sink):
+    port, stats = dropping_sink
+    pool = SMTPConnectionPool("127.0.0.1", port, use_tls="false")
+
+    for i in range(3):
+        pool.send_message(_message(i))
+    pool.close_all()
+
+    # Each send after the first finds its pooled connection closed by the server and retries once
+    assert stats.messages == 3
+    assert stats.dropped == 3
+    assert pool.stats()["connections_opened"] == 3
+    assert pool.stats()["in_use"] == 0
+
+def test_unreachable_server_raises(closed_port):
+    pool = SMTPConnectionPool("127.0.0.1", closed_port, use_tls="false", timeout=2)
+
+    with pytest.raises(OSError):
+        pool.send_message(_message(0))
+    assert pool.stats()["in_use"] == 0
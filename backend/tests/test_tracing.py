@@ -0,0 +1,104 @@
+import time
+
+import pytest
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+import core.tracing
+from core.tracing import Span, TracingMiddleware, format_breakdown
+
+class CollectingExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+def _background_work():
+    with Span("background.work"):
+        time.sleep(0.3)
+
+traced_app = FastAPI()
+
+@traced_app.get("/items/{item_id}", response_class=PlainTextResponse)
+async def with_background(item_id: int, background_tasks: BackgroundTasks):
+    with Span("handler.work"):
+        pass
+    background_tasks.add_task(_background_work)
+    return "ok"
+
+@traced_app.get("/stream")
+async def streamed():
+    async def chunks():
+        for i in range(3):
+            time.sleep(0.05)
+            yield f"chunk {i}\n"
+    return StreamingResponse(chunks())
+
+@traced_app.get("/fail")
+async def failing():
+    raise RuntimeError("boom")
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = CollectingExporter()
+    monkeypatch.setattr(core.tracing, "span_exporter", exporter)
+    return exporter
+
+@pytest.fixture
+def traced_client():
+    with TestClient(TracingMiddleware(traced_app), raise_server_exceptions=False) as client:
+        yield client
+
+def _root(exporter) -> Span:
+    return next(span for span in exporter.spans if span.parent is None)
+
+def test_root_span_ends_with_the_response_not_background_tasks(traced_client, exporter):
+    response = traced_client.get("/items/7")
+
+    assert response.status_code == 200
+    root = _root(exporter)
+    assert response.headers["x-trace-id"] == root.trace_id
+    assert root.attributes["http.route"] == "/items/{item_id}"
+    assert root.attributes["http.status_code"] == 200
+    assert root.duration_ms < 250
+
+    # The background task is still traced, under the request's trace
+    background = next(span for span in exporter.spans if span.name == "background.work")
+    assert background.trace_id == root.trace_id
+    assert background.end_ns > root.end_ns
+
+def test_streamed_response_is_timed_to_the_last_chunk(traced_client, exporter):
+    response = traced_client.get("/stream")
+
+    assert response.text == "chunk 0\nchunk 1\nchunk 2\n"
+    assert _root(exporter).duration_ms >= 150
+
+def test_failed_request_marks_root_span(traced_client, exporter):
+    assert traced_client.get("/fail").status_code == 500
+    root = _root(exporter)
+    assert root.status == "ERROR"
+    assert root.attributes["http.status_code"] == 500
+
+def test_slow_request_log_excludes_background_tasks(traced_client, exporter, monkeypatch, capsys):
+    monkeypatch.setattr(core.tracing, "SLOW_REQUEST_MS", 0)
+    traced_client.get("/items/1")
+
+    log = capsys.readouterr().out
+    assert "Slow request GET /items/1" in log
+    assert "handler.work" in log
+    assert "background.work" not in log
+
+def test_breakdown_collapses_repeated_children(exporter):
+    with Span("request") as root:
+        for _ in range(3):
+            with Span("db.statement"):
+                pass
+        with Span("render"):
+            pass
+
+    lines = format_breakdown(root).splitlines()
+    assert lines[0].endswith("request")
+    assert lines[1].endswith("db.statement x3")
+    assert lines[2].endswith("render")
@@ -124,9 +124,6 @@ export default function DashboardPage() {
             }));
           }
         }
-
-        // Also refresh data to ensure consistency
-        fetchData();
       } else {
         const errorText = await response.text();
         console.error("API error:", response.status, errorText);
@@ -136,19 +133,16 @@ export default function DashboardPage() {
     }
   };
 
-  const fetchData = async () => {
-    setLoading(true);
+  const fetchData = async (showLoading = true) => {
+    if (showLoading) setLoading(true);
     try {
-      const [candidatesRes, insightsRes] = await Promise.all([
-        fetch("http://localhost:8000/dashboard/candidates"),
-        fetch("http://localhost:8000/dashboard/insights"),
-      ]);
-
-      const candidatesData = await candidatesRes.json();
-      const insightsData = await insightsRes.json();
+      // Single snapshot request; the browser revalidates it with the ETag,
+      // so unchanged dashboards come back as 304 Not Modified
+      const snapshotRes = await fetch("http://localhost:8000/dashboard/snapshot");
+      const snapshot = await snapshotRes.json();
 
-      setCandidates(candidatesData);
-      setInsights(insightsData);
+      setCandidates(snapshot.candidates);
+      setInsights(snapshot.insights);
     } catch (error) {
       console.error("Error fetching data:", error);
     } finally {
@@ -159,9 +153,49 @@ export default function DashboardPage() {
   useEffect(() => {
     fetchData();
 
-    // Auto-refresh every 30 seconds
-    const interval = setInterval(fetchData, 30000);
-    return () => clearInterval(interval);
+    // Live updates: the backend pushes small change events instead of the
+    // page re-fetching everything on a timer
+    const events = new EventSource("http://localhost:8000/dashboard/events");
+    const byScore = (a: Candidate, b: Candidate) =>
+      b.overall_score - a.overall_score;
+
+    events.addEventListener("match_created", (event) => {
+      const row: Candidate = JSON.parse((event as MessageEvent).data);
+      setCandidates((prevCandidates) =>
+        [
+          ...prevCandidates.filter(
+            (candidate) => !(candidate.id === row.id && candidate.jd_id === row.jd_id)
+          ),
+          row,
+        ].sort(byScore)
+      );
+    });
+
+    events.addEventListener("status_changed", (event) => {
+      const change = JSON.parse((event as MessageEvent).data);
+      setCandidates((prevCandidates) =>
+        prevCandidates.map((candidate) =>
+          candidate.id === change.candidate_id
+            ? { ...candidate, status: change.status, is_shortlisted: change.is_shortlisted }
+            : candidate
+        )
+      );
+    });
+
+    // Aggregates and bulk changes are picked up from the snapshot, which the
+    // backend serves from its version-keyed cache; bursts are coalesced
+    let refreshTimer: ReturnType<typeof setTimeout> | undefined;
+    const scheduleRefresh = () => {
+      clearTimeout(refreshTimer);
+      refreshTimer = setTimeout(() => fetchData(false), 2000);
+    };
+    events.addEventListener("aggregates", scheduleRefresh);
+    events.addEventListener("resync", scheduleRefresh);
+
+    return () => {
+      clearTimeout(refreshTimer);
+      events.close();
+    };
   }, []);
 
   const handleCandidateSelect = (candidateId: number, checked: boolean) => {
@@ -219,9 +253,6 @@ export default function DashboardPage() {
 
         setSelectedCandidates([]);
         alert("Candidates shortlisted successfully!");
-        
-        // Also refresh data to ensure consistency
-        await fetchData();
       }
     } catch (error) {
       console.error("Error shortlisting candidates:", error);
@@ -290,7 +321,7 @@ export default function DashboardPage() {
             <h1 className="text-3xl font-bold">HR Dashboard</h1>
           </div>
           <div className="flex gap-2">
-            <Button onClick={fetchData} variant="outline" size="sm">
+            <Button onClick={() => fetchData()} variant="outline" size="sm">
               <RefreshCw className="mr-2 h-4 w-4" />
               Refresh
             </Button>